@@ -0,0 +1,307 @@
+"""
+Benchmarks de las rutinas públicas de formats.py y transforms.py.
+
+Cada función se mide con un escalar y con lotes de 1e3, 1e6 y 1e7 elementos,
+tomando el mejor de varios repeats. Los resultados se guardan en JSON y, si se
+da una línea base con --baseline, se comparan con ella. Las medidas que
+empeoran más de la tolerancia se repiten antes de darlas por buenas, para no
+confundir una interrupción puntual con una regresión; si alguna sigue por
+encima, el script termina con código 1.
+
+La línea base depende de la máquina y de la carga del momento: solo tiene
+sentido comparar con una generada con --output en la misma máquina.
+benchmarks/baseline.json es la de referencia del repositorio.
+
+Uso:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --output reports/benchmarks.json
+    python benchmarks/run_benchmarks.py --baseline reports/benchmarks.json
+    python benchmarks/run_benchmarks.py --sizes scalar 1000 --functions scale_angle
+"""
+import argparse
+import inspect
+import io
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+
+import numpy as np
+
+import calculoastronomico.backend as cb
+import calculoastronomico.formats as cf
+import calculoastronomico.transforms as ct
+
+SIZES = ("scalar", "1000", "1000000", "10000000")
+
+# Repeats por medida y veces que se vuelve a medir una posible regresión
+REPEAT = 5
+RETRIES = 2
+
+
+class _Discard(io.TextIOBase):
+    """Archivo de texto que descarta lo que se escribe, para write_sexagesimal"""
+
+    def write(self, s):
+        return len(s)
+
+
+def _angle(n, rng, lo=-360.0, hi=360.0):
+    if n is None:
+        return float(rng.uniform(lo, hi))
+    return rng.uniform(lo, hi, n)
+
+
+def _sexagesimal(n, rng):
+    sig, d, m, s = cf.degree_to_ddmmss(_angle(n, rng))
+    return (sig, d, m, s)
+
+
+def _sexagesimal_strings(n, rng):
+    values = [_angle(None, rng, -90, 90) for _ in range(n or 1)]
+    strings = [f"{v:+.0f}:{abs(v) % 1 * 60:07.4f}" for v in values]
+    return (strings[0] if n is None else np.array(strings),)
+
+
+def _ticks(n, rng):
+    return (cf.degree_to_ticks(_angle(n, rng)),)
+
+
+def _vector(n, rng):
+    if n is None:
+        return rng.normal(size=3).tolist()
+    return rng.normal(size=(n, 3))
+
+
+def _spherical(n, rng):
+    return ct.rectangular_to_spherical(_vector(n, rng))
+
+
+def _terrestrial(n, rng):
+    lon, lat, h = _geodetic(n, rng)
+    return ct.terrestrial_coordinates(lon, lat, h)
+
+
+def _geodetic(n, rng):
+    lon = _angle(n, rng, -np.pi, np.pi)
+    lat = _angle(n, rng, -np.pi / 2, np.pi / 2)
+    h = _angle(n, rng, 0.0, 5000.0)
+    return lon, lat, h
+
+
+def _horizontal(n, rng):
+    lon = _angle(n, rng, 0, 2 * np.pi)
+    lat = _angle(n, rng, -np.pi / 2, np.pi / 2)
+    lst = _angle(n, rng, 0, 2 * np.pi)
+    return lon, lat, lst, _angle(None, rng, -np.pi / 2, np.pi / 2)
+
+
+# Constructores de argumentos: reciben el tamaño del lote (None para un escalar)
+# y un generador aleatorio. Las funciones sin versión por lotes llevan batch=False.
+CASES = {
+    "formats": {
+        "degree_to_radian": lambda n, rng: (_angle(n, rng),),
+        "radian_to_degree": lambda n, rng: (_angle(n, rng, -7, 7),),
+        "degree_to_ddmmss": lambda n, rng: (_angle(n, rng),),
+        "degree_to_ddmmss_compact": lambda n, rng: (_angle(n, rng),),
+        "ddmmss_to_degree": _sexagesimal,
+        "ddmmss_compact_to_degree": lambda n, rng: (
+            cf.degree_to_ddmmss_compact(_angle(n, rng)),
+        ),
+        "scale_angle": lambda n, rng: (_angle(n, rng, -20, 20),),
+        "hour_to_radian": lambda n, rng: (_angle(n, rng, -48, 48),),
+        "radian_to_hour": lambda n, rng: (_angle(n, rng, -7, 7),),
+        "degree_to_hour": lambda n, rng: (_angle(n, rng),),
+        "hour_to_degree": lambda n, rng: (_angle(n, rng, -48, 48),),
+        "hour_to_hhmmss": lambda n, rng: (_angle(n, rng, -48, 48),),
+        "hhmmss_to_hour": _sexagesimal,
+        "hhmmss_to_ddmmss": _sexagesimal,
+        "ddmmss_to_hhmmss": _sexagesimal,
+        "hhmmss_to_radian": _sexagesimal,
+        "ddmmss_to_radian": _sexagesimal,
+        "scale_hour": lambda n, rng: (_angle(n, rng, -48, 48),),
+        "scale_degree": lambda n, rng: (_angle(n, rng, -720, 720),),
+        "parse_sexagesimal": _sexagesimal_strings,
+        "format_sexagesimal": lambda n, rng: (_angle(n, rng, -90, 90),),
+        "write_sexagesimal": lambda n, rng: (_Discard(), _angle(n or 1, rng, -90, 90)),
+        "degree_to_ticks": lambda n, rng: (_angle(n, rng),),
+        "ticks_to_degree": _ticks,
+        "hour_to_ticks": lambda n, rng: (_angle(n, rng, -48, 48),),
+        "ticks_to_hour": _ticks,
+        "radian_to_ticks": lambda n, rng: (_angle(n, rng, -7, 7),),
+        "ticks_to_radian": _ticks,
+        "ddmmss_to_ticks": _sexagesimal,
+        "ticks_to_ddmmss": _ticks,
+        "hhmmss_to_ticks": _sexagesimal,
+        "ticks_to_hhmmss": _ticks,
+    },
+    "transforms": {
+        "rectangular_to_spherical": lambda n, rng: (_vector(n, rng),),
+        "spherical_to_rectangular": lambda n, rng: (_spherical(n, rng),),
+        "translation": lambda n, rng: (_vector(n, rng), [1.0, 2.0, 3.0]),
+        "rotation": lambda n, rng: (1, 0.4, _vector(n, rng)),
+        "rotation_Euler": lambda n, rng: (0.1, 0.2, 0.3, _vector(n, rng)),
+        "rotation_matrix": (lambda n, rng: (1, float(rng.uniform(0, 6))), False),
+        "rotation_Euler_matrix": (
+            lambda n, rng: tuple(float(a) for a in rng.uniform(0, 6, 3)),
+            False,
+        ),
+        "apply_matrix": lambda n, rng: (ct.rotation_matrix(1, 0.4), _vector(n, rng)),
+        "sincos": (lambda n, rng: (float(rng.uniform(0, 6)),), False),
+        "set_trig_cache_size": (lambda n, rng: (), False),
+        "trig_cache_info": (lambda n, rng: (), False),
+        "terrestrial_coordinates": _geodetic,
+        "geodetic_coordinates": lambda n, rng: (_terrestrial(n, rng),),
+        "equatorial_to_ecliptic": lambda n, rng: (_vector(n, rng),),
+        "ecliptic_to_equatorial": lambda n, rng: (_vector(n, rng),),
+        "equatorial_to_galactic": lambda n, rng: (_vector(n, rng),),
+        "galactic_to_equatorial": lambda n, rng: (_vector(n, rng),),
+        "equatorial_to_horizontal": _horizontal,
+        "horizontal_to_equatorial": _horizontal,
+        "horizontal_grid": lambda n, rng: (
+            _angle((n or 1) // 1000 or 1, rng, 0, 2 * np.pi),
+            _angle((n or 1) // 1000 or 1, rng, -np.pi / 2, np.pi / 2),
+            _angle(10, rng, -np.pi, np.pi),
+            _angle(10, rng, -np.pi / 2, np.pi / 2),
+            _angle(100, rng, 0, 2 * np.pi),
+        ),
+    },
+}
+
+MODULES = {"formats": cf, "transforms": ct}
+
+
+def public_functions(module):
+    """Funciones públicas definidas en un módulo"""
+    return [
+        name
+        for name, obj in inspect.getmembers(module, callable)
+        if not name.startswith("_")
+        and not inspect.isclass(obj)
+        and getattr(obj, "__module__", None) == module.__name__
+    ]
+
+
+def time_call(func, args, number=None, repeat=REPEAT):
+    """Mejor tiempo por llamada (s) de func(*args); los generadores se agotan"""
+
+    def call():
+        result = func(*args)
+        if inspect.isgenerator(result):
+            for _ in result:
+                pass
+
+    timer = timeit.Timer(call)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure(key, size, seed=0):
+    """Mejor tiempo por llamada (s) de la función key con entradas de tamaño size"""
+    modname, name = key.split(".")
+    case = CASES[modname][name]
+    build = case[0] if isinstance(case, tuple) else case
+    n = None if size == "scalar" else int(size)
+    args = build(n, np.random.default_rng(seed))
+    number = None if n is None or n < 1e5 else 1
+    return time_call(getattr(MODULES[modname], name), args, number=number)
+
+
+def run(sizes, only=None, seed=0):
+    """Ejecuta los benchmarks y devuelve {'modulo.funcion': {tamaño: segundos}}"""
+    results = {}
+    for modname, module in MODULES.items():
+        for name in public_functions(module):
+            if only and name not in only:
+                continue
+            case = CASES[modname].get(name)
+            if case is None:
+                print(f"WARNING: no benchmark case for {modname}.{name}")
+                continue
+            batch = case[1] if isinstance(case, tuple) else True
+            key = f"{modname}.{name}"
+            results[key] = {}
+            for size in sizes:
+                if size != "scalar" and not batch:
+                    continue
+                results[key][size] = measure(key, size, seed)
+                print(f"{key:45s} {size:>9s} {results[key][size]:.3e} s")
+    return results
+
+
+def compare(results, baseline, tolerance, retries=RETRIES):
+    """
+    Medidas más lentas que la línea base por encima de la tolerancia
+
+    Cada posible regresión se vuelve a medir hasta retries veces y se queda el
+    mejor tiempo, de modo que solo se informa de las que se repiten.
+    """
+    regressions = []
+    for key, timings in results.items():
+        for size, t in timings.items():
+            t0 = baseline.get(key, {}).get(size)
+            if not t0:
+                continue
+            for _ in range(retries):
+                if t <= t0 * (1 + tolerance):
+                    break
+                t = min(t, measure(key, size))
+            if t > t0 * (1 + tolerance):
+                regressions.append((key, size, t0, t))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=SIZES, choices=SIZES)
+    parser.add_argument("--functions", nargs="+", help="Solo estas funciones")
+    parser.add_argument("--output", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="Archivo JSON con la línea base")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.3, help="Empeoramiento admitido (0.3)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRIES,
+        help=f"Nuevas medidas de cada posible regresión ({RETRIES})",
+    )
+    args = parser.parse_args(argv)
+
+    # La línea base se lee antes de medir: --output puede sobrescribirla
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    results = run(args.sizes, args.functions)
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "backend": cb.get_backend(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    if baseline is None:
+        return 0
+    for field, value in report["meta"].items():
+        if field != "date" and baseline["meta"].get(field) != value:
+            print(f"WARNING: baseline {field} is {baseline['meta'].get(field)!r}")
+    regressions = compare(results, baseline["results"], args.tolerance, args.retries)
+    for key, size, t0, t in regressions:
+        print(f"REGRESSION {key} [{size}]: {t0:.3e} s -> {t:.3e} s")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Latencia de las rutinas de transforms.py con un único vector.
+
+Cada rutina se llama con una lista [x, y, z] y el backend "python", y se compara
+con una referencia que hace las mismas cuentas en Python puro (math.sin/cos y
+las fórmulas de la rotación, sin comprobaciones). La relación entre ambos
+tiempos no depende de la máquina, así que sirve de presupuesto: el script
+termina con código 1 si alguna rutina supera --max-ratio veces su referencia.
+
+Uso:
+    python benchmarks/scalar_latency.py
+    python benchmarks/scalar_latency.py --max-ratio 2.5 --repeat 9
+"""
+import argparse
+import sys
+import timeit
+from math import cos, sin
+
+import calculoastronomico.backend as cb
+import calculoastronomico.constant as c
+import calculoastronomico.transforms as ct
+
+# Relación máxima por defecto entre una rutina y su referencia
+MAX_RATIO = 2.0
+
+EPS = 23.5 * c.PI / 180
+VECTOR = [0.3, -0.4, 0.5]
+
+
+def _rotation_reference(n, theta, x):
+    st, ctheta = sin(theta), cos(theta)
+    x0, y0, z0 = x
+    return [x0, y0 * ctheta + z0 * st, -y0 * st + z0 * ctheta]
+
+
+def _euler_reference(phi, xi, zeta, x):
+    sp, cp = sin(phi), cos(phi)
+    sx, cx = sin(xi), cos(xi)
+    sz, cz = sin(zeta), cos(zeta)
+    x0, y0, z0 = x
+    return [
+        (cz * cp - sz * cx * sp) * x0 + (cz * sp + sz * cx * cp) * y0 + sz * sx * z0,
+        (-sz * cp - cz * cx * sp) * x0 + (-sz * sp + cz * cx * cp) * y0 + cz * sx * z0,
+        sx * sp * x0 - sx * cp * y0 + cx * z0,
+    ]
+
+
+# nombre: (llamada, referencia)
+CASES = {
+    "rotation": (
+        lambda: ct.rotation(1, 0.4, VECTOR),
+        lambda: _rotation_reference(1, 0.4, VECTOR),
+    ),
+    "rotation_Euler": (
+        lambda: ct.rotation_Euler(0.1, 0.2, 0.3, VECTOR),
+        lambda: _euler_reference(0.1, 0.2, 0.3, VECTOR),
+    ),
+    "equatorial_to_ecliptic": (
+        lambda: ct.equatorial_to_ecliptic(VECTOR, EPS),
+        lambda: _rotation_reference(1, EPS, VECTOR),
+    ),
+    "ecliptic_to_equatorial": (
+        lambda: ct.ecliptic_to_equatorial(VECTOR, EPS),
+        lambda: _rotation_reference(1, -EPS, VECTOR),
+    ),
+    "equatorial_to_galactic": (
+        lambda: ct.equatorial_to_galactic(VECTOR),
+        lambda: _euler_reference(*c.galactic_angles, VECTOR),
+    ),
+    "galactic_to_equatorial": (
+        lambda: ct.galactic_to_equatorial(VECTOR),
+        lambda: _euler_reference(*c.galactic_angles, VECTOR),
+    ),
+}
+
+
+def best(func, repeat):
+    """Mejor tiempo por llamada (s) de func()"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=MAX_RATIO,
+        help=f"Relación máxima con la referencia ({MAX_RATIO:g})",
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    cb.set_backend("python")
+    failed = False
+    for name, (call, reference) in CASES.items():
+        t = best(call, args.repeat)
+        t0 = best(reference, args.repeat)
+        ratio = t / t0
+        print(
+            f"{name:25s} {t * 1e6:7.3f} us  "
+            f"reference {t0 * 1e6:7.3f} us  x{ratio:.2f}"
+        )
+        if ratio > args.max_ratio:
+            print(f"OVER BUDGET {name}: x{ratio:.2f} > x{args.max_ratio:g}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Tiempo de importación de los módulos del paquete.
+
+Cada módulo se importa varias veces, cada una en un intérprete nuevo, y se toma
+el mínimo. Los .pyc se generan antes para medir lo mismo que en una instalación
+normal. El script termina con código 1 si algún módulo supera el presupuesto o
+si su importación carga NumPy.
+
+Uso:
+    python scripts/02-import-time.py
+    python scripts/02-import-time.py --budget 15 --repeat 20
+    python scripts/02-import-time.py --modules calculoastronomico.transforms
+"""
+import argparse
+import compileall
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+MODULES = ("calculoastronomico.formats",)
+
+# Presupuesto por defecto (milisegundos)
+BUDGET = 25.0
+
+# Se ejecuta en el intérprete nuevo: mide la importación y comprueba si NumPy se
+# ha cargado de verdad (import numpy, no solo su registro perezoso)
+_CHILD = """
+import importlib, json, sys, time
+t = time.perf_counter()
+importlib.import_module(sys.argv[1])
+t = time.perf_counter() - t
+numpy = any(name.startswith("numpy.") for name in sys.modules)
+print(json.dumps({"seconds": t, "numpy": numpy}))
+"""
+
+
+def time_import(module, repeat):
+    """Mínimo del tiempo de importación de module en repeat intérpretes nuevos"""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD, module],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=dict(os.environ, CALCULOASTRONOMICO_BACKEND="python"),
+        )
+        result = json.loads(proc.stdout)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument(
+        "--budget", type=float, default=BUDGET, help=f"Milisegundos ({BUDGET:g})"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    package = importlib.util.find_spec("calculoastronomico").submodule_search_locations
+    for path in package:
+        compileall.compile_dir(path, quiet=1)
+
+    failed = False
+    for module in args.modules:
+        result = time_import(module, args.repeat)
+        ms = result["seconds"] * 1e3
+        print(f"{module:40s} {ms:8.2f} ms")
+        if ms > args.budget:
+            print(f"OVER BUDGET {module}: {ms:.2f} ms > {args.budget:g} ms")
+            failed = True
+        if result["numpy"]:
+            print(f"NUMPY LOADED {module}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,80 @@
-"""Rutinas de aplicaciones."""
\ No newline at end of file
+"""Rutinas de aplicaciones."""
+import numpy as np
+
+from calculoastronomico.constant import PI
+from calculoastronomico.formats import degree_to_radian, scale_angle
+from calculoastronomico.timescales import gmst
+from calculoastronomico.transforms import equatorial_to_horizontal
+
+# Radianes de tiempo sidéreo por día solar medio
+SIDEREAL_RATE = 2 * PI * 1.00273781191135448
+
+# Altura aparente del centro de una estrella al salir o ponerse (refracción)
+STANDARD_ALTITUDE = degree_to_radian(-34 / 60)
+
+# Valores de flag de rise_transit_set
+RISES = 0
+CIRCUMPOLAR = 1
+NEVER_RISES = -1
+
+
+def _wrap(x):
+    """Reduce un ángulo a (-pi, pi]"""
+    return x - 2 * PI * np.ceil((x - PI) / (2 * PI))
+
+
+def rise_transit_set(
+    ra, dec, lon, lat, jd1, jd2=0.0, h0=STANDARD_ALTITUDE, iterations=2
+):
+    """
+    Instantes de salida, tránsito superior y puesta de objetos fijos
+
+    Los instantes se obtienen con las fórmulas analíticas del ángulo horario y
+    se refinan después con iteraciones de Newton sobre la altura calculada con
+    equatorial_to_horizontal y el GMST de cada instante. Todo el cálculo se hace
+    a la vez para cada objetivo y observatorio.
+
+    Args:
+        ra, dec: Coordenadas ecuatoriales de la fecha de los N objetivos (radianes).
+        lon, lat: Longitud (positiva hacia el este) y latitud geodésicas de los
+            S observatorios (radianes), p. ej. de geodetic_coordinates.
+        jd1, jd2[opt]: Fecha juliana UT1 del inicio del día (escalares).
+        h0[opt]: Altura de salida y puesta (radianes). Por defecto la de una
+            estrella, -34'; para el Sol se usa -50'.
+        iterations[opt]: Número de iteraciones de refinamiento.
+
+    Returns:
+        [rise, transit, set, flag]: arrays (N, S). Los instantes son fracciones
+        de día desde jd1 + jd2, en [0, 1). Para los objetos circumpolares (flag
+        CIRCUMPOLAR) y los que no salen (flag NEVER_RISES) la salida y la puesta
+        son NaN; el resto tiene flag RISES.
+    """
+    ra = np.atleast_1d(ra)[:, None]
+    dec = np.atleast_1d(dec)[:, None]
+    lon = np.atleast_1d(lon)[None, :]
+    lat = np.atleast_1d(lat)[None, :]
+
+    cos_h = (np.sin(h0) - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+    flag = np.where(cos_h < -1, CIRCUMPOLAR, np.where(cos_h > 1, NEVER_RISES, RISES))
+    H0 = np.arccos(np.clip(cos_h, -1.0, 1.0))
+    H0[flag != RISES] = np.nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Ángulo sidéreo que falta desde el inicio del día hasta cada suceso
+        H = ra - lon - gmst(jd1, jd2)
+        transit = scale_angle(H) / SIDEREAL_RATE
+        rise = scale_angle(H - H0) / SIDEREAL_RATE
+        set_ = scale_angle(H + H0) / SIDEREAL_RATE
+
+        for _ in range(iterations):
+            H = _wrap(gmst(jd1, jd2 + transit) + lon - ra)
+            transit = (transit - H / SIDEREAL_RATE) % 1.0
+            for m in (rise, set_):
+                lst = gmst(jd1, jd2 + m) + lon
+                h, _ = equatorial_to_horizontal(ra, dec, lst, lat)
+                # dh/dt = -SIDEREAL_RATE cos(dec) cos(lat) sin(H) / cos(h)
+                slope = SIDEREAL_RATE * np.cos(dec) * np.cos(lat) * np.sin(lst - ra)
+                m += (h - h0) * np.cos(h) / slope
+                m %= 1.0
+
+    return [rise, transit, set_, flag]
@@ -0,0 +1,175 @@
+"""
+Selección del backend de cálculo.
+
+Las rutinas más pequeñas y frecuentes (rotation, rectangular_to_spherical,
+scale_angle, degree_to_ddmmss y solve_kepler) tienen una versión compilada con
+Numba que se usa sobre arrays cuando Numba está instalado. Si no lo está, o si
+se elige el backend "python", se usa el código de NumPy habitual.
+
+El backend inicial puede fijarse con la variable de entorno
+CALCULOASTRONOMICO_BACKEND.
+"""
+import importlib.util
+import math
+import os
+import sys
+
+from calculoastronomico.constant import PI
+
+BACKENDS = ("python", "numba")
+
+_kernels = {}
+
+
+def lazy_import(name):
+    """
+    Importa un módulo de forma perezosa
+
+    El módulo se ejecuta la primera vez que se accede a uno de sus atributos, de
+    modo que importar formats.py o transforms.py no carga NumPy hasta que se
+    llama a una rutina con arrays.
+
+    Args:
+        name: Nombre del módulo, p. ej. "numpy"
+
+    Returns:
+        El módulo, el que ya estaba cargado si otro código lo importó antes
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def available_backends():
+    """Backends que pueden usarse en esta instalación"""
+    if importlib.util.find_spec("numba") is None:
+        return ("python",)
+    return BACKENDS
+
+
+def set_backend(name):
+    """
+    Elige el backend de cálculo
+
+    Args:
+        name: "python" o "numba"
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}, choose one of {BACKENDS}")
+    if name not in available_backends():
+        raise ImportError(f"Backend {name!r} is not installed")
+    _backend = name
+
+
+def get_backend():
+    """Backend de cálculo activo"""
+    return _backend
+
+
+def get_kernel(name):
+    """
+    Versión compilada de una rutina
+
+    Args:
+        name: Nombre de la rutina
+
+    Returns:
+        La función compilada, o None si el backend activo es "python".
+    """
+    if _backend == "python":
+        return None
+    if not _kernels:
+        _kernels.update(_compile_numba())
+    return _kernels[name]
+
+
+def _compile_numba():
+    """Compila las rutinas con Numba (de forma perezosa, en la primera llamada)"""
+    import numba
+    import numpy as np
+
+    @numba.vectorize(["float64(float64)"], cache=True)
+    def scale_angle(a):
+        return a - 2 * PI * np.floor(a / (2 * PI))
+
+    @numba.njit(cache=True)
+    def degree_to_ddmmss(flat):
+        # Entrada 1-d; la forma original la restaura quien llama, ya que Numba
+        # no reconstruye bien la de un array 0-d
+        out = np.empty((4, flat.size))
+        for i in range(flat.size):
+            ad = abs(flat[i])
+            d = np.floor(ad)
+            dm = (ad - d) * 60
+            m = np.floor(dm)
+            out[0, i] = math.copysign(1.0, flat[i])
+            out[1, i] = d
+            out[2, i] = m
+            out[3, i] = (dm - m) * 60
+        return out
+
+    @numba.njit(cache=True)
+    def rectangular_to_spherical(v):
+        out = np.empty(v.shape)
+        for i in range(v.shape[0]):
+            x, y, z = v[i, 0], v[i, 1], v[i, 2]
+            rho = math.hypot(x, y)
+            out[i, 0] = math.atan2(z, rho)
+            out[i, 1] = math.atan2(y, x)
+            out[i, 2] = math.hypot(rho, z)
+        return out
+
+    @numba.njit(cache=True)
+    def rotation(n, theta, v):
+        ct = math.cos(theta)
+        st = math.sin(theta)
+        out = np.empty(v.shape)
+        i0, i1, i2 = (1, 2, 0) if n == 1 else (2, 0, 1) if n == 2 else (0, 1, 2)
+        for i in range(v.shape[0]):
+            a, b = v[i, i0], v[i, i1]
+            out[i, i0] = a * ct + b * st
+            out[i, i1] = -a * st + b * ct
+            out[i, i2] = v[i, i2]
+        return out
+
+    @numba.vectorize(["float64(float64, float64, float64, int64)"], cache=True)
+    def solve_kepler(M, e, tol, maxiter):
+        if e < 1:
+            M = (M + PI) % (2 * PI) - PI
+            E = M + math.copysign(0.85 * e, math.sin(M))
+            for _ in range(maxiter):
+                dE = (E - e * math.sin(E) - M) / (1 - e * math.cos(E))
+                E -= dE
+                if abs(dE) <= tol:
+                    break
+            return E
+        if e > 1:
+            H = math.copysign(math.log(2 * abs(M) / e + 1.8), M)
+            for _ in range(maxiter):
+                dH = (e * math.sinh(H) - H - M) / (e * math.cosh(H) - 1)
+                H -= dH
+                if abs(dH) <= tol * max(1.0, abs(H)):
+                    break
+            return H
+        return math.nan
+
+    return {
+        "scale_angle": scale_angle,
+        "degree_to_ddmmss": degree_to_ddmmss,
+        "rectangular_to_spherical": rectangular_to_spherical,
+        "rotation": rotation,
+        "solve_kepler": solve_kepler,
+    }
+
+
+_backend = "python"
+set_backend(os.environ.get("CALCULOASTRONOMICO_BACKEND", available_backends()[-1]))
@@ -0,0 +1,273 @@
+"""
+Catálogos binarios por columnas, legibles con np.memmap.
+
+Un archivo de catálogo tiene una cabecera y, detrás, cada columna como un bloque
+contiguo de float64 o int64 alineado a 4096 bytes::
+
+    b"CALCAT01" | longitud de la cabecera (uint64) | cabecera JSON | columnas
+
+La cabecera indica el número de filas, los nombres de los sistemas de referencia
+y, para cada columna, su nombre, tipo y posición. Las columnas habituales son
+ra, dec y distance (float64), frame (int64, índice en la lista de sistemas de la
+cabecera) y epoch (float64, fecha juliana).
+
+Abrir un catálogo solo lee la cabecera y proyecta las columnas en memoria, así
+que cuesta lo mismo para mil filas que para cien millones. Las columnas son
+arrays de NumPy de solo lectura que pueden pasarse directamente a las rutinas de
+transforms.py y formats.py; las páginas se leen del disco según se necesitan y
+los procesos que abren el mismo archivo comparten la caché de páginas del
+sistema operativo::
+
+    cat = open_binary("data/preprocessed/catalogo.cat")
+    v = spherical_to_rectangular([cat["dec"], cat["ra"], 1.0])
+"""
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"CALCAT01"
+
+# Extensión de los catálogos binarios, que pipeline.py reconoce
+SUFFIX = ".cat"
+
+# Alineación de la cabecera y de cada columna en el archivo
+ALIGNMENT = 4096
+
+# Tipo de las columnas habituales
+COLUMNS = {
+    "ra": "<f8",
+    "dec": "<f8",
+    "distance": "<f8",
+    "frame": "<i8",
+    "epoch": "<f8",
+}
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _column_dtype(name, col):
+    """Tipo con el que se guarda una columna: float64 o int64"""
+    if name in COLUMNS:
+        return np.dtype(COLUMNS[name])
+    if col.dtype.kind in "biu":
+        return np.dtype("<i8")
+    if col.dtype.kind == "f":
+        return np.dtype("<f8")
+    raise TypeError(f"Column {name!r} of dtype {col.dtype} can't be stored")
+
+
+def _storable(name, col):
+    """True si la columna puede guardarse: numérica, o la columna frame"""
+    return name == "frame" or np.asarray(col).dtype.kind in "biuf"
+
+
+def _frame_codes(col, frames):
+    """Códigos de una columna frame de nombres, ampliando la lista frames"""
+    col = np.asarray(col)
+    if col.dtype.kind not in "US":
+        return col
+    names, codes = np.unique(col, return_inverse=True)
+    lookup = []
+    for name in names.tolist():
+        if name not in frames:
+            frames.append(name)
+        lookup.append(frames.index(name))
+    return np.asarray(lookup, dtype=np.int64)[codes.reshape(-1)]
+
+
+def _header(rows, frames, columns):
+    """Cabecera del archivo y posición de cada columna"""
+    meta = {"rows": rows, "frames": list(frames), "columns": []}
+    # La longitud de la cabecera no depende de los offsets si estos se
+    # reservan con un ancho fijo, así que se calcula en dos pasos
+    for name, dtype in columns:
+        meta["columns"].append({"name": name, "dtype": dtype.str, "offset": 0})
+    width = len(json.dumps(meta)) + 20 * len(columns)
+    offset = _aligned(len(MAGIC) + 8 + width)
+    for entry, (_, dtype) in zip(meta["columns"], columns):
+        entry["offset"] = offset
+        offset = _aligned(offset + rows * dtype.itemsize)
+    text = json.dumps(meta).encode()
+    assert len(text) <= width
+    header = MAGIC + struct.pack("<Q", len(text)) + text
+    return header, meta["columns"]
+
+
+def write_binary(path, columns, frames=None):
+    """
+    Escribe un catálogo binario
+
+    Args:
+        path: Ruta del archivo
+        columns: Diccionario {nombre: array}, todas con el mismo número de filas.
+            La columna frame puede darse como nombres de sistemas o como índices
+            en frames.
+        frames[opt]: Nombres de los sistemas de referencia
+
+    Returns:
+        Número de filas escritas
+    """
+    frames = list(frames or [])
+    arrays = {}
+    for name, col in columns.items():
+        col = np.asarray(col)
+        if name == "frame":
+            col = _frame_codes(col, frames)
+        arrays[name] = col.astype(_column_dtype(name, col), copy=False)
+
+    rows = {len(col) for col in arrays.values()}
+    if len(rows) > 1:
+        raise ValueError("All the columns of a catalog must have the same length")
+    rows = rows.pop() if rows else 0
+
+    layout = [(name, col.dtype) for name, col in arrays.items()]
+    header, entries = _header(rows, frames, layout)
+    with open(path, "wb") as fh:
+        fh.write(header)
+        for entry in entries:
+            fh.seek(entry["offset"])
+            arrays[entry["name"]].tofile(fh)
+        fh.truncate(_aligned(fh.tell()))
+    return rows
+
+
+def write_binary_chunks(chunks, path, columns=None, frames=None):
+    """
+    Escribe en un catálogo binario bloques {columna: array}, a medida que llegan
+
+    Cada columna se escribe primero en un archivo temporal en el mismo directorio,
+    de modo que la memoria usada es la de un bloque.
+
+    Args:
+        chunks: Bloques de entrada, p. ej. de pipeline.read_catalog
+        path: Ruta del archivo
+        columns[opt]: Columnas que se escriben. Si no se da, todas las del
+            primer bloque que pueden guardarse: las numéricas y frame; las de
+            texto se descartan.
+        frames[opt]: Nombres de los sistemas de referencia
+
+    Returns:
+        Número de filas escritas
+    """
+    frames = list(frames or [])
+    directory = os.path.dirname(os.path.abspath(path))
+    parts = {}
+    rows = 0
+    try:
+        for chunk in chunks:
+            # Las filas se cuentan en el bloque, antes de descartar columnas
+            rows += len(next(iter(chunk.values()))) if chunk else 0
+            if columns is None:
+                columns = [name for name in chunk if _storable(name, chunk[name])]
+            for name in columns:
+                col = np.asarray(chunk[name])
+                if name == "frame":
+                    col = _frame_codes(col, frames)
+                if name not in parts:
+                    fh = tempfile.TemporaryFile(dir=directory)
+                    parts[name] = (fh, _column_dtype(name, col))
+                fh, dtype = parts[name]
+                col.astype(dtype, copy=False).tofile(fh)
+
+        layout = [(name, dtype) for name, (_, dtype) in parts.items()]
+        header, entries = _header(rows, frames, layout)
+        with open(path, "wb") as out:
+            out.write(header)
+            for entry in entries:
+                fh = parts[entry["name"]][0]
+                fh.seek(0)
+                out.seek(entry["offset"])
+                shutil.copyfileobj(fh, out)
+            out.truncate(_aligned(out.tell()))
+    finally:
+        for fh, _ in parts.values():
+            fh.close()
+    return rows
+
+
+class BinaryCatalog:
+    """
+    Catálogo binario abierto con np.memmap.
+
+    Args:
+        path: Ruta del archivo
+        mode[opt]: "r" (solo lectura, por defecto), "r+" (lectura y escritura)
+            o "c" (copia al escribir)
+    """
+
+    def __init__(self, path, mode="r"):
+        with open(path, "rb") as fh:
+            magic = fh.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{path!r} is not a binary catalog")
+            (length,) = struct.unpack("<Q", fh.read(8))
+            meta = json.loads(fh.read(length))
+        self.path = os.fspath(path)
+        self.rows = meta["rows"]
+        self.frames = meta["frames"]
+        self._columns = {}
+        for entry in meta["columns"]:
+            dtype = np.dtype(entry["dtype"])
+            if not self.rows:
+                self._columns[entry["name"]] = np.empty(0, dtype)
+                continue
+            self._columns[entry["name"]] = np.memmap(
+                path, dtype=dtype, mode=mode, offset=entry["offset"], shape=(self.rows,)
+            )
+
+    @property
+    def names(self):
+        """Nombres de las columnas"""
+        return list(self._columns)
+
+    def __len__(self):
+        return self.rows
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def frame_names(self, codes=None):
+        """
+        Nombres de los sistemas de referencia de la columna frame
+
+        Args:
+            codes[opt]: Índices de sistemas, la columna frame entera si no se da
+
+        Returns:
+            Array de nombres
+        """
+        codes = self["frame"] if codes is None else codes
+        return np.asarray(self.frames)[codes]
+
+    def chunks(self, chunksize, columns=None):
+        """
+        Recorre el catálogo por bloques sin copiar los datos
+
+        Args:
+            chunksize: Número de filas por bloque
+            columns[opt]: Columnas de cada bloque, todas si no se da
+
+        Yields:
+            Bloques {columna: array}, vistas de las columnas proyectadas
+        """
+        columns = self.names if columns is None else columns
+        for start in range(0, self.rows, chunksize):
+            block = slice(start, start + chunksize)
+            yield {name: self._columns[name][block] for name in columns}
+
+    def __repr__(self):
+        return f"BinaryCatalog({self.path!r}, rows={self.rows}, columns={self.names})"
+
+
+def open_binary(path, mode="r"):
+    """Abre un catálogo binario, ver BinaryCatalog"""
+    return BinaryCatalog(path, mode)
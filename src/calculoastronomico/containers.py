@@ -0,0 +1,218 @@
+"""
+Contenedores ligeros para ángulos y vectores.
+
+Angle y Vector3 representan un único valor y usan __slots__ para no crear un
+diccionario por instancia. AngleArray y VectorArray guardan un lote en un array
+de NumPy. Todos llevan consigo sus unidades y, los vectores, su sistema de
+referencia, que las rutinas de transforms.py actualizan al cambiar de sistema.
+"""
+from calculoastronomico.backend import lazy_import
+from calculoastronomico.constant import PI
+
+np = lazy_import("numpy")
+
+# Valor de cada unidad angular en grados
+ANGLE_UNITS = {
+    "rad": 180 / PI,
+    "deg": 1.0,
+    "hour": 15.0,
+    "arcmin": 1 / 60,
+    "arcsec": 1 / 3600,
+}
+
+
+def _angle_factor(src, dst):
+    """Factor que convierte un ángulo de la unidad src a la unidad dst"""
+    for unit in (src, dst):
+        if unit not in ANGLE_UNITS:
+            raise ValueError(f"Unknown angle unit {unit!r}")
+    return ANGLE_UNITS[src] / ANGLE_UNITS[dst]
+
+
+class Angle:
+    """
+    Un ángulo con su unidad.
+
+    Args:
+        value: Valor del ángulo
+        unit[opt]: Unidad, una de ANGLE_UNITS ("rad" por defecto)
+    """
+
+    __slots__ = ("value", "unit")
+
+    def __init__(self, value, unit="rad"):
+        _angle_factor(unit, unit)
+        self.value = float(value)
+        self.unit = unit
+
+    def to(self, unit):
+        """Mismo ángulo en otra unidad"""
+        return Angle(self.value * _angle_factor(self.unit, unit), unit)
+
+    @property
+    def radians(self):
+        return self.to("rad").value
+
+    def __float__(self):
+        return self.value
+
+    def __eq__(self, other):
+        if not isinstance(other, Angle):
+            return NotImplemented
+        return self.radians == other.radians
+
+    def __repr__(self):
+        return f"Angle({self.value!r}, unit={self.unit!r})"
+
+
+class AngleArray:
+    """
+    Un lote de ángulos en un array de NumPy, con su unidad.
+
+    Args:
+        values: Valores de los ángulos
+        unit[opt]: Unidad, una de ANGLE_UNITS ("rad" por defecto)
+    """
+
+    __slots__ = ("values", "unit")
+
+    def __init__(self, values, unit="rad"):
+        _angle_factor(unit, unit)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.unit = unit
+
+    def to(self, unit):
+        """Mismos ángulos en otra unidad"""
+        return AngleArray(self.values * _angle_factor(self.unit, unit), unit)
+
+    @property
+    def radians(self):
+        return self.to("rad").values
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return np.asarray(self.values, dtype=dtype)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        values = self.values[i]
+        if np.ndim(values) == 0:
+            return Angle(values, self.unit)
+        return AngleArray(values, self.unit)
+
+    def __repr__(self):
+        return f"AngleArray({self.values!r}, unit={self.unit!r})"
+
+
+class Vector3:
+    """
+    Un vector de tres componentes con su sistema de referencia y unidad.
+
+    Se comporta como la lista [x, y, z] que aceptan las rutinas de transforms.py.
+
+    Args:
+        x, y, z: Componentes
+        frame[opt]: Sistema de referencia, p. ej. "equatorial"
+        unit[opt]: Unidad de las componentes, p. ej. "m" o "au"
+    """
+
+    __slots__ = ("x", "y", "z", "frame", "unit")
+
+    def __init__(self, x, y, z, frame=None, unit=None):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.frame = frame
+        self.unit = unit
+
+    def copy(self):
+        return Vector3(self.x, self.y, self.z, self.frame, self.unit)
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __setitem__(self, i, value):
+        setattr(self, ("x", "y", "z")[i], value)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array([self.x, self.y, self.z], dtype=dtype)
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector3):
+            return NotImplemented
+        return tuple(self) == tuple(other) and self.frame == other.frame
+
+    def __repr__(self):
+        return (
+            f"Vector3({self.x!r}, {self.y!r}, {self.z!r}, "
+            f"frame={self.frame!r}, unit={self.unit!r})"
+        )
+
+
+class VectorArray:
+    """
+    Un lote de vectores en un array (N, 3), con su sistema de referencia y unidad.
+
+    Args:
+        data: Array (N, 3) con un vector por fila
+        frame[opt]: Sistema de referencia, p. ej. "equatorial"
+        unit[opt]: Unidad de las componentes, p. ej. "m" o "au"
+    """
+
+    __slots__ = ("data", "frame", "unit")
+
+    def __init__(self, data, frame=None, unit=None):
+        data = np.asarray(data, dtype=np.float64)
+        if data.shape[-1:] != (3,):
+            raise ValueError(f"Expected an (N, 3) array, got shape {data.shape}")
+        self.data = data
+        self.frame = frame
+        self.unit = unit
+
+    @classmethod
+    def from_columns(cls, x, y, z, frame=None, unit=None):
+        """Construye el lote a partir de tres columnas"""
+        return cls(np.stack(np.broadcast_arrays(x, y, z), axis=-1), frame, unit)
+
+    @property
+    def x(self):
+        return self.data[..., 0]
+
+    @property
+    def y(self):
+        return self.data[..., 1]
+
+    @property
+    def z(self):
+        return self.data[..., 2]
+
+    def copy(self):
+        return VectorArray(self.data.copy(), self.frame, self.unit)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.data, dtype=dtype)
+        return np.asarray(self.data, dtype=dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        data = self.data[i]
+        if data.ndim == 1:
+            return Vector3(*data.tolist(), frame=self.frame, unit=self.unit)
+        return VectorArray(data, self.frame, self.unit)
+
+    def __repr__(self):
+        return f"VectorArray({self.data!r}, frame={self.frame!r}, unit={self.unit!r})"
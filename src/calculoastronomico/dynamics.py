@@ -1 +1,207 @@
-"""Rutinas de dinámica."""
\ No newline at end of file
+"""
+Rutinas de dinámica.
+
+Propagación kepleriana (problema de dos cuerpos) de órbitas elípticas e
+hiperbólicas. Los elementos orbitales y las fechas pueden ser arrays y se
+combinan con las reglas de broadcasting de NumPy, de modo que una población
+entera de asteroides se propaga de una vez. Las posiciones y velocidades se dan
+en el sistema de referencia de los elementos (normalmente eclíptico y
+heliocéntrico), como arrays (..., 3) que aceptan directamente
+ecliptic_to_equatorial y translation.
+"""
+import math
+import numbers
+
+import numpy as np
+
+from calculoastronomico.backend import get_kernel
+from calculoastronomico.constant import PI
+
+# Constante de Gauss y parámetro gravitacional del Sol (au^3 / día^2)
+GAUSS_K = 0.01720209895
+GM_SUN = GAUSS_K**2
+
+# Tolerancia y número máximo de iteraciones de solve_kepler
+KEPLER_TOL = 1e-14
+KEPLER_MAXITER = 30
+
+
+def _solve_kepler_scalar(M, e, tol, maxiter):
+    """solve_kepler para un único par (M, e)"""
+    if e < 1:
+        M = (M + PI) % (2 * PI) - PI
+        E = M + math.copysign(0.85 * e, math.sin(M))
+        for _ in range(maxiter):
+            dE = (E - e * math.sin(E) - M) / (1 - e * math.cos(E))
+            E -= dE
+            if abs(dE) <= tol:
+                break
+        return E
+    if e > 1:
+        H = math.copysign(math.log(2 * abs(M) / e + 1.8), M)
+        for _ in range(maxiter):
+            dH = (e * math.sinh(H) - H - M) / (e * math.cosh(H) - 1)
+            H -= dH
+            if abs(dH) <= tol * max(1.0, abs(H)):
+                break
+        return H
+    return math.nan
+
+
+def solve_kepler(M, e, tol=KEPLER_TOL, maxiter=KEPLER_MAXITER):
+    """
+    Resuelve la ecuación de Kepler por el método de Newton
+
+    Para e < 1 resuelve E - e sin(E) = M, y para e > 1 la forma hiperbólica
+    e sinh(H) - H = M. Los valores iniciales son los de Danby, con los que Newton
+    converge en pocas iteraciones para cualquier excentricidad.
+
+    Args:
+        M: Anomalía media (radianes)
+        e: Excentricidad
+        tol[opt]: Tolerancia en la anomalía excéntrica
+        maxiter[opt]: Número máximo de iteraciones
+
+    Returns:
+        Anomalía excéntrica E (elíptica, reducida a [-pi, pi)) o H (hiperbólica).
+        NaN para e = 1.
+    """
+    if isinstance(M, numbers.Real) and isinstance(e, numbers.Real):
+        return _solve_kepler_scalar(M, e, tol, maxiter)
+
+    kernel = get_kernel("solve_kepler")
+    if kernel is not None:
+        return kernel(M, e, tol, maxiter)
+
+    M, e = np.broadcast_arrays(np.asarray(M, dtype=float), np.asarray(e, dtype=float))
+    E = np.full(M.shape, np.nan)
+
+    # Newton sobre el conjunto de elementos que aún no han convergido, que se
+    # reduce en cada iteración
+    ell = np.flatnonzero(e < 1)
+    M_ell = np.remainder(M.flat[ell] + PI, 2 * PI) - PI
+    e_ell = e.flat[ell]
+    x = M_ell + 0.85 * e_ell * np.sign(np.sin(M_ell))
+    for _ in range(maxiter):
+        if not ell.size:
+            break
+        dx = (x - e_ell * np.sin(x) - M_ell) / (1 - e_ell * np.cos(x))
+        x -= dx
+        active = np.abs(dx) > tol
+        E.flat[ell[~active]] = x[~active]
+        ell, x, M_ell, e_ell = ell[active], x[active], M_ell[active], e_ell[active]
+    E.flat[ell] = x
+
+    hyp = np.flatnonzero(e > 1)
+    M_hyp = M.flat[hyp]
+    e_hyp = e.flat[hyp]
+    x = np.sign(M_hyp) * np.log(2 * np.abs(M_hyp) / e_hyp + 1.8)
+    for _ in range(maxiter):
+        if not hyp.size:
+            break
+        dx = (e_hyp * np.sinh(x) - x - M_hyp) / (e_hyp * np.cosh(x) - 1)
+        x -= dx
+        active = np.abs(dx) > tol * np.maximum(1.0, np.abs(x))
+        E.flat[hyp[~active]] = x[~active]
+        hyp, x, M_hyp, e_hyp = hyp[active], x[active], M_hyp[active], e_hyp[active]
+    E.flat[hyp] = x
+
+    return E
+
+
+def orbit_basis(i, Omega, omega):
+    """
+    Vectores P y Q de la base perifocal
+
+    P apunta al pericentro y Q, 90° por delante en el plano de la órbita.
+
+    Args:
+        i: Inclinación (radianes)
+        Omega: Longitud del nodo ascendente (radianes)
+        omega: Argumento del pericentro (radianes)
+
+    Returns:
+        [P, Q] en el sistema de referencia de los elementos
+    """
+    if all(isinstance(q, numbers.Real) for q in (i, Omega, omega)):
+        sin_, cos_ = math.sin, math.cos
+    else:
+        sin_, cos_ = np.sin, np.cos
+    si, ci = sin_(i), cos_(i)
+    sO, cO = sin_(Omega), cos_(Omega)
+    so, co = sin_(omega), cos_(omega)
+    P = [co * cO - so * sO * ci, co * sO + so * cO * ci, so * si]
+    Q = [-so * cO - co * sO * ci, -so * sO + co * cO * ci, co * si]
+    return [P, Q]
+
+
+def propagate(a, e, i, Omega, omega, M0, epoch, t, mu=GM_SUN):
+    """
+    Posición y velocidad en una órbita kepleriana
+
+    Args:
+        a: Semieje mayor (au), negativo para órbitas hiperbólicas
+        e: Excentricidad
+        i: Inclinación (radianes)
+        Omega: Longitud del nodo ascendente (radianes)
+        omega: Argumento del pericentro (radianes)
+        M0: Anomalía media en la época (radianes)
+        epoch: Época de los elementos (días, p. ej. fecha juliana)
+        t: Instante o instantes de la propagación (días, en la misma escala)
+        mu[opt]: Parámetro gravitacional del cuerpo central (au^3 / día^2)
+
+    Los argumentos se combinan con las reglas de broadcasting de NumPy: con
+    elementos (N,) y t (T, 1) se obtiene una rejilla (T, N). Las órbitas
+    parabólicas (e = 1) no se tratan y dan NaN.
+
+    Returns:
+        [r, v]: Posición (au) y velocidad (au/día), vectores [x, y, z] si todos
+        los argumentos son escalares y arrays (..., 3) en otro caso.
+    """
+    args = (a, e, i, Omega, omega, M0, epoch, t)
+    scalar = all(isinstance(q, numbers.Real) for q in args)
+    if scalar:
+        sqrt_, sin_, cos_ = math.sqrt, math.sin, math.cos
+    else:
+        # Los arrays 0-d también siguen el camino de los arrays
+        sqrt_, sin_, cos_ = np.sqrt, np.sin, np.cos
+        a, e, i, Omega, omega, M0, epoch, t = (
+            np.asarray(q, dtype=float) for q in args
+        )
+
+    aa = abs(a)
+    n = sqrt_(mu / aa**3)
+    E = solve_kepler(M0 + n * (t - epoch), e)
+
+    # En las órbitas hiperbólicas s = -1 y las funciones trigonométricas de la
+    # anomalía excéntrica pasan a ser hiperbólicas
+    if scalar:
+        hyp = e > 1
+        sE, cE = (math.sinh(E), math.cosh(E)) if hyp else (sin_(E), cos_(E))
+        s = -1.0 if hyp else 1.0
+    else:
+        E = np.asarray(E)
+        hyp = np.broadcast_to(e > 1, E.shape)
+        sE, cE = np.asarray(np.sin(E)), np.asarray(np.cos(E))
+        if hyp.any():
+            sE[hyp] = np.sinh(E[hyp])
+            cE[hyp] = np.cosh(E[hyp])
+        s = np.where(e > 1, -1.0, 1.0)
+
+    # Coordenadas perifocales
+    k = sqrt_(s * (1 - e * e))
+    h = sqrt_(mu * aa)
+    r = aa * s * (1 - e * cE)
+    xp = aa * s * (cE - e)
+    yp = aa * k * sE
+    vxp = -h * sE / r
+    vyp = h * k * cE / r
+
+    P, Q = orbit_basis(i, Omega, omega)
+    R = [xp * p + yp * q for p, q in zip(P, Q)]
+    V = [vxp * p + vyp * q for p, q in zip(P, Q)]
+    if scalar:
+        return [R, V]
+    R = np.stack(np.broadcast_arrays(*R), axis=-1)
+    V = np.stack(np.broadcast_arrays(*V), axis=-1)
+    return [R, V]
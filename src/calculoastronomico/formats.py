@@ -1,8 +1,43 @@
-"""Rutinas generales, formatos..."""
+"""
+Rutinas generales, formatos...
 
+Todas las conversiones aceptan tanto escalares como arrays de NumPy, de modo que
+una columna entera de un catálogo se convierte con una única llamada.
+"""
+
+import functools
+import io
 import math
+import numbers
+
+from calculoastronomico.backend import get_kernel, lazy_import
+from calculoastronomico.constant import PI
+
+np = lazy_import("numpy")
+
+
+def _is_python_real(x):
+    """
+    Escalar de Python; los de NumPy (p. ej. los que da un array 0-d) siguen el
+    camino de los arrays, que admite NaN e infinitos
+    """
+    return type(x) is float or (
+        isinstance(x, numbers.Real) and not hasattr(x, "dtype")
+    )
+
+
+def _floor(x):
+    """math.floor para escalares y np.floor para arrays"""
+    if _is_python_real(x):
+        return math.floor(x)
+    return np.floor(x)
 
-from calculoastronomico.constant import *
+
+def _copysign(a, x):
+    """math.copysign para escalares y np.copysign para arrays"""
+    if _is_python_real(x):
+        return math.copysign(a, x)
+    return np.copysign(a, x)
 
 
 def degree_to_radian(deg):
@@ -16,21 +51,51 @@ def radian_to_degree(rad):
 
 
 def degree_to_ddmmss(degree):
-    """Convierte grados a formato grados, minutos, segundos"""
-    sig = math.copysign(1.0, degree)
+    """
+    Convierte grados a formato grados, minutos, segundos
+
+    Acepta un escalar o un array de NumPy; en el segundo caso cada componente
+    de [sig, d, m, s] es un array con la forma de la entrada.
+    """
+    if not isinstance(degree, numbers.Real) and isinstance(degree, np.ndarray):
+        kernel = get_kernel("degree_to_ddmmss")
+        if kernel is not None:
+            flat = np.ascontiguousarray(degree, dtype=np.float64).reshape(-1)
+            return list(kernel(flat).reshape((4,) + degree.shape))
+    sig = _copysign(1.0, degree)
     ad = abs(degree)
-    d = math.floor(ad)
+    d = _floor(ad)
     dm = (ad - d) * 60
-    m = math.floor(dm)
+    m = _floor(dm)
     s = (dm - m) * 60
     return [sig, d, m, s]
 
 
+def _finite_only(func, x):
+    """
+    Aplica func a los valores finitos de x; los NaN e infinitos dan NaN
+
+    Para las rutinas que pasan por ticks, que no pueden representarlos.
+    """
+    if isinstance(x, numbers.Real):
+        return func(x) if math.isfinite(x) else math.nan
+    x = np.asarray(x, dtype=np.float64)
+    finite = np.isfinite(x)
+    return np.where(finite, func(np.where(finite, x, 0.0)), np.nan)
+
+
 def degree_to_ddmmss_compact(degree):
-    """Convierte grados a formato compacto dd.mmss"""
-    # some problems here with accuracy
-    # performing the operation on [1.0, 40, 15, 59.99999999997101] results in 40.156, which is equivalent to 40.16 if the 6 is carried over.
-    sig, d, m, s = degree_to_ddmmss(degree)
+    """
+    Convierte grados a formato compacto dd.mmss
+
+    Pasa por la representación entera en ticks para que los segundos se
+    acarreen: 40.2666...° da 40.16 y no 40.155999... Los NaN e infinitos dan NaN.
+    """
+    return _finite_only(_degree_to_ddmmss_compact, degree)
+
+
+def _degree_to_ddmmss_compact(degree):
+    sig, d, m, s = ticks_to_ddmmss(degree_to_ticks(degree))
     return sig * (d + (m + s / 100) / 100)
 
 
@@ -40,23 +105,30 @@ def ddmmss_to_degree(sig, d, m, s):
 
 
 def ddmmss_compact_to_degree(x):
-    """Convierte grados, minutos y segundos en formato compacto a grados"""
-    sig = math.copysign(1.0, x)
-    da = abs(x)
-    d = math.floor(da)
-    dm = (da - d) * 100
-    if dm > 90:
-        dm -= 40
-    m = math.floor(dm)
-    s = (dm - m) * 100
-    if s > 90:
-        s -= 40
-    return sig * (d + (m + s / 60.0) / 60.0)
+    """
+    Convierte grados, minutos y segundos en formato compacto a grados
+
+    El valor se redondea a microsegundos de arco antes de separar los campos,
+    así que 40.16 se lee como 40° 16' 0" aunque el float sea 40.15999... Los NaN
+    e infinitos dan NaN.
+    """
+    return _finite_only(_ddmmss_compact_to_degree, x)
+
+
+def _ddmmss_compact_to_degree(x):
+    n = _round_ticks(abs(x) * 10**10)
+    d, r = n // 10**10, n % 10**10
+    ticks = (d * 60 + r // 10**8) * 60 * TICKS_PER_ARCSEC + r % 10**8
+    return _copysign(1.0, x) * ticks_to_degree(ticks)
 
 
 def scale_angle(a):
     """Sitúa un ángulo en [0,2p)"""
-    return a - 2 * PI * math.floor(a / (2 * PI))
+    if not isinstance(a, numbers.Real) and isinstance(a, np.ndarray):
+        kernel = get_kernel("scale_angle")
+        if kernel is not None:
+            return kernel(a)
+    return a - 2 * PI * _floor(a / (2 * PI))
 
 
 #
@@ -140,10 +212,374 @@ def ddmmss_to_radian(sig, d, m, s):
 # scale_hour: sitúa una hora en formato decimal en el intervalo [0,24)
 def scale_hour(h):
     """sitúa una hora en formato decimal en el intervalo [0,24)"""
-    return h - 24 * math.floor(h / 24)
+    return h - 24 * _floor(h / 24)
 
 
 # scale_degree: sitúa un ángulo en grados en formato decimal en el intervalo [0,360)
 def scale_degree(deg):
     """sitúa un ángulo en grados en formato decimal en el intervalo [0,360)"""
-    return deg - 360 * math.floor(deg / 360)
+    return deg - 360 * _floor(deg / 360)
+
+
+#
+# Cadenas sexagesimales
+#
+
+# Clases de carácter para interpretar cadenas sexagesimales: "12h34m56.7s",
+# "-40:15:59.9", "-40°15'59.9\"". La última posición de la tabla es _INVALID y
+# recibe todos los códigos mayores.
+_INVALID, _DIGIT, _DOT, _MINUS, _PLUS, _BLANK, _SEPARATOR = range(7)
+_SEPARATOR_TABLE = str.maketrans(dict.fromkeys(":hHdDmMsS°º'\"′″\t", " "))
+_PARSE_BLOCK = 1 << 16
+_MAX_DIGITS = 15
+
+
+@functools.lru_cache(maxsize=None)
+def _char_class():
+    """Tabla de clases de carácter, que se crea en el primer uso"""
+    table = np.zeros(0x2035, dtype=np.uint8)
+    table[[ord(ch) for ch in "0123456789"]] = _DIGIT
+    table[ord(".")] = _DOT
+    table[ord("-")] = _MINUS
+    table[ord("+")] = _PLUS
+    table[[0, ord(" "), ord("\t")]] = _BLANK
+    table[[ord(ch) for ch in ":hHdDmMsS°º'\"′″"]] = _SEPARATOR
+    return table
+
+
+def _parse_sexagesimal_str(text):
+    """Versión escalar de _parse_sexagesimal_codes para una sola cadena"""
+    t = text.strip(" \t\0")
+    negative = t[:1] == "-"
+    if t[:1] in ("-", "+"):
+        t = t[1:].lstrip(" \t")
+    fields = t.translate(_SEPARATOR_TABLE).split()
+    good = t[:1] in "0123456789." and t != "" and 1 <= len(fields) <= 3
+    for field in fields:
+        digits = field.replace(".", "", 1)
+        good &= digits.isascii() and digits.isdigit() and len(digits) <= _MAX_DIGITS
+    if not good:
+        return 1.0, 0.0, 0.0, 0.0, False
+    d, m, sec = [float(x) for x in fields] + [0.0] * (3 - len(fields))
+    return (-1.0 if negative else 1.0), d, m, sec, m < 60 and sec < 60
+
+
+def _parse_sexagesimal_codes(codes):
+    """
+    Interpreta un bloque de cadenas dado como matriz (N, ancho) de códigos
+
+    Recorre las columnas de la matriz una a una, de modo que cada paso es una
+    operación vectorizada sobre las N filas.
+
+    Returns:
+        signo, grados, minutos, segundos y máscara de filas válidas
+    """
+    n, w = codes.shape
+    table = _char_class()
+    cls = table[np.minimum(codes.T, table.size - 1)]
+    pow10 = 10.0 ** np.arange(_MAX_DIGITS + 1)
+
+    fields = np.zeros((4, n))
+    field = np.zeros(n, dtype=np.int8)
+    mantissa = np.zeros(n)
+    ndig = np.zeros(n, dtype=np.int64)
+    nfrac = np.zeros(n, dtype=np.int64)
+    dot = np.zeros(n, dtype=bool)
+    prev = np.zeros(n, dtype=bool)
+    signed = np.zeros(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    good = np.ones(n, dtype=bool)
+
+    for j in range(w + 1):
+        if j < w:
+            c = cls[j]
+            digit = (codes[:, j].astype(np.int64) - 48).astype(np.float64)
+        else:
+            c = np.full(n, _BLANK, dtype=np.uint8)
+        isdig = c == _DIGIT
+        isdot = c == _DOT
+        isnum = isdig | isdot
+
+        # Fin de un campo: se guarda su valor y se reinician los acumuladores
+        end = prev & ~isnum
+        if end.any():
+            good &= ~end | ((ndig >= 1) & (ndig <= _MAX_DIGITS))
+            value = mantissa / pow10[np.minimum(nfrac, _MAX_DIGITS)]
+            for k in (1, 2, 3):
+                np.copyto(fields[k], value, where=end & (field == k))
+            for acc in (mantissa, ndig, nfrac, dot):
+                acc[end] = 0
+        if j == w:
+            break
+
+        field += isnum & ~prev
+        mantissa = np.where(isdig, mantissa * 10 + digit, mantissa)
+        ndig += isdig
+        nfrac += isdig & dot
+        good &= ~(isdot & dot)
+        dot |= isdot
+
+        # El signo solo puede aparecer una vez y antes del primer campo
+        issign = (c == _MINUS) | (c == _PLUS)
+        good &= ~(issign & ((field > 0) | signed))
+        signed |= issign
+        negative |= c == _MINUS
+        good &= (c != _INVALID) & ~((c == _SEPARATOR) & (field == 0))
+        prev = isnum
+
+    good &= (field >= 1) & (field <= 3)
+    d, m, sec = fields[1], fields[2], fields[3]
+    good &= (m < 60) & (sec < 60)
+    return np.where(negative, -1.0, 1.0), d, m, sec, good
+
+
+def parse_sexagesimal(strings, hours=False, radian=False):
+    """
+    Interpreta cadenas en notación sexagesimal
+
+    Admite campos separados por espacios, ":" o las letras h/d/m/s y los símbolos
+    de grado, minuto y segundo, con uno, dos o tres campos ("-40", "-40 15.5",
+    "12h34m56.7s", "-00 30"). El signo se toma de la cadena, no del primer campo,
+    así que "-00 30" es -0.5.
+
+    Las cadenas se procesan por bloques como matrices de códigos de carácter, sin
+    crear objetos de Python por fila.
+
+    Args:
+        strings: Cadena o array de cadenas
+        hours: Si es True, las cadenas son horas y no grados
+        radian: Si es True, el resultado se da en radianes
+
+    Returns:
+        [valor, malo]: valor en grados (u horas, o radianes) y un booleano que
+        marca las filas que no se han podido interpretar, cuyo valor es NaN.
+    """
+    if isinstance(strings, str):
+        sig, d, m, sec, good = _parse_sexagesimal_str(strings)
+        value = ddmmss_to_degree(sig, d, m, sec) if good else math.nan
+        if radian:
+            value = hour_to_radian(value) if hours else degree_to_radian(value)
+        return [value, not good]
+
+    arr = np.asarray(strings)
+    if arr.dtype.kind != "U":
+        arr = arr.astype(str)
+    shape = arr.shape
+    flat = np.ascontiguousarray(arr.reshape(-1))
+    width = max(flat.dtype.itemsize // 4, 1)
+    codes = flat.view(np.uint32).reshape(flat.size, width) if flat.size else None
+
+    value = np.full(flat.size, np.nan)
+    bad = np.ones(flat.size, dtype=bool)
+    for i in range(0, flat.size, _PARSE_BLOCK):
+        block = slice(i, i + _PARSE_BLOCK)
+        sig, d, m, sec, good = _parse_sexagesimal_codes(codes[block])
+        value[block] = np.where(good, ddmmss_to_degree(sig, d, m, sec), np.nan)
+        bad[block] = ~good
+
+    if radian:
+        value = hour_to_radian(value) if hours else degree_to_radian(value)
+    if not shape:
+        return [float(value[0]), bool(bad[0])]
+    return [value.reshape(shape), bad.reshape(shape)]
+
+
+def _sexagesimal_matrix(
+    values, hours, precision, sep, plus, signed_zero=False, newline=False
+):
+    """
+    Matriz (N, ancho) de códigos UCS4 con la representación sexagesimal
+
+    El redondeo se hace sobre el número entero de unidades de la última cifra,
+    de modo que 59.9999 s pasa a ser 0 s y se acarrea a los minutos. El signo se
+    toma también del valor redondeado, salvo con signed_zero=True.
+    """
+    x = np.asarray(values, dtype=np.float64).reshape(-1)
+    sep = (sep, sep, "") if len(sep) == 1 else tuple(sep)
+    nan = ~np.isfinite(x)
+
+    scale = 10**precision
+    ticks = np.rint(np.where(nan, 0.0, np.abs(x)) * (3600 * scale)).astype(np.int64)
+    negative = np.signbit(x) & ~nan
+    if not signed_zero:
+        negative &= ticks > 0
+    frac = ticks % scale
+    sec = ticks // scale % 60
+    minutes = ticks // (60 * scale) % 60
+    d = ticks // (3600 * scale)
+
+    if plus is None:
+        plus = not hours
+    dwidth = max(2, len(str(int(d.max()))) if d.size else 2)
+    signed = plus or bool(negative.any())
+
+    parts = []
+    if signed:
+        parts.append(np.where(negative, ord("-"), ord("+" if plus else " ")))
+    parts += [d // 10**k % 10 + 48 for k in reversed(range(dwidth))]
+    parts += [ord(ch) for ch in sep[0]]
+    parts += [minutes // 10 + 48, minutes % 10 + 48]
+    parts += [ord(ch) for ch in sep[1]]
+    parts += [sec // 10 + 48, sec % 10 + 48]
+    if precision > 0:
+        parts.append(ord("."))
+        parts += [frac // 10**k % 10 + 48 for k in reversed(range(precision))]
+    parts += [ord(ch) for ch in sep[2]]
+    if newline:
+        parts.append(ord("\n"))
+
+    mat = np.empty((x.size, len(parts)), dtype=np.uint32)
+    for j, col in enumerate(parts):
+        mat[:, j] = col
+    if nan.any():
+        mat[nan, : len(parts) - newline] = ord(" ")
+        mat[nan, :3] = [ord(ch) for ch in "nan"]
+    return mat
+
+
+def format_sexagesimal(
+    values, hours=False, precision=2, sep=":", plus=None, signed_zero=False
+):
+    """
+    Convierte grados u horas a cadenas sexagesimales de precisión fija
+
+    Args:
+        values: Escalar o array en grados (u horas)
+        hours: Si es True, los valores son horas
+        precision[opt]: Número de decimales de los segundos
+        sep[opt]: Separador entre campos (":" o " "), o tres separadores como
+            "hms" o "°'\"" para escribir "12h34m56.70s"
+        plus[opt]: Si es True, se escribe "+" en los valores positivos. Por
+            defecto solo para grados.
+        signed_zero[opt]: Si es True, los valores negativos que se redondean a
+            cero (-0.0, -1e-9) se escriben con "-". Por defecto se escriben
+            como cero positivo.
+
+    Returns:
+        Cadena, o array de cadenas con la forma de values
+    """
+    mat = _sexagesimal_matrix(values, hours, precision, sep, plus, signed_zero)
+    out = mat.view(f"U{mat.shape[1]}").reshape(np.shape(values))
+    if out.ndim == 0:
+        return str(out)
+    return out
+
+
+def write_sexagesimal(
+    fh, values, hours=False, precision=2, sep=":", plus=None, signed_zero=False
+):
+    """
+    Escribe valores en formato sexagesimal en un archivo, uno por línea
+
+    Todas las líneas se escriben de una vez, sin crear objetos por fila.
+
+    Args:
+        fh: Archivo abierto en modo texto o binario
+        values: Array en grados (u horas)
+        hours, precision, sep, plus, signed_zero: Ver format_sexagesimal
+    """
+    mat = _sexagesimal_matrix(
+        values, hours, precision, sep, plus, signed_zero, newline=True
+    )
+    text = mat.reshape(-1).view(f"U{mat.size}")[0] if mat.size else ""
+    if isinstance(fh, io.TextIOBase):
+        fh.write(text)
+    else:
+        fh.write(text.encode("utf-8"))
+
+
+#
+# Representación entera
+#
+
+# Los ángulos se guardan como un número entero (int64) de microsegundos de arco,
+# lo que cubre ±7.1e6 vueltas sin pérdida y representa exactamente cualquier
+# valor sexagesimal con hasta seis decimales en los segundos de arco.
+TICKS_PER_ARCSEC = 10**6
+TICKS_PER_DEGREE = 3600 * TICKS_PER_ARCSEC
+TICKS_PER_HOUR = 15 * TICKS_PER_DEGREE
+
+
+# Límite (excluido) de los valores que caben en un int64
+_TICKS_LIMIT = 2.0**63
+
+
+def _round_ticks(x):
+    """
+    Redondea al entero más próximo: int para escalares, int64 para arrays
+
+    Los NaN, los infinitos y, en arrays, los valores fuera del rango de int64 no
+    tienen representación en ticks y dan ValueError.
+    """
+    if isinstance(x, numbers.Real):
+        if not math.isfinite(x):
+            raise ValueError(f"Can't convert {x} to ticks")
+        return round(x)
+    x = np.rint(x)
+    if not (np.abs(x) < _TICKS_LIMIT).all():
+        raise ValueError("Can't convert NaN, infinite or out of range values to ticks")
+    return x.astype(np.int64)
+
+
+def _ticks_to_sexagesimal(ticks, unit):
+    """Separa un número de ticks en [sig, a, m, s], con a en la unidad dada"""
+    sig = _copysign(1.0, ticks)
+    t = abs(ticks)
+    minute = unit // 60
+    a, r = t // unit, t % unit
+    return [sig, a, r // minute, r % minute / (minute // 60)]
+
+
+def degree_to_ticks(deg):
+    """Convierte grados a ticks (microsegundos de arco)"""
+    return _round_ticks(deg * TICKS_PER_DEGREE)
+
+
+def ticks_to_degree(ticks):
+    """Convierte ticks (microsegundos de arco) a grados"""
+    return ticks / TICKS_PER_DEGREE
+
+
+def hour_to_ticks(h):
+    """Convierte horas a ticks (microsegundos de arco)"""
+    return _round_ticks(h * TICKS_PER_HOUR)
+
+
+def ticks_to_hour(ticks):
+    """Convierte ticks (microsegundos de arco) a horas"""
+    return ticks / TICKS_PER_HOUR
+
+
+def radian_to_ticks(rad):
+    """Convierte radianes a ticks (microsegundos de arco)"""
+    return _round_ticks(radian_to_degree(rad) * TICKS_PER_DEGREE)
+
+
+def ticks_to_radian(ticks):
+    """Convierte ticks (microsegundos de arco) a radianes"""
+    return degree_to_radian(ticks_to_degree(ticks))
+
+
+def ddmmss_to_ticks(sig, d, m, s):
+    """Formato grados, minutos, segundos a ticks (microsegundos de arco)"""
+    return _round_ticks(sig * (((d * 60 + m) * 60 + s) * TICKS_PER_ARCSEC))
+
+
+def ticks_to_ddmmss(ticks):
+    """
+    Convierte ticks a formato grados, minutos, segundos
+
+    Los grados y minutos son enteros y los segundos se calculan a partir del
+    resto entero, de modo que nunca aparece 59.99999 en lugar de acarrear.
+    """
+    return _ticks_to_sexagesimal(ticks, TICKS_PER_DEGREE)
+
+
+def hhmmss_to_ticks(sig, h, m, s):
+    """Formato horas, minutos, segundos a ticks (microsegundos de arco)"""
+    return _round_ticks(sig * (((h * 60 + m) * 60 + s) * (TICKS_PER_HOUR // 3600)))
+
+
+def ticks_to_hhmmss(ticks):
+    """Convierte ticks a formato horas, minutos, segundos"""
+    return _ticks_to_sexagesimal(ticks, TICKS_PER_HOUR)
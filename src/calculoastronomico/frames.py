@@ -0,0 +1,234 @@
+"""
+Grafo de sistemas de referencia.
+
+Cada sistema de referencia es un nodo y cada transformación afín entre dos
+sistemas (rotación, traslación o ambas) es una arista. Al pedir una conversión
+entre dos sistemas cualesquiera se busca el camino más corto en el grafo, se
+compone en una única transformación x' = M x + b y se guarda en caché, de modo
+que una conversión con varios saltos cuesta lo mismo que una con uno solo.
+"""
+from collections import deque
+
+import numpy as np
+
+import calculoastronomico.constant as c
+from calculoastronomico.formats import degree_to_radian
+from calculoastronomico.transforms import (
+    _change_frame,
+    apply_matrix,
+    rotation_Euler_matrix,
+    rotation_matrix,
+    translation,
+)
+
+
+def apply_affine(M, b, x):
+    """
+    Aplica una transformación afín x' = M x + b
+
+    Args:
+        M: Matriz 3x3
+        b: Vector de desplazamiento (3,)
+        x: Vector original, o lote de vectores
+
+    Returns:
+        Vector transformado, con la misma disposición que x
+    """
+    x1 = apply_matrix(M, x)
+    if not b.any():
+        return x1
+    if isinstance(x1, np.ndarray):
+        x1 += b
+        return x1
+    return translation(x1, (-b).tolist())
+
+
+def compose_affine(first, second):
+    """
+    Compone dos transformaciones afines (M, b)
+
+    Args:
+        first: Transformación que se aplica primero
+        second: Transformación que se aplica después
+
+    Returns:
+        Transformación (M, b) equivalente a aplicar first y luego second
+    """
+    M1, b1 = first
+    M2, b2 = second
+    return M2 @ M1, M2 @ b1 + b2
+
+
+def invert_affine(M, b):
+    """
+    Invierte una transformación afín (M, b)
+
+    Args:
+        M: Matriz 3x3
+        b: Vector de desplazamiento (3,)
+
+    Returns:
+        Transformación (M', b') tal que x = M' x' + b'
+    """
+    Minv = np.linalg.inv(M)
+    return Minv, -Minv @ b
+
+
+class FrameGraph:
+    """
+    Registro de sistemas de referencia y de las transformaciones entre ellos.
+    """
+
+    def __init__(self):
+        self._edges = {}
+        self._cache = {}
+
+    @property
+    def frames(self):
+        """Sistemas de referencia registrados"""
+        return sorted(self._edges)
+
+    def add_transform(self, src, dst, matrix=None, offset=None, inverse=True):
+        """
+        Registra la transformación x_dst = matrix x_src + offset
+
+        Args:
+            src: Nombre del sistema de origen
+            dst: Nombre del sistema de destino
+            matrix[opt]: Matriz 3x3, la identidad si no se da
+            offset[opt]: Desplazamiento (3,), nulo si no se da
+            inverse[opt]: Si es True, registra también la transformación inversa
+        """
+        M = np.eye(3) if matrix is None else np.array(matrix, dtype=float)
+        b = np.zeros(3) if offset is None else np.array(offset, dtype=float)
+        if M.shape != (3, 3) or b.shape != (3,):
+            raise ValueError("An affine transform needs a 3x3 matrix and a 3-vector")
+
+        self._edges.setdefault(src, {})[dst] = (M, b)
+        self._edges.setdefault(dst, {})
+        if inverse:
+            self._edges[dst][src] = invert_affine(M, b)
+        self._cache.clear()
+
+    def add_translation(self, src, dst, R, inverse=True):
+        """
+        Registra una traslación al origen O', situado en R respecto a O
+
+        Args:
+            src: Nombre del sistema con origen en O
+            dst: Nombre del sistema con origen en O'
+            R: Posicion de O' respecto a O
+            inverse[opt]: Si es True, registra también la transformación inversa
+        """
+        offset = -np.asarray(R, dtype=float)
+        self.add_transform(src, dst, offset=offset, inverse=inverse)
+
+    def path(self, src, dst):
+        """
+        Busca el camino con menos saltos entre dos sistemas
+
+        Args:
+            src: Nombre del sistema de origen
+            dst: Nombre del sistema de destino
+
+        Returns:
+            Lista de sistemas desde src hasta dst, ambos incluidos
+        """
+        for frame in (src, dst):
+            if frame not in self._edges:
+                raise KeyError(f"Unknown reference frame {frame!r}")
+
+        previous = {src: None}
+        queue = deque([src])
+        while queue:
+            node = queue.popleft()
+            if node == dst:
+                break
+            for nxt in self._edges[node]:
+                if nxt not in previous:
+                    previous[nxt] = node
+                    queue.append(nxt)
+        else:
+            raise ValueError(f"No path from frame {src!r} to frame {dst!r}")
+
+        path = [dst]
+        while path[-1] != src:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def transform(self, src, dst):
+        """
+        Transformación afín compuesta entre dos sistemas
+
+        El resultado se guarda en caché hasta que se registre otra arista.
+
+        Args:
+            src: Nombre del sistema de origen
+            dst: Nombre del sistema de destino
+
+        Returns:
+            Transformación (M, b) tal que x_dst = M x_src + b
+        """
+        key = (src, dst)
+        if key not in self._cache:
+            path = self.path(src, dst)
+            T = (np.eye(3), np.zeros(3))
+            for a, b in zip(path[:-1], path[1:]):
+                T = compose_affine(T, self._edges[a][b])
+            for arr in T:
+                arr.flags.writeable = False
+            self._cache[key] = T
+        return self._cache[key]
+
+    def convert(self, x, src, dst):
+        """
+        Convierte un vector o un lote de vectores entre dos sistemas
+
+        Args:
+            x: Vector en el sistema src, o lote de vectores
+            src: Nombre del sistema de origen
+            dst: Nombre del sistema de destino
+
+        Returns:
+            Vector en el sistema dst
+        """
+        M, b = self.transform(src, dst)
+        return _change_frame(x, apply_affine(M, b, x), src, dst)
+
+
+def default_graph(eps=None):
+    """
+    Grafo con los sistemas ecuatorial, eclíptico y galáctico
+
+    Args:
+        eps[opt]: Oblicuidad de la eclíptica media o verdadera (radianes).
+
+    Returns:
+        FrameGraph con las aristas de transforms.py
+    """
+    if eps is None:
+        eps = degree_to_radian(23.5)
+    graph = FrameGraph()
+    graph.add_transform("equatorial", "ecliptic", rotation_matrix(1, eps))
+    graph.add_transform(
+        "equatorial", "galactic", rotation_Euler_matrix(*c.galactic_angles)
+    )
+    return graph
+
+
+frame_graph = default_graph()
+
+
+def convert(x, src, dst):
+    """
+    Convierte un vector o un lote de vectores con el grafo por defecto
+
+    Args:
+        x: Vector en el sistema src, o lote de vectores
+        src: Nombre del sistema de origen
+        dst: Nombre del sistema de destino
+
+    Returns:
+        Vector en el sistema dst
+    """
+    return frame_graph.convert(x, src, dst)
@@ -0,0 +1,202 @@
+"""
+Evaluación diferida de cadenas de transformaciones.
+
+lazy(v) devuelve una expresión que registra las transformaciones en lugar de
+aplicarlas. Al añadir cada paso, las rotaciones y traslaciones consecutivas se
+componen en una única transformación afín y los pares que se anulan (p. ej.
+equatorial_to_ecliptic seguido de ecliptic_to_equatorial) desaparecen. compute()
+recorre después el lote una sola vez, por bloques que caben en la caché, y
+aplica a cada bloque todos los pasos seguidos::
+
+    sph = (
+        lazy(v)
+        .spherical_to_rectangular()
+        .ecliptic_to_equatorial()
+        .equatorial_to_galactic()
+        .rectangular_to_spherical()
+        .compute()
+    )
+"""
+import numpy as np
+
+import calculoastronomico.constant as c
+from calculoastronomico.containers import Vector3, VectorArray
+from calculoastronomico.formats import degree_to_radian
+from calculoastronomico.frames import compose_affine
+from calculoastronomico.transforms import (
+    _check_frame,
+    apply_matrix,
+    rectangular_to_spherical,
+    rotation_Euler_matrix,
+    rotation_matrix,
+    spherical_to_rectangular,
+    translation,
+)
+
+# Filas por bloque en compute(): 4096 vectores son 96 kB por array intermedio
+LAZY_BLOCK = 1 << 12
+
+# Máxima diferencia con la identidad de una transformación que se descarta
+_IDENTITY_TOL = 8 * np.finfo(float).eps
+
+_NONLINEAR = {
+    "spherical_to_rectangular": spherical_to_rectangular,
+    "rectangular_to_spherical": rectangular_to_spherical,
+}
+
+
+def _push(steps, step):
+    """Añade un paso al plan, fusionando transformaciones afines y anulando inversas"""
+    if steps and step[0] == "affine" and steps[-1][0] == "affine":
+        M, b = compose_affine(steps[-1][1:], step[1:])
+        steps = steps[:-1]
+        if np.abs(M - np.eye(3)).max() <= _IDENTITY_TOL and not np.abs(b).max():
+            return steps
+        return steps + (("affine", M, b),)
+    if steps and (steps[-1][0], step[0]) == (
+        "rectangular_to_spherical",
+        "spherical_to_rectangular",
+    ):
+        return steps[:-1]
+    return steps + (step,)
+
+
+class Lazy:
+    """
+    Cadena diferida de transformaciones sobre un vector o un lote de vectores.
+
+    Args:
+        x: Vector, lote (N, 3), lista de tres columnas, Vector3 o VectorArray
+    """
+
+    def __init__(self, x):
+        self._x = x
+        self._steps = ()
+        self.frame = getattr(x, "frame", None)
+
+    @property
+    def plan(self):
+        """Pasos que se aplicarán: ("affine", M, b) o el nombre de la rutina"""
+        return [step if step[0] == "affine" else step[0] for step in self._steps]
+
+    def _then(self, step, src=None, dst=None):
+        lz = Lazy(self._x)
+        lz._steps = _push(self._steps, step)
+        lz.frame = self.frame
+        if src is not None and self.frame is not None:
+            _check_frame(self, src)
+            lz.frame = dst
+        return lz
+
+    def _affine(self, M, b=None, src=None, dst=None):
+        b = np.zeros(3) if b is None else np.asarray(b, dtype=float)
+        return self._then(("affine", np.asarray(M, dtype=float), b), src, dst)
+
+    def spherical_to_rectangular(self):
+        return self._then(("spherical_to_rectangular",))
+
+    def rectangular_to_spherical(self):
+        return self._then(("rectangular_to_spherical",))
+
+    def apply_matrix(self, M):
+        return self._affine(M)
+
+    def translation(self, R):
+        return self._affine(np.eye(3), -np.asarray(R, dtype=float))
+
+    def rotation(self, n, theta):
+        return self._affine(rotation_matrix(n, theta))
+
+    def rotation_Euler(self, phi, xi, zeta):
+        return self._affine(rotation_Euler_matrix(phi, xi, zeta))
+
+    def equatorial_to_ecliptic(self, eps=None):
+        eps = degree_to_radian(23.5) if eps is None else eps
+        return self._affine(rotation_matrix(1, eps), src="equatorial", dst="ecliptic")
+
+    def ecliptic_to_equatorial(self, eps=None):
+        eps = degree_to_radian(23.5) if eps is None else eps
+        return self._affine(rotation_matrix(1, eps).T, src="ecliptic", dst="equatorial")
+
+    def equatorial_to_galactic(self):
+        M = rotation_Euler_matrix(*c.galactic_angles)
+        return self._affine(M, src="equatorial", dst="galactic")
+
+    def galactic_to_equatorial(self):
+        M = rotation_Euler_matrix(*c.galactic_angles).T
+        return self._affine(M, src="galactic", dst="equatorial")
+
+    def compute(self, out=None, blocksize=LAZY_BLOCK):
+        """
+        Evalúa la cadena
+
+        Args:
+            out[opt]: Array (N, 3) donde se escribe el resultado de un lote
+            blocksize[opt]: Filas por bloque
+
+        Returns:
+            El resultado, con la misma disposición que el vector de entrada
+        """
+        x = self._x
+        if isinstance(x, VectorArray):
+            data = x.data
+        elif isinstance(x, np.ndarray) and x.ndim == 2:
+            data = x
+        elif not isinstance(x, (list, tuple, Vector3)) or np.ndim(x[0]) == 0:
+            return self._compute_vector(x)
+        else:
+            data = None
+
+        n = len(data) if data is not None else len(x[0])
+        if out is None:
+            out = np.empty((n, 3))
+        for start in range(0, n, blocksize):
+            block = slice(start, start + blocksize)
+            if data is not None:
+                v = data[block]
+            else:
+                v = np.stack([col[block] for col in x], axis=-1)
+            for step in self._steps:
+                if step[0] == "affine":
+                    v = v @ step[1].T
+                    if step[2].any():
+                        v += step[2]
+                else:
+                    v = _NONLINEAR[step[0]](v)
+            out[block] = v
+
+        if isinstance(x, VectorArray):
+            return VectorArray(out, self.frame, x.unit)
+        if data is None:
+            return [out[:, 0], out[:, 1], out[:, 2]]
+        return out
+
+    def _compute_vector(self, x):
+        """compute() para un único vector"""
+        for step in self._steps:
+            if step[0] == "affine":
+                x = apply_matrix(step[1], x)
+                if step[2].any():
+                    x = translation(x, (-step[2]).tolist())
+            else:
+                x = _NONLINEAR[step[0]](x)
+        if isinstance(x, Vector3) and self.frame is not None:
+            x.frame = self.frame
+        return x
+
+    def __repr__(self):
+        names = [step[0] for step in self._steps]
+        return f"Lazy(frame={self.frame!r}, plan={names})"
+
+
+def lazy(x):
+    """
+    Expresión diferida sobre x, ver Lazy
+
+    Args:
+        x: Vector, lote (N, 3), lista de tres columnas, Vector3 o VectorArray
+
+    Returns:
+        Lazy sin ningún paso
+    """
+    return Lazy(x)
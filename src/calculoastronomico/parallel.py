@@ -0,0 +1,295 @@
+"""
+Ejecución en paralelo de las rutinas por lotes.
+
+map_chunks divide las entradas de una rutina de transforms.py o formats.py en
+bloques a lo largo del primer eje y los reparte entre varios hilos o procesos::
+
+    from calculoastronomico.parallel import map_chunks
+    from calculoastronomico.transforms import equatorial_to_galactic
+
+    gal = map_chunks(equatorial_to_galactic, v, workers=8, executor="process")
+
+Con executor="thread" los bloques se procesan en hilos del mismo proceso, lo que
+solo acelera las rutinas cuyo cálculo libera el GIL (las operaciones de NumPy
+sobre arrays grandes). Con executor="process" las entradas y las salidas se
+guardan en memoria compartida, de modo que los arrays no se serializan; solo
+viajan entre procesos la rutina, los argumentos escalares y los límites de
+cada bloque.
+
+Cada bloque escribe su resultado en su propia porción de la salida, así que el
+resultado no depende del orden en que terminen los bloques.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+EXECUTORS = ("thread", "process")
+
+# Filas por bloque por defecto
+CHUNKSIZE = 1 << 20
+
+_workers = os.cpu_count() or 1
+
+
+def set_workers(n=None):
+    """
+    Fija el número de hilos o procesos por defecto
+
+    Args:
+        n[opt]: Número de workers, os.cpu_count() si no se da
+    """
+    global _workers
+    n = (os.cpu_count() or 1) if n is None else int(n)
+    if n < 1:
+        raise ValueError(f"The number of workers must be positive, got {n}")
+    _workers = n
+
+
+def get_workers():
+    """Número de hilos o procesos por defecto"""
+    return _workers
+
+
+def _rows(args):
+    """Número de filas de la primera entrada que es un array o lista de columnas"""
+    for arg in args:
+        if isinstance(arg, np.ndarray) and arg.ndim:
+            return len(arg)
+        if _is_columns(arg):
+            return len(arg[0])
+    raise ValueError("map_chunks needs at least one array argument")
+
+
+def _is_columns(arg):
+    """True si arg es una lista de columnas, p. ej. un lote [x, y, z]"""
+    return (
+        isinstance(arg, (list, tuple))
+        and len(arg) > 0
+        and all(isinstance(a, np.ndarray) and a.ndim for a in arg)
+    )
+
+
+def _split(arg, n, block):
+    """Bloque de un argumento: los arrays de n filas se cortan, el resto no"""
+    if isinstance(arg, np.ndarray) and arg.ndim and len(arg) == n:
+        return arg[block]
+    if _is_columns(arg) and all(len(a) == n for a in arg):
+        return type(arg)(a[block] for a in arg)
+    return arg
+
+
+def _as_list(result):
+    """Arrays de salida de una rutina: un array o una lista de arrays"""
+    if isinstance(result, np.ndarray):
+        return [result]
+    return [np.asarray(r) for r in result]
+
+
+def _from_list(result, outputs):
+    """Da a las salidas la misma forma (array o lista) que result"""
+    if isinstance(result, np.ndarray):
+        return outputs[0]
+    return type(result)(outputs) if isinstance(result, tuple) else list(outputs)
+
+
+class _Shared:
+    """Arrays en memoria compartida, que se liberan al salir del bloque with"""
+
+    def __init__(self):
+        self._blocks = []
+
+    def array(self, shape, dtype):
+        """Array nuevo en memoria compartida y su descriptor para otro proceso"""
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = SharedMemory(create=True, size=size)
+        self._blocks.append(shm)
+        arr = np.ndarray(shape, dtype, buffer=shm.buf)
+        return arr, (shm.name, shape, dtype.str)
+
+    def share(self, arg, n):
+        """Copia en memoria compartida los arrays de n filas de un argumento"""
+        if isinstance(arg, np.ndarray) and arg.ndim and len(arg) == n:
+            arr, spec = self.array(arg.shape, arg.dtype)
+            arr[...] = arg
+            return ("array", spec)
+        if _is_columns(arg) and all(len(a) == n for a in arg):
+            return ("columns", type(arg), [self.share(a, n)[1] for a in arg])
+        return ("value", arg)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        _close(self._blocks)
+        for shm in self._blocks:
+            shm.unlink()
+        self._blocks.clear()
+
+
+def _attach(spec, opened):
+    name, shape, dtype = spec
+    shm = SharedMemory(name=name)
+    opened.append(shm)
+    return np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+
+
+def _close(blocks):
+    """Cierra bloques de memoria compartida; los que aún tienen vistas se cierran
+    al liberarse estas"""
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:  # pragma: no cover
+            pass
+
+
+def _compute_chunk(func, arg_specs, kwargs, out_specs, block, opened):
+    args = []
+    for spec in arg_specs:
+        if spec[0] == "array":
+            args.append(_attach(spec[1], opened)[block])
+        elif spec[0] == "columns":
+            args.append(spec[1](_attach(s, opened)[block] for s in spec[2]))
+        else:
+            args.append(spec[1])
+    result = _as_list(func(*args, **kwargs))
+    returned = []
+    for spec, r in zip(out_specs, result):
+        if spec is None:
+            returned.append(r)
+        else:
+            _attach(spec, opened)[block] = r
+    return returned
+
+
+def _process_chunk(func, arg_specs, kwargs, out_specs, block):
+    """Procesa un bloque en otro proceso, leyendo y escribiendo en memoria compartida"""
+    opened = []
+    try:
+        return _compute_chunk(func, arg_specs, kwargs, out_specs, block, opened)
+    finally:
+        _close(opened)
+
+
+def _fixed(part):
+    """True si la salida tiene un dtype de tamaño fijo, que no depende del bloque"""
+    return part.dtype.kind not in "USO"
+
+
+def _store(outputs, k, block, result):
+    """Guarda el resultado del bloque k: en su porción de la salida o, si el
+    dtype depende del bloque (cadenas), en su posición de la lista de trozos"""
+    for out, r in zip(outputs, result):
+        if isinstance(out, list):
+            out[k] = r
+        else:
+            out[block] = r
+
+
+def _join(outputs):
+    return [np.concatenate(out) if isinstance(out, list) else out for out in outputs]
+
+
+def map_chunks(
+    func, *args, chunksize=CHUNKSIZE, workers=None, executor="thread", **kwargs
+):
+    """
+    Aplica una rutina por lotes a bloques de filas en paralelo
+
+    Se cortan en bloques los argumentos que son arrays, o listas de columnas,
+    con tantas filas como el primero de ellos; los demás se pasan tal cual. La
+    rutina debe devolver un array, o una lista de arrays, con una fila por fila
+    de la entrada. Las salidas de cadenas, cuyo ancho puede cambiar de un bloque
+    a otro, se concatenan al final; en format_sexagesimal, el ancho del campo de
+    grados se decide entonces en cada bloque. Una entrada sin filas se pasa a
+    func tal cual.
+
+    Args:
+        func: Rutina, p. ej. transforms.equatorial_to_galactic. Con
+            executor="process" tiene que poder serializarse con pickle, como
+            cualquier función definida a nivel de módulo.
+        *args: Argumentos de func
+        chunksize[opt]: Filas por bloque
+        workers[opt]: Número de hilos o procesos, get_workers() si no se da
+        executor[opt]: "thread" o "process"
+        **kwargs: Argumentos con nombre de func, iguales para todos los bloques
+
+    Returns:
+        El resultado de func sobre la entrada completa, con las filas en el
+        mismo orden que la entrada.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, choose one of {EXECUTORS}")
+    workers = _workers if workers is None else workers
+    n = _rows(args)
+    if n == 0:
+        return func(*args, **kwargs)
+    blocks = [slice(i, min(i + chunksize, n)) for i in range(0, n, chunksize)]
+
+    # El primer bloque se calcula aquí para conocer las salidas
+    first = func(*(_split(a, n, blocks[0]) for a in args), **kwargs)
+    if len(blocks) == 1:
+        return first
+    parts = _as_list(first)
+    if executor == "process" and workers > 1:
+        with _Shared() as shared:
+            outputs = _map_processes(
+                shared, func, args, kwargs, n, parts, blocks, workers
+            )
+    else:
+        outputs = _map_threads(func, args, kwargs, n, parts, blocks, workers)
+    return _from_list(first, outputs)
+
+
+def _map_threads(func, args, kwargs, n, parts, blocks, workers):
+    """Parte de map_chunks con executor="thread", o con un único worker"""
+    outputs = [
+        np.empty((n,) + p.shape[1:], p.dtype) if _fixed(p) else [None] * len(blocks)
+        for p in parts
+    ]
+    _store(outputs, 0, blocks[0], parts)
+
+    def run(k):
+        result = func(*(_split(a, n, blocks[k]) for a in args), **kwargs)
+        _store(outputs, k, blocks[k], _as_list(result))
+
+    if workers == 1:
+        for k in range(1, len(blocks)):
+            run(k)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(run, range(1, len(blocks))))
+    return _join(outputs)
+
+
+def _map_processes(shared, func, args, kwargs, n, parts, blocks, workers):
+    """Parte de map_chunks con executor="process"; devuelve copias de las salidas
+    para que no quede ninguna vista de la memoria compartida"""
+    arg_specs = [shared.share(a, n) for a in args]
+    outputs, out_specs = [], []
+    for p in parts:
+        if _fixed(p):
+            out, spec = shared.array((n,) + p.shape[1:], p.dtype)
+        else:
+            out, spec = [None] * len(blocks), None
+        outputs.append(out)
+        out_specs.append(spec)
+    _store(outputs, 0, blocks[0], parts)
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_process_chunk, func, arg_specs, kwargs, out_specs, block)
+            for block in blocks[1:]
+        ]
+        for k, future in enumerate(futures, 1):
+            returned = iter(future.result())
+            for i, spec in enumerate(out_specs):
+                if spec is None:
+                    outputs[i][k] = next(returned)
+    return [
+        out.copy() if isinstance(out, np.ndarray) else np.concatenate(out)
+        for out in outputs
+    ]
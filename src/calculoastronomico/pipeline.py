@@ -0,0 +1,361 @@
+"""
+Conversión de catálogos por bloques.
+
+Cada etapa es un generador que recibe y produce bloques de filas, representados
+como diccionarios {columna: array de NumPy}. Como en cada momento solo hay un
+bloque en memoria, el consumo está acotado por chunksize y no por el tamaño del
+catálogo::
+
+    chunks = read_catalog("data/raw/catalogo.csv")
+    chunks = sexagesimal_to_radians(chunks)
+    chunks = to_frame(chunks, "galactic")
+    write_catalog(chunks, "data/preprocessed/catalogo.csv")
+
+Los archivos Parquet necesitan pyarrow. Los archivos con extensión .cat son
+catálogos binarios (ver catalog.py), que se leen sin copiar los datos.
+"""
+import csv
+import itertools
+import math
+import os
+
+import numpy as np
+
+from calculoastronomico.catalog import SUFFIX, open_binary, write_binary_chunks
+from calculoastronomico.formats import (
+    ddmmss_to_radian,
+    hhmmss_to_radian,
+    parse_sexagesimal,
+    scale_angle,
+)
+from calculoastronomico.frames import apply_affine, frame_graph
+from calculoastronomico.transforms import (
+    rectangular_to_spherical,
+    spherical_to_rectangular,
+)
+
+CHUNKSIZE = 100_000
+
+
+def _is_parquet(path):
+    return os.fspath(path).lower().endswith((".parquet", ".pq"))
+
+
+def _is_binary(path):
+    return os.fspath(path).lower().endswith(SUFFIX)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("Reading or writing Parquet files requires pyarrow") from e
+    return pyarrow
+
+
+def read_csv(path, chunksize=CHUNKSIZE, delimiter=","):
+    """
+    Lee un CSV con cabecera por bloques
+
+    Args:
+        path: Ruta del archivo
+        chunksize[opt]: Número de filas por bloque
+        delimiter[opt]: Separador de columnas
+
+    Yields:
+        Bloques {columna: array de cadenas}. Un archivo vacío no da ningún
+        bloque y uno con solo la cabecera da un bloque sin filas, de modo que
+        la cabecera llega al archivo de salida.
+    """
+    with open(path, newline="") as fh:
+        reader = csv.reader(fh, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        empty = True
+        while True:
+            rows = list(itertools.islice(reader, chunksize))
+            if not rows:
+                break
+            empty = False
+            columns = zip(*rows)
+            yield {name: np.array(col) for name, col in zip(header, columns)}
+        if empty:
+            yield {name: np.array([], dtype=str) for name in header}
+
+
+def read_parquet(path, chunksize=CHUNKSIZE, columns=None):
+    """
+    Lee un archivo Parquet por bloques
+
+    Args:
+        path: Ruta del archivo
+        chunksize[opt]: Número de filas por bloque
+        columns[opt]: Columnas que se leen, todas si no se da
+
+    Yields:
+        Bloques {columna: array}
+    """
+    pa = _import_pyarrow()
+    pf = pa.parquet.ParquetFile(path)
+    for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+        yield {
+            name: col.to_numpy(zero_copy_only=False)
+            for name, col in zip(batch.schema.names, batch.columns)
+        }
+
+
+def read_binary(path, chunksize=CHUNKSIZE, columns=None):
+    """
+    Lee un catálogo binario por bloques
+
+    Args:
+        path: Ruta del archivo
+        chunksize[opt]: Número de filas por bloque
+        columns[opt]: Columnas que se leen, todas si no se da
+
+    Yields:
+        Bloques {columna: array}, vistas de solo lectura del archivo proyectado.
+        La columna frame se da con los nombres de los sistemas y no con sus
+        códigos, de modo que el bloque puede escribirse en otro catálogo.
+    """
+    cat = open_binary(path)
+    for chunk in cat.chunks(chunksize, columns):
+        if "frame" in chunk:
+            chunk["frame"] = cat.frame_names(chunk["frame"])
+        yield chunk
+
+
+def read_catalog(path, chunksize=CHUNKSIZE, **kwargs):
+    """Lee un catálogo CSV, Parquet o binario (según la extensión) por bloques"""
+    if _is_binary(path):
+        return read_binary(path, chunksize, **kwargs)
+    if _is_parquet(path):
+        return read_parquet(path, chunksize, **kwargs)
+    return read_csv(path, chunksize, **kwargs)
+
+
+def _sign(col):
+    """Signo (+1/-1) de una columna numérica o de cadenas como '-', '+', '-00'"""
+    if col.dtype.kind in "US":
+        negative = np.char.startswith(np.char.strip(col.astype(str)), "-")
+        return np.where(negative, -1.0, 1.0)
+    return np.copysign(1.0, col.astype(float))
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _float(col):
+    """
+    Valor absoluto de una columna numérica o de cadenas
+
+    Las celdas vacías o que no son un número dan NaN.
+    """
+    if col.dtype.kind not in "US":
+        return np.abs(col.astype(float))
+    col = np.char.strip(col.astype(str))
+    col = np.where(col == "", "nan", col)
+    try:
+        return np.abs(col.astype(float))
+    except ValueError:
+        # Alguna celda mala: solo entonces se convierten una a una
+        return np.abs(np.fromiter(map(_to_float, col.tolist()), float, len(col)))
+
+
+def sexagesimal_to_radians(
+    chunks,
+    ra=("RAh", "RAm", "RAs"),
+    dec=("DE-", "DEd", "DEm", "DEs"),
+    names=("ra", "dec"),
+):
+    """
+    Añade a cada bloque la ascensión recta y la declinación en radianes
+
+    Args:
+        chunks: Bloques de entrada
+        ra[opt]: Columnas (horas, minutos, segundos) de la ascensión recta, o
+            una sola columna de cadenas como "12h34m56.7s"
+        dec[opt]: Columnas (signo, grados, minutos, segundos) de la declinación.
+            Con solo tres columnas el signo se toma de la de grados, de modo que
+            '-00' se interpreta correctamente. Con una sola columna se
+            interpretan cadenas como "-40:15:59.9".
+        names[opt]: Nombres de las columnas nuevas
+
+    Las filas que no se pueden interpretar quedan como NaN.
+
+    Yields:
+        Bloques con las columnas nuevas
+    """
+    for chunk in chunks:
+        if isinstance(ra, str):
+            alpha, _ = parse_sexagesimal(chunk[ra], hours=True, radian=True)
+        else:
+            h, m, s = (chunk[k] for k in ra)
+            alpha = hhmmss_to_radian(1.0, _float(h), _float(m), _float(s))
+        if isinstance(dec, str):
+            delta, _ = parse_sexagesimal(chunk[dec], radian=True)
+        else:
+            if len(dec) == 4:
+                sig = _sign(chunk[dec[0]])
+                d, dm, ds = (chunk[k] for k in dec[1:])
+            else:
+                d, dm, ds = (chunk[k] for k in dec)
+                sig = _sign(d)
+            delta = ddmmss_to_radian(sig, _float(d), _float(dm), _float(ds))
+        chunk[names[0]] = alpha
+        chunk[names[1]] = delta
+        yield chunk
+
+
+def to_frame(
+    chunks,
+    frame,
+    src="equatorial",
+    columns=("ra", "dec"),
+    names=("lon", "lat"),
+    graph=None,
+):
+    """
+    Añade a cada bloque las coordenadas en otro sistema de referencia
+
+    Args:
+        chunks: Bloques de entrada
+        frame: Sistema de destino, p. ej. "ecliptic" o "galactic"
+        src[opt]: Sistema de las coordenadas de entrada
+        columns[opt]: Columnas (longitud, latitud) de entrada, en radianes
+        names[opt]: Nombres de las columnas (longitud, latitud) de salida
+        graph[opt]: FrameGraph que se usa, frames.frame_graph si no se da
+
+    Yields:
+        Bloques con las columnas nuevas, en radianes
+    """
+    graph = frame_graph if graph is None else graph
+    M, b = graph.transform(src, frame)
+    for chunk in chunks:
+        lon = np.asarray(chunk[columns[0]], dtype=float)
+        lat = np.asarray(chunk[columns[1]], dtype=float)
+        v = spherical_to_rectangular(np.stack([lat, lon, np.ones_like(lon)], axis=-1))
+        v = apply_affine(M, b, v)
+        sph = rectangular_to_spherical(v)
+        chunk[names[0]] = scale_angle(sph[:, 1])
+        chunk[names[1]] = sph[:, 0]
+        yield chunk
+
+
+def write_csv(chunks, path, columns=None, delimiter=","):
+    """
+    Escribe los bloques en un CSV a medida que llegan
+
+    Args:
+        chunks: Bloques de entrada
+        path: Ruta del archivo
+        columns[opt]: Columnas que se escriben, todas si no se da
+        delimiter[opt]: Separador de columnas
+
+    Returns:
+        Número de filas escritas
+    """
+    n = 0
+    header = False
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh, delimiter=delimiter)
+        for chunk in chunks:
+            if not header:
+                columns = list(chunk) if columns is None else list(columns)
+                writer.writerow(columns)
+                header = True
+            cols = [chunk[k].tolist() for k in columns]
+            writer.writerows(zip(*cols))
+            n += len(cols[0])
+    return n
+
+
+def write_parquet(chunks, path, columns=None):
+    """
+    Escribe los bloques en un archivo Parquet a medida que llegan
+
+    Args:
+        chunks: Bloques de entrada
+        path: Ruta del archivo
+        columns[opt]: Columnas que se escriben, todas si no se da
+
+    Returns:
+        Número de filas escritas
+    """
+    pa = _import_pyarrow()
+    n = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk)
+            table = pa.table({k: chunk[k] for k in columns})
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            n += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
+
+
+def write_catalog(chunks, path, columns=None, frames=None):
+    """
+    Escribe los bloques en un CSV, Parquet o binario (según la extensión)
+
+    Args:
+        chunks: Bloques de entrada
+        path: Ruta del archivo
+        columns[opt]: Columnas que se escriben, todas si no se da (en un
+            catálogo binario, todas las que no son de texto)
+        frames[opt]: Nombres de los sistemas de referencia de un catálogo
+            binario, ver catalog.write_binary_chunks
+
+    Returns:
+        Número de filas escritas
+    """
+    if _is_binary(path):
+        return write_binary_chunks(chunks, path, columns, frames)
+    if _is_parquet(path):
+        return write_parquet(chunks, path, columns)
+    return write_csv(chunks, path, columns)
+
+
+def convert_catalog(
+    src_path,
+    dst_path,
+    frame="galactic",
+    chunksize=CHUNKSIZE,
+    ra=("RAh", "RAm", "RAs"),
+    dec=("DE-", "DEd", "DEm", "DEs"),
+    columns=None,
+):
+    """
+    Convierte un catálogo sexagesimal ecuatorial a radianes y a otro sistema
+
+    Args:
+        src_path: Catálogo de entrada (CSV, Parquet o binario)
+        dst_path: Catálogo de salida (CSV, Parquet o binario). Un catálogo
+            binario no guarda las columnas de texto, como las sexagesimales de
+            entrada.
+        frame[opt]: Sistema de destino
+        chunksize[opt]: Número de filas por bloque
+        ra[opt]: Columnas de la ascensión recta, ver sexagesimal_to_radians
+        dec[opt]: Columnas de la declinación, ver sexagesimal_to_radians
+        columns[opt]: Columnas que se escriben, todas si no se da
+
+    Returns:
+        Número de filas escritas
+    """
+    chunks = read_catalog(src_path, chunksize)
+    chunks = sexagesimal_to_radians(chunks, ra, dec)
+    chunks = to_frame(chunks, frame)
+    return write_catalog(chunks, dst_path, columns)
@@ -0,0 +1,283 @@
+"""
+Precesión y nutación.
+
+Precesión IAU 2006 (ángulos zeta, z, theta de Capitaine et al. 2003) y nutación
+con los términos lunisolares mayores de IAU 2000B. Con los 20 términos que se
+incluyen, el error en la nutación es del orden de 10 milisegundos de arco, muy
+por debajo del que introduce una oblicuidad fija. No se aplica el sesgo entre
+el ICRS y el sistema medio de J2000.0 (unos 20 milisegundos de arco).
+
+Las fechas son fechas julianas TT en dos partes (jd1, jd2), como en
+timescales.py. Las matrices de cada época se guardan en cachés LRU, de modo que
+un lote de observaciones con la misma época evalúa las series una sola vez; el
+tamaño de las cachés se cambia con set_cache_size.
+"""
+import functools
+
+import numpy as np
+
+from calculoastronomico.constant import PI
+from calculoastronomico.timescales import julian_centuries
+from calculoastronomico.transforms import (
+    _assemble,
+    _components,
+    apply_matrix,
+    rotation_matrix,
+)
+
+# Segundos de arco a radianes
+ARCSEC = PI / (180 * 3600)
+
+# Tamaño por defecto de las cachés de matrices por época
+MATRIX_CACHE_SIZE = 256
+
+# Nutación IAU 2000B, términos mayores. Multiplicadores de los argumentos de
+# Delaunay (l, l', F, D, Omega) y coeficientes en 0.1 microsegundos de arco:
+# (S, S', C) de la longitud y (C, C', S) de la oblicuidad
+_NUTATION_TERMS = np.array(
+    [
+        [0, 0, 0, 0, 1, -172064161, -174666, 33386, 92052331, 9086, 15377],
+        [0, 0, 2, -2, 2, -13170906, -1675, -13696, 5730336, -3015, -4587],
+        [0, 0, 2, 0, 2, -2276413, -234, 2796, 978459, -485, 1374],
+        [0, 0, 0, 0, 2, 2074554, 207, -698, -897492, 470, -291],
+        [0, 1, 0, 0, 0, 1475877, -3633, 11817, 73871, -184, -1924],
+        [0, 1, 2, -2, 2, -516821, 1226, -524, 224386, -677, -174],
+        [1, 0, 0, 0, 0, 711159, 73, -872, -6750, 0, 358],
+        [0, 0, 2, 0, 1, -387298, -367, 380, 200728, 18, 318],
+        [1, 0, 2, 0, 2, -301461, -36, 816, 129025, -63, 367],
+        [0, -1, 2, -2, 2, 215829, -494, 111, -95929, 299, 132],
+        [0, 0, 2, -2, 1, 128227, 137, 181, -68982, -9, 39],
+        [-1, 0, 2, 0, 2, 123457, 11, 19, -53311, 32, -4],
+        [-1, 0, 0, 2, 0, 156994, 10, -168, -1235, 0, 82],
+        [1, 0, 0, 0, 1, 63110, 63, 27, -33228, 0, -9],
+        [-1, 0, 0, 0, 1, -57976, -63, -189, 31429, 0, -75],
+        [-1, 0, 2, 2, 2, -59641, -11, 149, 25543, -11, 66],
+        [1, 0, 2, 0, 1, -51613, -42, 129, 26366, 0, 78],
+        [-2, 0, 2, 0, 1, 45893, 50, 31, -24236, -10, 20],
+        [0, 0, 0, 2, 0, 63384, 11, -150, -1220, 0, 29],
+        [0, 0, 2, 2, 2, -38571, -1, 158, 16452, -11, 68],
+    ],
+    dtype=float,
+)
+_NUTATION_UNIT = ARCSEC * 1e-7
+
+# Nutación planetaria media que IAU 2000B sustituye por un desplazamiento fijo
+_PLANETARY_DPSI = -0.135e-3 * ARCSEC
+_PLANETARY_DEPS = 0.388e-3 * ARCSEC
+
+
+def _poly(T, coefficients):
+    """Polinomio en T con los coeficientes en orden creciente de grado"""
+    result = 0.0
+    for a in reversed(coefficients):
+        result = result * T + a
+    return result
+
+
+def mean_obliquity(jd1, jd2=0.0):
+    """
+    Oblicuidad media de la eclíptica (IAU 2006)
+
+    Args:
+        jd1, jd2: Fecha juliana TT
+
+    Returns:
+        Oblicuidad media en radianes
+    """
+    T = julian_centuries(jd1, jd2)
+    return ARCSEC * _poly(
+        T, (84381.406, -46.836769, -0.0001831, 0.00200340, -0.000000576, -0.0000000434)
+    )
+
+
+def nutation(jd1, jd2=0.0):
+    """
+    Nutación en longitud y en oblicuidad (IAU 2000B truncada)
+
+    Args:
+        jd1, jd2: Fecha juliana TT
+
+    Returns:
+        [dpsi, deps] en radianes
+    """
+    T = np.asarray(julian_centuries(jd1, jd2), dtype=float)
+    delaunay = np.stack(
+        [
+            485868.249036 + 1717915923.2178 * T,
+            1287104.79305 + 129596581.0481 * T,
+            335779.526232 + 1739527262.8478 * T,
+            1072260.70369 + 1602961601.2090 * T,
+            450160.398036 - 6962890.5431 * T,
+        ],
+        axis=-1,
+    )
+    delaunay = np.remainder(delaunay, 1296000.0) * ARCSEC
+    arg = delaunay @ _NUTATION_TERMS[:, :5].T
+    s, c = np.sin(arg), np.cos(arg)
+    ps, pst, pc, ec, ect, es = _NUTATION_TERMS[:, 5:].T
+    T = T[..., None]
+    dpsi = ((ps + pst * T) * s + pc * c).sum(axis=-1) * _NUTATION_UNIT
+    deps = ((ec + ect * T) * c + es * s).sum(axis=-1) * _NUTATION_UNIT
+    return [dpsi + _PLANETARY_DPSI, deps + _PLANETARY_DEPS]
+
+
+def true_obliquity(jd1, jd2=0.0):
+    """
+    Oblicuidad verdadera de la eclíptica: la media más la nutación en oblicuidad
+
+    Args:
+        jd1, jd2: Fecha juliana TT
+
+    Returns:
+        Oblicuidad verdadera en radianes
+    """
+    return mean_obliquity(jd1, jd2) + nutation(jd1, jd2)[1]
+
+
+def precession_angles(jd1, jd2=0.0):
+    """
+    Ángulos de precesión ecuatorial zeta, z y theta (IAU 2006)
+
+    Args:
+        jd1, jd2: Fecha juliana TT
+
+    Returns:
+        [zeta, z, theta] en radianes
+    """
+    T = julian_centuries(jd1, jd2)
+    zeta = _poly(
+        T, (2.650545, 2306.083227, 0.2988499, 0.01801828, -0.000005971, -0.0000003173)
+    )
+    z = _poly(
+        T, (-2.650545, 2306.077181, 1.0927348, 0.01826837, -0.000028596, -0.0000002904)
+    )
+    theta = _poly(
+        T, (0.0, 2004.191903, -0.4294934, -0.04182264, -0.000007089, -0.0000001274)
+    )
+    return [zeta * ARCSEC, z * ARCSEC, theta * ARCSEC]
+
+
+def _precession_matrix(jd1, jd2):
+    zeta, z, theta = (float(a) for a in precession_angles(jd1, jd2))
+    M = rotation_matrix(3, -z) @ rotation_matrix(2, theta) @ rotation_matrix(3, -zeta)
+    M.flags.writeable = False
+    return M
+
+
+def _nutation_matrix(jd1, jd2):
+    eps = float(mean_obliquity(jd1, jd2))
+    dpsi, deps = (float(a) for a in nutation(jd1, jd2))
+    M = (
+        rotation_matrix(1, -(eps + deps))
+        @ rotation_matrix(3, -dpsi)
+        @ rotation_matrix(1, eps)
+    )
+    M.flags.writeable = False
+    return M
+
+
+def _precession_nutation_matrix(jd1, jd2):
+    M = nutation_matrix(jd1, jd2) @ precession_matrix(jd1, jd2)
+    M.flags.writeable = False
+    return M
+
+
+_MATRICES = (_precession_matrix, _nutation_matrix, _precession_nutation_matrix)
+_cache = {}
+
+
+def set_cache_size(maxsize=MATRIX_CACHE_SIZE):
+    """
+    Cambia el tamaño de las cachés LRU de matrices por época, y las vacía
+
+    Args:
+        maxsize[opt]: Número de épocas que se guardan por tipo de matriz. Con
+            None la caché no tiene límite; con 0 no se guarda nada.
+    """
+    for func in _MATRICES:
+        _cache[func] = functools.lru_cache(maxsize=maxsize)(func)
+
+
+def cache_info():
+    """Estadísticas (aciertos, fallos, tamaño) de las cachés de matrices"""
+    return {func.__name__.lstrip("_"): _cache[func].cache_info() for func in _MATRICES}
+
+
+set_cache_size()
+
+
+def precession_matrix(jd1, jd2=0.0):
+    """
+    Matriz de precesión del ecuador y equinoccio medios de J2000.0 a los de la fecha
+
+    El resultado se guarda en caché por época y es de solo lectura.
+
+    Args:
+        jd1, jd2: Fecha juliana TT (escalares)
+
+    Returns:
+        Matriz 3x3
+    """
+    return _cache[_precession_matrix](float(jd1), float(jd2))
+
+
+def nutation_matrix(jd1, jd2=0.0):
+    """
+    Matriz de nutación del ecuador y equinoccio medios de la fecha a los verdaderos
+
+    El resultado se guarda en caché por época y es de solo lectura.
+
+    Args:
+        jd1, jd2: Fecha juliana TT (escalares)
+
+    Returns:
+        Matriz 3x3
+    """
+    return _cache[_nutation_matrix](float(jd1), float(jd2))
+
+
+def precession_nutation_matrix(jd1, jd2=0.0):
+    """
+    Matriz de precesión y nutación
+
+    Lleva del ecuador y equinoccio medios de J2000.0 al ecuador y equinoccio
+    verdaderos de la fecha.
+
+    El resultado se guarda en caché por época y es de solo lectura.
+
+    Args:
+        jd1, jd2: Fecha juliana TT (escalares)
+
+    Returns:
+        Matriz 3x3
+    """
+    return _cache[_precession_nutation_matrix](float(jd1), float(jd2))
+
+
+def precess(x, jd1, jd2=0.0, nutate=False):
+    """
+    Lleva vectores ecuatoriales de J2000.0 al ecuador medio (o verdadero) de la fecha
+
+    Args:
+        x: Vector ecuatorial J2000.0, o lote de vectores
+        jd1, jd2: Fecha juliana TT. Con un lote (N, 3) pueden ser arrays (N,),
+            una época por vector.
+        nutate[opt]: Si es True, se aplica también la nutación
+
+    Con varias épocas, las series se evalúan una vez por época distinta.
+
+    Returns:
+        Vector en el sistema de la fecha, con la misma disposición que x
+    """
+    matrix = precession_nutation_matrix if nutate else precession_matrix
+    if np.ndim(jd1) == 0 and np.ndim(jd2) == 0:
+        return apply_matrix(matrix(jd1, jd2), x)
+
+    jd1, jd2 = np.broadcast_arrays(jd1, jd2)
+    epochs, index = np.unique(
+        np.stack([jd1, jd2], axis=-1), axis=0, return_inverse=True
+    )
+    M = np.stack([matrix(a, b) for a, b in epochs])[index.reshape(-1)]
+    x0, y0, z0 = _components(x)
+    x1 = M @ np.stack(np.broadcast_arrays(x0, y0, z0), axis=-1)[..., None]
+    return _assemble(x, *np.moveaxis(x1[..., 0], -1, 0))
@@ -0,0 +1,200 @@
+"""
+Índice espacial sobre la esfera unidad.
+
+SkyIndex divide la esfera en zonas de declinación de altura fija y ordena los
+objetos por (zona, ascensión recta). Una búsqueda en un cono solo examina, en
+cada zona que corta el cono, el intervalo de ascensión recta que lo contiene,
+que se localiza por búsqueda binaria. Todas las búsquedas de un lote se
+resuelven a la vez con operaciones de NumPy::
+
+    index = SkyIndex(spherical_to_rectangular(np.stack([dec, ra, one], axis=-1)))
+    index.save("data/preprocessed/catalogo_index.npz")
+
+    index = SkyIndex.load("data/preprocessed/catalogo_index.npz")
+    query, match = index.cone_search(centers, degree_to_radian(1 / 60))
+    match, sep = index.crossmatch(other, degree_to_radian(1 / 3600))
+"""
+import numpy as np
+
+from calculoastronomico.constant import PI
+from calculoastronomico.containers import VectorArray
+from calculoastronomico.formats import degree_to_radian, scale_angle
+from calculoastronomico.transforms import rectangular_to_spherical
+
+# Altura por defecto de las zonas de declinación
+ZONE_HEIGHT = degree_to_radian(0.1)
+
+# Separación entre zonas en la clave de ordenación (mayor que 2 pi)
+_ZONE_STRIDE = 8.0
+
+
+def _unit_vectors(v):
+    """Lote (N, 3) de vectores unitarios a partir de cualquier disposición"""
+    if isinstance(v, VectorArray):
+        v = v.data
+    if not isinstance(v, np.ndarray):
+        v = np.stack(np.broadcast_arrays(*v), axis=-1)
+    v = np.asarray(v, dtype=float)
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def _chord2(r):
+    """Cuadrado de la cuerda que subtiende un ángulo r"""
+    return (2 * np.sin(np.minimum(r, PI) / 2)) ** 2
+
+
+class SkyIndex:
+    """
+    Índice por zonas de declinación de un catálogo de posiciones.
+
+    Args:
+        v: Vectores (N, 3) de las posiciones, p. ej. de spherical_to_rectangular,
+            o lista de tres columnas. Se normalizan.
+        zone_height[opt]: Altura de las zonas (radianes). Conviene que sea del
+            orden del radio de búsqueda habitual.
+    """
+
+    def __init__(self, v, zone_height=ZONE_HEIGHT):
+        xyz = _unit_vectors(v)
+        self.zone_height = float(zone_height)
+        dec, ra = self._spherical(xyz)
+        key = self._zone(dec) * _ZONE_STRIDE + ra
+        self.order = np.argsort(key, kind="stable")
+        self.key = key[self.order]
+        self.xyz = xyz[self.order]
+
+    @staticmethod
+    def _spherical(xyz):
+        sph = rectangular_to_spherical(xyz)
+        return sph[:, 0], scale_angle(sph[:, 1])
+
+    def _zone(self, dec):
+        nzones = int(np.ceil(PI / self.zone_height))
+        return np.clip(np.floor((dec + PI / 2) / self.zone_height), 0, nzones - 1)
+
+    def __len__(self):
+        return len(self.order)
+
+    def save(self, path):
+        """Guarda el índice en un archivo .npz"""
+        np.savez(
+            path,
+            zone_height=self.zone_height,
+            order=self.order,
+            key=self.key,
+            xyz=self.xyz,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Carga un índice guardado con save"""
+        index = cls.__new__(cls)
+        with np.load(path, allow_pickle=False) as data:
+            index.zone_height = float(data["zone_height"])
+            index.order = data["order"]
+            index.key = data["key"]
+            index.xyz = data["xyz"]
+        return index
+
+    def _ranges(self, centers, radius):
+        """Intervalos [lo, hi) del orden del índice que pueden estar en cada cono"""
+        dec, ra = self._spherical(centers)
+        z0 = self._zone(np.maximum(dec - radius, -PI / 2))
+        z1 = self._zone(np.minimum(dec + radius, PI / 2))
+        nz = (z1 - z0).astype(np.int64) + 1
+        query = np.repeat(np.arange(len(centers)), nz)
+        first = np.repeat(np.cumsum(nz) - nz, nz)
+        zone = z0[query] + (np.arange(len(query)) - first)
+
+        # Semiancho en ascensión recta; la zona entera si el cono contiene un polo
+        r = radius[query]
+        d = dec[query]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            half = np.arcsin(np.sin(r) / np.cos(d))
+        full = (np.abs(d) + r >= PI / 2) | np.isnan(half)
+        lo_ra = np.where(full, 0.0, ra[query] - half)
+        hi_ra = np.where(full, 2 * PI, ra[query] + half)
+
+        # Parte sin vuelta y, si el intervalo cruza 0 o 2 pi, la parte que
+        # vuelve; -1 marca un intervalo vacío
+        base = zone * _ZONE_STRIDE
+        below = lo_ra < 0
+        above = hi_ra > 2 * PI
+        parts = (
+            (np.maximum(lo_ra, 0.0), np.minimum(hi_ra, 2 * PI)),
+            (np.where(below, lo_ra + 2 * PI, -1.0), np.where(below, 2 * PI, -1.0)),
+            (np.where(above, 0.0, -1.0), np.where(above, hi_ra - 2 * PI, -1.0)),
+        )
+        lo = [np.searchsorted(self.key, base + a, side="left") for a, _ in parts]
+        hi = [np.searchsorted(self.key, base + b, side="right") for _, b in parts]
+        return np.tile(query, 3), np.concatenate(lo), np.concatenate(hi)
+
+    def _candidates(self, centers, radius):
+        """Pares (consulta, posición en el índice) candidatos y su cuerda al cuadrado
+
+        Las posiciones son las del orden del índice.
+        """
+        query, lo, hi = self._ranges(centers, radius)
+        count = hi - lo
+        total = int(count.sum())
+        q = np.repeat(query, count)
+        start = np.repeat(lo - (np.cumsum(count) - count), count)
+        pos = start + np.arange(total)
+        d2 = ((self.xyz[pos] - centers[q]) ** 2).sum(axis=-1)
+        return q, pos, d2
+
+    def cone_search(self, centers, radius):
+        """
+        Objetos a una distancia angular no mayor que radius de cada centro
+
+        Args:
+            centers: Centro [x, y, z] o lote (Q, 3) de centros
+            radius: Radio (radianes), escalar o uno por centro
+
+        Returns:
+            Con un único centro, los índices de los objetos (en el orden del
+            catálogo original). Con un lote, [query, index]: pares de índices de
+            centro y de objeto, ordenados por centro y por objeto.
+        """
+        single = np.ndim(centers) == 1 and np.ndim(centers[0]) == 0
+        centers = _unit_vectors(np.atleast_2d(centers) if single else centers)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), (len(centers),))
+
+        q, pos, d2 = self._candidates(centers, radius)
+        keep = d2 <= _chord2(radius)[q]
+        q, index = q[keep], self.order[pos[keep]]
+        order = np.lexsort((index, q))
+        q, index = q[order], index[order]
+        if single:
+            return index
+        return [q, index]
+
+    def crossmatch(self, v, radius):
+        """
+        Objeto más cercano del índice a cada posición de otro catálogo
+
+        Args:
+            v: Posiciones (M, 3) del otro catálogo, o lista de tres columnas
+            radius: Distancia máxima de emparejamiento (radianes)
+
+        Returns:
+            [index, sep]: arrays (M,) con el índice del objeto más cercano en el
+            catálogo original y la separación (radianes). Las posiciones sin
+            pareja dentro de radius tienen index -1 y sep NaN.
+        """
+        centers = _unit_vectors(v)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), (len(centers),))
+        q, pos, d2 = self._candidates(centers, radius)
+        keep = d2 <= _chord2(radius)[q]
+        q, pos, d2 = q[keep], pos[keep], d2[keep]
+
+        order = np.lexsort((d2, q))
+        q, pos, d2 = q[order], pos[order], d2[order]
+        first = np.ones(len(q), bool)
+        first[1:] = q[1:] != q[:-1]
+
+        index = np.full(len(centers), -1, dtype=np.int64)
+        sep = np.full(len(centers), np.nan)
+        index[q[first]] = self.order[pos[first]]
+        sep[q[first]] = 2 * np.arcsin(np.sqrt(d2[first]) / 2)
+        return [index, sep]
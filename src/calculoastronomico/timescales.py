@@ -0,0 +1,253 @@
+"""
+Escalas de tiempo y tiempo sidéreo.
+
+Las fechas se representan como fechas julianas en dos partes (jd1, jd2), cuya
+suma es la fecha juliana. Así se conserva la precisión de microsegundos que se
+perdería con un único float64. Todas las rutinas aceptan escalares o arrays, de
+modo que el tiempo sidéreo de millones de observaciones se calcula de una vez.
+
+UTC se convierte a TAI con la tabla de segundos intercalares del IERS, válida
+desde 1972. UT1 se obtiene de UTC con la corrección DUT1 = UT1 - UTC, que
+publica el IERS y que debe darse en cada caso.
+"""
+import numpy as np
+
+from calculoastronomico.constant import PI
+from calculoastronomico.formats import scale_angle
+
+# Fecha juliana de la época J2000.0 y de la época de datetime64 (1970-01-01)
+J2000 = 2451545.0
+JD_UNIX_EPOCH = 2440587.5
+DAYS_PER_CENTURY = 36525.0
+SECONDS_PER_DAY = 86400.0
+
+# TT - TAI (s)
+TT_MINUS_TAI = 32.184
+
+# Entrada en vigor y valor de TAI - UTC (s) tras cada segundo intercalar
+_LEAP_SECONDS = (
+    ("1972-01-01", 10),
+    ("1972-07-01", 11),
+    ("1973-01-01", 12),
+    ("1974-01-01", 13),
+    ("1975-01-01", 14),
+    ("1976-01-01", 15),
+    ("1977-01-01", 16),
+    ("1978-01-01", 17),
+    ("1979-01-01", 18),
+    ("1980-01-01", 19),
+    ("1981-07-01", 20),
+    ("1982-07-01", 21),
+    ("1983-07-01", 22),
+    ("1985-07-01", 23),
+    ("1988-01-01", 24),
+    ("1990-01-01", 25),
+    ("1991-01-01", 26),
+    ("1992-07-01", 27),
+    ("1993-07-01", 28),
+    ("1994-07-01", 29),
+    ("1996-01-01", 30),
+    ("1997-07-01", 31),
+    ("1999-01-01", 32),
+    ("2006-01-01", 33),
+    ("2009-01-01", 34),
+    ("2012-07-01", 35),
+    ("2015-07-01", 36),
+    ("2017-01-01", 37),
+)
+_LEAP_JD = JD_UNIX_EPOCH + np.array(
+    [np.datetime64(d, "D").astype(np.int64) for d, _ in _LEAP_SECONDS], dtype=float
+)
+_LEAP_DAT = np.array([s for _, s in _LEAP_SECONDS], dtype=float)
+
+
+def calendar_to_jd(year, month, day, hour=0, minute=0, second=0.0):
+    """
+    Fecha del calendario gregoriano a fecha juliana en dos partes
+
+    Args:
+        year, month, day: Fecha (enteros)
+        hour, minute, second[opt]: Hora del día
+
+    Returns:
+        [jd1, jd2]: jd1 es el inicio del día (x.5) y jd2 la fracción de día
+    """
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    jdn = day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+    jd1 = jdn - 0.5
+    jd2 = (hour + (minute + second / 60) / 60) / 24
+    return [jd1, jd2]
+
+
+def datetime_to_jd(t):
+    """
+    datetime64 (o datetime) a fecha juliana en dos partes
+
+    Args:
+        t: Instante o array de instantes, datetime64 o datetime.datetime
+
+    Returns:
+        [jd1, jd2]: jd1 es el inicio del día (x.5) y jd2 la fracción de día
+    """
+    ns = np.asarray(t, dtype="datetime64[ns]").astype(np.int64)
+    ns_per_day = 86400 * 10**9
+    days, rem = np.divmod(ns, ns_per_day)
+    return [JD_UNIX_EPOCH + days, rem / ns_per_day]
+
+
+def jd_to_datetime(jd1, jd2=0.0):
+    """
+    Fecha juliana en dos partes a datetime64[ns]
+
+    Args:
+        jd1, jd2: Fecha juliana (jd1 + jd2)
+
+    Returns:
+        Instante o array de instantes datetime64[ns]
+    """
+    d1 = np.asarray(jd1, dtype=float) - JD_UNIX_EPOCH
+    days = np.floor(d1) + np.floor(jd2)
+    frac = (d1 - np.floor(d1)) + (jd2 - np.floor(jd2))
+    ns = days.astype(np.int64) * (86400 * 10**9)
+    ns += np.rint(frac * 86400e9).astype(np.int64)
+    return ns.astype("datetime64[ns]")
+
+
+def julian_centuries(jd1, jd2=0.0):
+    """Siglos julianos desde J2000.0"""
+    return ((jd1 - J2000) + jd2) / DAYS_PER_CENTURY
+
+
+def tai_minus_utc(jd1, jd2=0.0):
+    """
+    TAI - UTC (s) según la tabla de segundos intercalares
+
+    Args:
+        jd1, jd2: Fecha juliana UTC
+
+    Returns:
+        TAI - UTC en segundos (NaN antes de 1972)
+    """
+    i = np.searchsorted(_LEAP_JD, np.asarray(jd1 + jd2), side="right") - 1
+    return np.where(i >= 0, _LEAP_DAT[np.maximum(i, 0)], np.nan)
+
+
+def utc_to_tai(jd1, jd2):
+    """UTC a TAI, fechas julianas en dos partes"""
+    return [jd1, jd2 + tai_minus_utc(jd1, jd2) / SECONDS_PER_DAY]
+
+
+def tai_to_utc(jd1, jd2):
+    """TAI a UTC, fechas julianas en dos partes"""
+    dat = tai_minus_utc(jd1, jd2 - 37 / SECONDS_PER_DAY)
+    dat = tai_minus_utc(jd1, jd2 - dat / SECONDS_PER_DAY)
+    return [jd1, jd2 - dat / SECONDS_PER_DAY]
+
+
+def tai_to_tt(jd1, jd2):
+    """TAI a TT, fechas julianas en dos partes"""
+    return [jd1, jd2 + TT_MINUS_TAI / SECONDS_PER_DAY]
+
+
+def tt_to_tai(jd1, jd2):
+    """TT a TAI, fechas julianas en dos partes"""
+    return [jd1, jd2 - TT_MINUS_TAI / SECONDS_PER_DAY]
+
+
+def utc_to_tt(jd1, jd2):
+    """UTC a TT, fechas julianas en dos partes"""
+    return tai_to_tt(*utc_to_tai(jd1, jd2))
+
+
+def tt_to_utc(jd1, jd2):
+    """TT a UTC, fechas julianas en dos partes"""
+    return tai_to_utc(*tt_to_tai(jd1, jd2))
+
+
+def utc_to_ut1(jd1, jd2, dut1=0.0):
+    """
+    UTC a UT1
+
+    Args:
+        jd1, jd2: Fecha juliana UTC
+        dut1[opt]: UT1 - UTC (s), de los boletines del IERS
+
+    Returns:
+        [jd1, jd2]: Fecha juliana UT1
+    """
+    return [jd1, jd2 + dut1 / SECONDS_PER_DAY]
+
+
+def ut1_to_utc(jd1, jd2, dut1=0.0):
+    """UT1 a UTC, con dut1 = UT1 - UTC (s)"""
+    return [jd1, jd2 - dut1 / SECONDS_PER_DAY]
+
+
+def earth_rotation_angle(jd1, jd2):
+    """
+    Ángulo de rotación de la Tierra (IAU 2000)
+
+    Args:
+        jd1, jd2: Fecha juliana UT1
+
+    Returns:
+        ERA en radianes, en [0, 2pi)
+    """
+    t = (jd1 - J2000) + jd2
+    f = np.fmod(jd1, 1.0) + np.fmod(jd2, 1.0)
+    return scale_angle(2 * PI * (f + 0.7790572732640 + 0.00273781191135448 * t))
+
+
+def gmst(jd1, jd2, tt=None):
+    """
+    Tiempo sidéreo medio de Greenwich (IAU 2006)
+
+    Args:
+        jd1, jd2: Fecha juliana UT1
+        tt[opt]: Fecha juliana TT en dos partes [jd1, jd2]. Si no se da, se usa
+            UT1 para el término polinómico, con un error menor de 1e-9 rad.
+
+    Returns:
+        GMST en radianes, en [0, 2pi)
+    """
+    T = julian_centuries(*(tt if tt is not None else (jd1, jd2)))
+    poly = (
+        0.014506
+        + (
+            4612.156534
+            + (1.3915817 + (-0.00000044 + (-0.000029956 - 0.0000000368 * T) * T) * T)
+            * T
+        )
+        * T
+    )
+    return scale_angle(earth_rotation_angle(jd1, jd2) + poly / 3600 / 180 * PI)
+
+
+def local_sidereal_time(gst, lon):
+    """
+    Tiempo sidéreo local
+
+    Args:
+        gst: Tiempo sidéreo de Greenwich (radianes)
+        lon: Longitud del observador, positiva hacia el este (radianes)
+
+    Returns:
+        LST en radianes, en [0, 2pi)
+    """
+    return scale_angle(gst + lon)
+
+
+def hour_angle(lst, ra):
+    """
+    Ángulo horario
+
+    Args:
+        lst: Tiempo sidéreo local (radianes)
+        ra: Ascensión recta (radianes)
+
+    Returns:
+        Ángulo horario en radianes, en [0, 2pi)
+    """
+    return scale_angle(lst - ra)
@@ -1,11 +1,214 @@
-"""Rutinas de transformaciones."""
+"""
+Rutinas de transformaciones.
+
+Los vectores pueden darse como una lista [x, y, z] de escalares, como una lista
+de tres columnas (arrays de NumPy) o como un array de forma (N, 3) con un vector
+por fila. En los dos últimos casos el lote completo se transforma de una vez y
+el resultado conserva la misma disposición que la entrada.
+
+También se aceptan los contenedores Vector3 y VectorArray; las rutinas de cambio
+de sistema comprueban y actualizan su atributo frame.
+"""
+import functools
 import math
+import numbers
 from math import cos, sin, sqrt
 
-import numpy as np
-
 import calculoastronomico.constant as c
-from calculoastronomico.formats import degree_to_radian
+from calculoastronomico.backend import get_kernel, lazy_import
+from calculoastronomico.containers import Vector3, VectorArray
+from calculoastronomico.formats import degree_to_radian, scale_angle
+
+np = lazy_import("numpy")
+
+# Vectores que se tratan componente a componente, sin NumPy
+_SEQUENCES = (list, tuple, Vector3)
+
+# Vectores [x, y, z] que siguen el camino directo de las rutinas escalares, sin
+# pasar por los contenedores, out= ni los sistemas de referencia
+_PLAIN = (list, tuple)
+
+
+def _components(v):
+    """Separa las tres componentes de un vector o de un lote de vectores"""
+    if isinstance(v, _SEQUENCES):
+        a, b, c3 = v
+        return a, b, c3
+    if isinstance(v, VectorArray):
+        v = v.data
+    if isinstance(v, np.ndarray) and v.ndim > 1:
+        return v[..., 0], v[..., 1], v[..., 2]
+    a, b, c3 = v
+    return a, b, c3
+
+
+def _assemble(v, a, b, c3):
+    """Reúne tres componentes con la misma disposición que el vector v"""
+    if isinstance(v, Vector3):
+        return Vector3(a, b, c3, v.frame, v.unit)
+    if isinstance(v, _SEQUENCES):
+        return [a, b, c3]
+    if isinstance(v, VectorArray):
+        return VectorArray.from_columns(a, b, c3, v.frame, v.unit)
+    if isinstance(v, np.ndarray):
+        return np.stack(np.broadcast_arrays(a, b, c3), axis=-1)
+    return [a, b, c3]
+
+
+def _is_batch(v):
+    """True si v es un lote (N, 3) de NumPy; con una lista no se carga NumPy"""
+    return not isinstance(v, _SEQUENCES) and isinstance(v, np.ndarray) and v.ndim == 2
+
+
+def _check_frame(x, src):
+    """Comprueba que x, si indica su sistema de referencia, está en src"""
+    frame = getattr(x, "frame", None)
+    if frame is not None and frame != src:
+        raise ValueError(f"Expected a vector in the {src!r} frame, got {frame!r}")
+
+
+def _change_frame(x, x1, src, dst):
+    """Comprueba que x está en el sistema src y marca x1 como del sistema dst"""
+    _check_frame(x, src)
+    if getattr(x, "frame", None) is not None and isinstance(x1, (Vector3, VectorArray)):
+        x1.frame = dst
+    return x1
+
+
+# Filas por bloque al operar sobre un lote (N, 3) en su propio buffer
+_INPLACE_BLOCK = 1 << 14
+
+
+def _output(x, out, inplace):
+    """Buffer de salida: el propio x si inplace=True, si no out"""
+    if inplace:
+        if out is not None:
+            raise ValueError("Use either out= or inplace=True, not both")
+        return x
+    return out
+
+
+def _write(out, x1):
+    """
+    Copia las componentes de x1 en out: un vector (lista o Vector3), un array
+    (..., 3) o un VectorArray. Las componentes de out que son arrays (columnas)
+    se sobrescriben en su sitio, de modo que quien las comparta ve el cambio.
+    """
+    if isinstance(out, _SEQUENCES):
+        for i, xi in enumerate(x1):
+            col = out[i]
+            if isinstance(col, np.ndarray):
+                col[...] = xi
+            else:
+                out[i] = xi
+        return out
+    data = out.data if isinstance(out, VectorArray) else out
+    for i, xi in enumerate(x1):
+        data[..., i] = xi
+    return out
+
+
+# Número de ángulos distintos cuyos (sin, cos) se guardan en caché
+TRIG_CACHE_SIZE = 256
+
+
+def _sin_cos(theta):
+    return sin(theta), cos(theta)
+
+
+def set_trig_cache_size(maxsize=TRIG_CACHE_SIZE):
+    """
+    Cambia el tamaño de la caché LRU de (sin, cos), y la vacía
+
+    Args:
+        maxsize[opt]: Número de ángulos que se guardan. Con None la caché no
+            tiene límite; con 0 no se guarda nada.
+    """
+    global _sincos
+    _sincos = functools.lru_cache(maxsize=maxsize)(_sin_cos)
+    _euler_rows.cache_clear()
+
+
+def trig_cache_info():
+    """Estadísticas (aciertos, fallos, tamaño) de la caché de (sin, cos)"""
+    return _sincos.cache_info()
+
+
+def sincos(theta):
+    """
+    Seno y coseno de un ángulo escalar, guardados en caché por ángulo
+
+    Las rutinas escalares de rotación repiten casi siempre los mismos ángulos
+    (la oblicuidad, los ángulos de galactic_angles), así que el seno y el coseno
+    se calculan una vez por ángulo distinto.
+
+    Args:
+        theta: Ángulo (radianes)
+
+    Returns:
+        (sin(theta), cos(theta))
+    """
+    return _sincos(theta)
+
+
+def _rotate(n, st, ct, x0, y0, z0):
+    """Componentes de rotation(n, theta) dados sin(theta) y cos(theta)"""
+    if n == 1:
+        return [x0, y0 * ct + z0 * st, -y0 * st + z0 * ct]
+    if n == 2:
+        return [x0 * ct - z0 * st, y0, x0 * st + z0 * ct]
+    return [x0 * ct + y0 * st, -x0 * st + y0 * ct, z0]
+
+
+@functools.lru_cache(maxsize=128)
+def _euler_rows(phi, xi, zeta, inverse=False):
+    """
+    Filas de rotation_Euler_matrix (o de su inversa) como tuplas, calculadas con
+    sincos para aplicarlas a un vector sin NumPy
+    """
+    sp, cp = _sincos(phi)
+    sx, cx = _sincos(xi)
+    sz, cz = _sincos(zeta)
+    rows = (
+        (cz * cp - sz * cx * sp, cz * sp + sz * cx * cp, sz * sx),
+        (-sz * cp - cz * cx * sp, -sz * sp + cz * cx * cp, cz * sx),
+        (sx * sp, -sx * cp, cx),
+    )
+    if inverse:
+        return tuple(zip(*rows))
+    return rows
+
+
+set_trig_cache_size()
+
+
+def _rotate_sequence(x, out, n, theta, sign=1):
+    """rotation(n, sign * theta) de un vector dado como lista o Vector3"""
+    st, ct = _sincos(theta)
+    x1 = _rotate(n, sign * st, ct, *_components(x))
+    if out is not None:
+        return _write(out, x1)
+    return _assemble(x, *x1)
+
+
+def _euler_plain(x, rows):
+    """Aplica las filas de _euler_rows a un vector [x, y, z]"""
+    x0, y0, z0 = x
+    (a0, a1, a2), (b0, b1, b2), (c0, c1, c2) = rows
+    return [
+        a0 * x0 + a1 * y0 + a2 * z0,
+        b0 * x0 + b1 * y0 + b2 * z0,
+        c0 * x0 + c1 * y0 + c2 * z0,
+    ]
+
+
+def _euler_sequence(x, out, angles, inverse=False):
+    """rotation_Euler(*angles) (o su inversa) de un vector dado como lista o Vector3"""
+    x0, y0, z0 = _components(x)
+    x1 = [r0 * x0 + r1 * y0 + r2 * z0 for r0, r1, r2 in _euler_rows(*angles, inverse)]
+    if out is not None:
+        return _write(out, x1)
+    return _assemble(x, *x1)
 
 
 def rectangular_to_spherical(v):
@@ -13,17 +216,27 @@ def rectangular_to_spherical(v):
     Transforma coordenadas rectangulares a esféricas.
 
     Args:
-        v: Vector [x, y, z]
+        v: Vector [x, y, z], o lote de vectores
 
     Returns:
         Vector [theta, phi, r]
         In most cases, [delta, alpha, 1]
     """
-    x, y, z = v
-    theta = math.atan(z / math.sqrt(x**2 + y**2))
-    phi = math.atan2(y, x)
-    r = math.sqrt(x**2 + y**2 + z**2)
-    return [theta, phi, r]
+    if _is_batch(v):
+        kernel = get_kernel("rectangular_to_spherical")
+        if kernel is not None:
+            return kernel(np.ascontiguousarray(v, dtype=np.float64))
+    x, y, z = _components(v)
+    if isinstance(x, numbers.Real):
+        theta = math.atan(z / math.sqrt(x**2 + y**2))
+        phi = math.atan2(y, x)
+        r = math.sqrt(x**2 + y**2 + z**2)
+        return _assemble(v, theta, phi, r)
+    rho2 = x * x + y * y
+    theta = np.arctan2(z, np.sqrt(rho2))
+    phi = np.arctan2(y, x)
+    r = np.sqrt(rho2 + z * z)
+    return _assemble(v, theta, phi, r)
 
 
 def spherical_to_rectangular(v):
@@ -31,69 +244,111 @@ def spherical_to_rectangular(v):
     Transforma coordenadas esféricas a rectangulares.
 
     Args:
-        v: Vector [theta, phi, r]
+        v: Vector [theta, phi, r], o lote de vectores
            In most cases, [delta, alpha, 1]
 
     Returns:
         Vector [x, y, z]
     """
-    theta, phi, r = v
-    x = r * math.cos(phi) * math.cos(theta)
-    y = r * math.sin(phi) * math.cos(theta)
-    z = r * math.sin(theta)
-    return [x, y, z]
-
-
-def translation(x, R):
+    theta, phi, r = _components(v)
+    if isinstance(theta, numbers.Real) and isinstance(phi, numbers.Real):
+        x = r * math.cos(phi) * math.cos(theta)
+        y = r * math.sin(phi) * math.cos(theta)
+        z = r * math.sin(theta)
+        return _assemble(v, x, y, z)
+    rc = r * np.cos(theta)
+    x = rc * np.cos(phi)
+    y = rc * np.sin(phi)
+    z = r * np.sin(theta)
+    return _assemble(v, x, y, z)
+
+
+def translation(x, R, out=None, inplace=False):
     """
     Efectúa una traslación en el espacio
 
     Args:
-        x: Vector original en O
+        x: Vector original en O, o lote de vectores
         R: Posicion de O' respecto a O
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Vector respecto a O'
     """
-    if isinstance(x, np.ndarray) and isinstance(R, np.ndarray):
-        x1 = x - R
-    else:
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
         x1 = [xi - ri for xi, ri in zip(x, R)]
-    return x1
-
-
-def rotation(n, theta, x):
+        if out is not None:
+            return _write(out, x1)
+        return _assemble(x, *x1)
+    if isinstance(x, VectorArray):
+        buf = out.data if isinstance(out, VectorArray) else out
+        data = np.subtract(x.data, R, out=buf)
+        if isinstance(out, VectorArray):
+            out.frame, out.unit = x.frame, x.unit
+            return out
+        return VectorArray(data, x.frame, x.unit)
+    return np.subtract(x, R, out=out)
+
+
+def rotation(n, theta, x, out=None, inplace=False):
     """
     Efectúa una rotación elemental pasiva alrededor de un eje cartesiano
 
     Args:
         n: Eje  cartesiano para la rotación
-        theta: Ángulo de la rotación
-        X: Vector original
+        theta: Ángulo de la rotación, o array de ángulos
+        x: Vector original, o lote de vectores
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
+
+    Si theta es un array, cada vector se rota con su propio ángulo; theta y las
+    componentes de x se combinan con las reglas de broadcasting de NumPy.
 
     Returns:
         Vector en el sistema de referencia rotado
     """
-    x1 = x.copy()
+    if not inplace and out is None and type(x) in _PLAIN and type(theta) is float:
+        st, ct = _sincos(theta)
+        x0, y0, z0 = x
+        if n == 1:
+            return [x0, y0 * ct + z0 * st, -y0 * st + z0 * ct]
+        if n == 2:
+            return [x0 * ct - z0 * st, y0, x0 * st + z0 * ct]
+        if n == 3:
+            return [x0 * ct + y0 * st, -x0 * st + y0 * ct, z0]
+
+    if n not in (1, 2, 3):
+        raise ValueError(f"Cant perform a rotation around axis {n}!")
+
+    out = _output(x, out, inplace)
+    if isinstance(theta, numbers.Real):
+        if out is not None and not isinstance(out, _SEQUENCES):
+            return apply_matrix(rotation_matrix(n, theta), x, out=out)
+        if _is_batch(x):
+            kernel = get_kernel("rotation")
+            if kernel is not None:
+                return kernel(n, theta, np.ascontiguousarray(x, dtype=np.float64))
+        st, ct = _sincos(theta)
+    else:
+        ct = np.cos(theta)
+        st = np.sin(theta)
+
+    x0, y0, z0 = _components(x)
     if n == 1:
-        x1[0] = x[0]
-        x1[1] = x[1] * cos(theta) + x[2] * sin(theta)
-        x1[2] = -x[1] * sin(theta) + x[2] * cos(theta)
+        x1 = [x0, y0 * ct + z0 * st, -y0 * st + z0 * ct]
     elif n == 2:
-        x1[0] = x[0] * cos(theta) - x[2] * sin(theta)
-        x1[1] = x[1]
-        x1[2] = x[0] * sin(theta) + x[2] * cos(theta)
-    elif n == 3:
-        x1[0] = x[0] * cos(theta) + x[1] * sin(theta)
-        x1[1] = -x[0] * sin(theta) + x[1] * cos(theta)
-        x1[2] = x[2]
+        x1 = [x0 * ct - z0 * st, y0, x0 * st + z0 * ct]
     else:
-        raise ValueError(f"Cant perform a rotation around axis {n}!")
+        x1 = [x0 * ct + y0 * st, -x0 * st + y0 * ct, z0]
 
-    return x1
+    if out is not None:
+        return _write(out, x1)
+    return _assemble(x, *x1)
 
 
-def rotation_Euler(phi, xi, zeta, x):
+def rotation_Euler(phi, xi, zeta, x, out=None, inplace=False):
     """
     Efectúa una rotación de Euler
 
@@ -102,14 +357,107 @@ def rotation_Euler(phi, xi, zeta, x):
         xi: Segundo ángulo de Euler
         zeta: Tercer ángulo de Euler
         x: Coponentes del vector originales
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Componentes del vector en el sistema de referencia rotado
     """
-    a = rotation(3, phi, x)
-    b = rotation(1, xi, a)
-    x1 = rotation(3, zeta, b)
-    return x1
+    if not inplace and out is None and type(x) in _PLAIN:
+        return _euler_plain(x, _euler_rows(phi, xi, zeta))
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
+        return _euler_sequence(x, out, (phi, xi, zeta))
+    M = rotation_Euler_matrix(phi, xi, zeta)
+    return apply_matrix(M, x, out=out)
+
+
+@functools.lru_cache(maxsize=128)
+def rotation_matrix(n, theta):
+    """
+    Matriz de una rotación elemental pasiva alrededor de un eje cartesiano
+
+    El resultado se guarda en caché por (n, theta) y es de solo lectura.
+
+    Args:
+        n: Eje cartesiano para la rotación
+        theta: Ángulo de la rotación
+
+    Returns:
+        Matriz 3x3 equivalente a rotation(n, theta, x)
+    """
+    if n not in (1, 2, 3):
+        raise ValueError(f"Cant perform a rotation around axis {n}!")
+
+    ct = cos(theta)
+    st = sin(theta)
+    if n == 1:
+        M = np.array([[1.0, 0.0, 0.0], [0.0, ct, st], [0.0, -st, ct]])
+    elif n == 2:
+        M = np.array([[ct, 0.0, -st], [0.0, 1.0, 0.0], [st, 0.0, ct]])
+    else:
+        M = np.array([[ct, st, 0.0], [-st, ct, 0.0], [0.0, 0.0, 1.0]])
+    M.flags.writeable = False
+    return M
+
+
+@functools.lru_cache(maxsize=128)
+def rotation_Euler_matrix(phi, xi, zeta):
+    """
+    Matriz de una rotación de Euler (3, 1, 3)
+
+    El resultado se guarda en caché por (phi, xi, zeta) y es de solo lectura.
+
+    Args:
+        phi: Primer ángulo de Euler
+        xi: Segundo ángulo de Euler
+        zeta: Tercer ángulo de Euler
+
+    Returns:
+        Matriz 3x3 equivalente a rotation_Euler(phi, xi, zeta, x)
+    """
+    M = rotation_matrix(3, zeta) @ rotation_matrix(1, xi) @ rotation_matrix(3, phi)
+    M.flags.writeable = False
+    return M
+
+
+def apply_matrix(M, x, out=None):
+    """
+    Aplica una matriz 3x3 a un vector o a un lote de vectores
+
+    Un lote (N, 3) se transforma con un único producto matricial.
+
+    Args:
+        M: Matriz 3x3
+        x: Vector original, o lote de vectores
+        out[opt]: Buffer donde se escribe el resultado (array, VectorArray, lista
+            o Vector3), que puede ser el propio x
+
+    Si out comparte memoria con x, el lote se recorre por bloques para que la
+    copia temporal que necesita el producto sea solo la de un bloque.
+
+    Returns:
+        Vector transformado, con la misma disposición que x
+    """
+    if isinstance(x, VectorArray):
+        buf = out.data if isinstance(out, VectorArray) else out
+        data = apply_matrix(M, x.data, out=buf)
+        if isinstance(out, VectorArray):
+            out.frame, out.unit = x.frame, x.unit
+            return out
+        return VectorArray(data, x.frame, x.unit)
+    if isinstance(x, np.ndarray):
+        if out is None or x.ndim == 1 or not np.shares_memory(x, out):
+            return np.matmul(x, M.T, out=out)
+        for i in range(0, len(x), _INPLACE_BLOCK):
+            block = slice(i, i + _INPLACE_BLOCK)
+            np.matmul(x[block], M.T, out=out[block])
+        return out
+    x0, y0, z0 = _components(x)
+    x1 = [r0 * x0 + r1 * y0 + r2 * z0 for r0, r1, r2 in M.tolist()]
+    if out is not None:
+        return _write(out, x1)
+    return _assemble(x, *x1)
 
 
 def terrestrial_coordinates(lon, lat, h, dimensionless=False, fulloutput=False):
@@ -120,92 +468,280 @@ def terrestrial_coordinates(lon, lat, h, dimensionless=False, fulloutput=False):
         lon: Longitud geodesica (radianes).
         lat: Latitud geodesica (radianes).
         h: Altura sobre el elipsoide WGS84 (m).
-        dimensionless: Si es True, el output se da en unidades del radio ecuatorial de la Tierra.
+        dimensionless: Si es True, el output se da en unidades del radio
+            ecuatorial de la Tierra.
         fulloutput: Opcional, solicitar los valores de C y S
 
+    Si lon, lat o h son arrays, se calculan todos los observadores a la vez y el
+    resultado es un array (N, 3), o (N, 5) si fulloutput=True.
+
     Returns:
         Coordenadas terrestres [X, Y, Z]
         Si fulloutput=True, devuelve [X,Y,Z,C,S]
 
     """
+    scalar = all(isinstance(q, numbers.Real) for q in (lon, lat, h))
+    if scalar:
+        sin_lat, cos_lat = sin(lat), cos(lat)
+        sin_lon, cos_lon = sin(lon), cos(lon)
+        N = c.r_e / sqrt(1 - c.e_t**2 * sin_lat**2)
+    else:
+        sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+        sin_lon, cos_lon = np.sin(lon), np.cos(lon)
+        N = c.r_e / np.sqrt(1 - c.e_t**2 * sin_lat**2)
 
-    C = (c.r_e / sqrt(1 - c.e_t**2 * sin(lat) ** 2) + h) * cos(lat)
-    S = (c.r_e * (1 - c.e_t**2) / sqrt(1 - c.e_t**2 * sin(lat) ** 2) + h) * sin(lat)
+    C = (N + h) * cos_lat
+    S = (N * (1 - c.e_t**2) + h) * sin_lat
 
-    R = [C * cos(lon), C * sin(lon), S]
+    R = [C * cos_lon, C * sin_lon, S]
 
     if dimensionless:
         R = [i / c.r_e for i in R]
         C /= c.r_e
         S /= c.r_e
     if fulloutput:
-        return R + [C, S]
-    else:
+        R = R + [C, S]
+    if scalar:
         return R
+    return np.stack(np.broadcast_arrays(*R), axis=-1)
+
+
+def geodetic_coordinates(R, dimensionless=False, iterations=2):
+    """
+    Calcula las coordenadas geodésicas de un observador a partir del ITRS.
+
+    Inversa de terrestrial_coordinates sobre el elipsoide WGS84 por el método de
+    Bowring, con un número fijo de iteraciones. Con una iteración el error en
+    altura es menor de 0.1 mm para observadores terrestres; con dos (por
+    defecto) el resultado está en el límite de la precisión doble para alturas
+    de hasta 10000 km.
+
+    Args:
+        R: Coordenadas terrestres [X, Y, Z] (m), o lote de vectores.
+        dimensionless: Si es True, R y h se dan en unidades del radio ecuatorial
+            de la Tierra.
+        iterations[opt]: Número de iteraciones de Bowring.
+
+    Returns:
+        Coordenadas geodésicas [lon, lat, h], lon y lat en radianes.
+    """
+    X, Y, Z = _components(R)
+    if dimensionless:
+        X, Y, Z = X * c.r_e, Y * c.r_e, Z * c.r_e
+
+    a = c.r_e
+    e2 = c.e_t**2
+    b = a * sqrt(1 - e2)
+    ep2 = e2 / (1 - e2)
+
+    if isinstance(X, numbers.Real):
+        atan2, sqrt_, sin_, cos_ = math.atan2, sqrt, sin, cos
+    else:
+        atan2, sqrt_, sin_, cos_ = np.arctan2, np.sqrt, np.sin, np.cos
+
+    p = sqrt_(X**2 + Y**2)
+    lon = atan2(Y, X)
+    beta = atan2(a * Z, b * p)
+    for _ in range(iterations):
+        sb, cb = sin_(beta), cos_(beta)
+        lat = atan2(Z + ep2 * b * sb**3, p - e2 * a * cb**3)
+        beta = atan2(b * sin_(lat), a * cos_(lat))
+
+    sin_lat = sin_(lat)
+    h = p * cos_(lat) + Z * sin_lat - a * sqrt_(1 - e2 * sin_lat**2)
+
+    if dimensionless:
+        h = h / c.r_e
+    return _assemble(R, lon, lat, h)
 
 
-def equatorial_to_ecliptic(x, eps=None):
+def equatorial_to_ecliptic(x, eps=None, out=None, inplace=False):
     """
     Transforma de coordenadas ecuatoriales a eclípticas.
 
     Args:
         x: Vector en coordenadas ecuatoriales.
-        eps[opt]: Oblicuidad de la eclíptica media o verdadera (radianes).
+        eps[opt]: Oblicuidad de la eclíptica media o verdadera (radianes), ver
+            precession.mean_obliquity y precession.true_obliquity. Por defecto 23.5°.
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Vector en coordenadas eclipticas.
     """
     if eps is None:
         eps = degree_to_radian(23.5)
-    x1 = rotation(1, eps, x)
-    return x1
+    if not inplace and out is None and type(x) in _PLAIN:
+        return rotation(1, eps, x)
+    _check_frame(x, "equatorial")
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
+        x1 = _rotate_sequence(x, out, 1, eps)
+    else:
+        x1 = apply_matrix(rotation_matrix(1, eps), x, out=out)
+    return _change_frame(x, x1, "equatorial", "ecliptic")
 
 
-def ecliptic_to_equatorial(x, eps=None):
+def ecliptic_to_equatorial(x, eps=None, out=None, inplace=False):
     """
     Transforma de coordenadas eclípticas a ecuatoriales.
 
     Args:
         x: Vector en coordenadas eclipticas.
-        eps[opt]: Oblicuidad de la eclíptica media o verdadera (radianes).
+        eps[opt]: Oblicuidad de la eclíptica media o verdadera (radianes), ver
+            precession.mean_obliquity y precession.true_obliquity. Por defecto 23.5°.
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Vector en coordenadas ecuatoriales.
     """
     if eps is None:
         eps = degree_to_radian(23.5)
-    x1 = rotation(1, -eps, x)
-    return x1
+    if not inplace and out is None and type(x) in _PLAIN:
+        return rotation(1, -eps, x)
+    _check_frame(x, "ecliptic")
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
+        x1 = _rotate_sequence(x, out, 1, eps, -1)
+    else:
+        x1 = apply_matrix(rotation_matrix(1, eps).T, x, out=out)
+    return _change_frame(x, x1, "ecliptic", "equatorial")
 
 
-def equatorial_to_galactic(x):
+def equatorial_to_galactic(x, out=None, inplace=False):
     """
     Transforma de coordenadas ecuatoriales a galacticas.
 
     Args:
         x: Vector en coordenadas ecuatoriales.
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Vector en coordenadas galacticas.
     """
-    phi, xi, zeta = c.galactic_angles
-    x1 = rotation_Euler(phi, xi, zeta, x)
-    return x1
+    if not inplace and out is None and type(x) in _PLAIN:
+        return _euler_plain(x, _euler_rows(*c.galactic_angles))
+    _check_frame(x, "equatorial")
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
+        x1 = _euler_sequence(x, out, c.galactic_angles)
+    else:
+        x1 = apply_matrix(rotation_Euler_matrix(*c.galactic_angles), x, out=out)
+    return _change_frame(x, x1, "equatorial", "galactic")
 
 
-def galactic_to_equatorial(x):
+def galactic_to_equatorial(x, out=None, inplace=False):
     """
     Transforma de coordenadas galacticas a ecuatoriales.
 
     Args:
         x: Vector en coordenadas galacticas.
+        out[opt]: Buffer donde se escribe el resultado
+        inplace[opt]: Si es True, el resultado se escribe sobre x
 
     Returns:
         Vector en coordenadas ecuatoriales.
     """
-    phi, xi, zeta = c.galactic_angles
-    x1 = rotation_Euler(-zeta, -xi, -phi, x)
-    return x1
+    if not inplace and out is None and type(x) in _PLAIN:
+        return _euler_plain(x, _euler_rows(*c.galactic_angles, True))
+    _check_frame(x, "galactic")
+    out = _output(x, out, inplace)
+    if isinstance(x, _SEQUENCES):
+        x1 = _euler_sequence(x, out, c.galactic_angles, inverse=True)
+    else:
+        M = rotation_Euler_matrix(*c.galactic_angles).T
+        x1 = apply_matrix(M, x, out=out)
+    return _change_frame(x, x1, "galactic", "equatorial")
+
+
+def equatorial_to_horizontal(ra, dec, lst, lat):
+    """
+    Transforma de coordenadas ecuatoriales a horizontales.
+
+    El vector ecuatorial se rota alrededor del eje z por el tiempo sidéreo local,
+    lo que lleva el eje x al meridiano, y después alrededor del eje y por la
+    colatitud del observador. El acimut se cuenta desde el norte hacia el este.
+
+    Args:
+        ra: Ascensión recta (radianes).
+        dec: Declinación (radianes).
+        lst: Tiempo sidéreo local (radianes).
+        lat: Latitud geodésica del observador (radianes), la misma que usa
+            terrestrial_coordinates.
+
+    Los argumentos pueden ser escalares o arrays y se combinan con las reglas de
+    broadcasting de NumPy, p. ej. ra (N, 1, 1), lat (1, S, 1) y lst (1, S, T)
+    dan un resultado (N, S, T). Para rejillas grandes, ver horizontal_grid.
+
+    Returns:
+        [alt, az]: Altura y acimut (radianes), el acimut en [0, 2pi).
+    """
+    v = spherical_to_rectangular([dec, ra, 1.0])
+    v = rotation(3, lst, v)
+    v = rotation(2, c.PI / 2 - lat, v)
+    alt, phi, _ = rectangular_to_spherical(v)
+    return [alt, scale_angle(c.PI - phi)]
+
+
+def horizontal_to_equatorial(alt, az, lst, lat):
+    """
+    Transforma de coordenadas horizontales a ecuatoriales.
+
+    Args:
+        alt: Altura (radianes).
+        az: Acimut, desde el norte hacia el este (radianes).
+        lst: Tiempo sidéreo local (radianes).
+        lat: Latitud geodésica del observador (radianes).
+
+    Los argumentos se combinan con las reglas de broadcasting de NumPy.
+
+    Returns:
+        [ra, dec]: Ascensión recta en [0, 2pi) y declinación (radianes).
+    """
+    v = spherical_to_rectangular([alt, c.PI - az, 1.0])
+    v = rotation(2, lat - c.PI / 2, v)
+    v = rotation(3, -lst, v)
+    dec, ra, _ = rectangular_to_spherical(v)
+    return [scale_angle(ra), dec]
+
+
+# Elementos de la rejilla objetivos x observatorios x instantes por bloque
+HORIZONTAL_CHUNK = 1 << 20
+
+
+def horizontal_grid(ra, dec, lon, lat, gst, chunksize=HORIZONTAL_CHUNK):
+    """
+    Coordenadas horizontales de cada objetivo, observatorio e instante, por bloques
+
+    La rejilla completa no se construye nunca: los objetivos se recorren en
+    bloques de modo que cada bloque, y cada array intermedio, tenga como mucho
+    chunksize elementos (al menos un objetivo por bloque).
+
+    Args:
+        ra, dec: Coordenadas ecuatoriales de los N objetivos (radianes).
+        lon, lat: Longitud (positiva hacia el este) y latitud geodésicas de los
+            S observatorios (radianes).
+        gst: Tiempo sidéreo de Greenwich de los T instantes (radianes).
+        chunksize[opt]: Número máximo de elementos por bloque.
+
+    Yields:
+        (start, alt, az): alt y az son arrays (n, S, T) de los objetivos
+        ra[start:start + n].
+    """
+    ra, dec = np.atleast_1d(ra, dec)
+    lon, lat = np.atleast_1d(lon, lat)
+    gst = np.atleast_1d(gst)
+    lst = (lon[:, None] + gst[None, :])[None]
+    lat = lat[None, :, None]
+    step = max(1, chunksize // lst.size)
+    for start in range(0, len(ra), step):
+        block = slice(start, start + step)
+        alt, az = equatorial_to_horizontal(
+            ra[block, None, None], dec[block, None, None], lst, lat
+        )
+        yield start, alt, az
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from calculoastronomico.applications import (
+    CIRCUMPOLAR,
+    NEVER_RISES,
+    RISES,
+    rise_transit_set,
+)
+from calculoastronomico.timescales import gmst
+from calculoastronomico.transforms import equatorial_to_horizontal
+
+
+@pytest.fixture
+def sites():
+    lon = np.radians([-77.0656, 0.0, 139.7, -70.4])
+    lat = np.radians([38.9214, 51.48, 35.68, -24.63])
+    return lon, lat
+
+
+def test_rise_transit_set_altitudes(sites):
+    rng = np.random.default_rng(3)
+    ra = rng.uniform(0, 2 * np.pi, 200)
+    dec = np.arcsin(rng.uniform(-1, 1, 200))
+    lon, lat = sites
+    jd1 = 2460000.5
+    rise, transit, set_, flag = rise_transit_set(ra, dec, lon, lat, jd1)
+    assert rise.shape == (200, 4)
+
+    rises = flag == RISES
+    for m in (rise, set_):
+        assert np.isfinite(m[rises]).all() and np.isnan(m[~rises]).all()
+        h, _ = equatorial_to_horizontal(
+            ra[:, None], dec[:, None], gmst(jd1, m) + lon, lat
+        )
+        np.testing.assert_allclose(h[rises], np.radians(-34 / 60), atol=1e-9)
+
+    # En el tránsito el ángulo horario es nulo
+    H = np.angle(np.exp(1j * (gmst(jd1, transit) + lon - ra[:, None])))
+    np.testing.assert_allclose(H, 0.0, atol=1e-9)
+    assert ((0 <= transit) & (transit < 1)).all()
+
+
+def test_rise_transit_set_flags(sites):
+    lon, lat = sites
+    dec = np.radians([89.0, -89.0, 0.0])
+    flag = rise_transit_set(np.zeros(3), dec, lon[1], lat[1], 2460000.5)[3]
+    np.testing.assert_array_equal(flag[:, 0], [CIRCUMPOLAR, NEVER_RISES, RISES])
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.backend as cb
+import calculoastronomico.dynamics as cd
+import calculoastronomico.formats as cf
+import calculoastronomico.transforms as ct
+
+SPECIAL = np.array([np.nan, np.inf, -np.inf, 1e300, -1e300, 0.0, -0.0, -12.5, 725.3])
+
+
+@pytest.fixture
+def backend():
+    """Restaura el backend activo al terminar el test"""
+    previous = cb.get_backend()
+    yield cb.set_backend
+    cb.set_backend(previous)
+
+
+def _both(backend, func, *args):
+    """Resultados de func con el backend python y con el numba"""
+    pytest.importorskip("numba")
+    backend("python")
+    expected = func(*args)
+    backend("numba")
+    return expected, func(*args)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        cb.set_backend("fortran")
+
+
+def test_python_backend_has_no_kernels(backend):
+    backend("python")
+    assert cb.get_kernel("scale_angle") is None
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_scale_angle_special_values(backend):
+    expected, result = _both(backend, cf.scale_angle, SPECIAL)
+    np.testing.assert_array_equal(result, expected)
+    assert np.isnan(result[:3]).all()
+    assert result[4] == 0.0
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_degree_to_ddmmss_special_values(backend):
+    expected, result = _both(backend, cf.degree_to_ddmmss, SPECIAL)
+    for e, r in zip(expected, result):
+        np.testing.assert_array_equal(r, e)
+    assert np.isnan(result[1][0]) and np.isnan(result[2][0])
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("value", SPECIAL)
+def test_zero_dimensional_input(backend, value):
+    for func in (cf.degree_to_ddmmss, cf.scale_angle):
+        expected, result = _both(backend, func, np.array(value))
+        assert np.shape(result) == np.shape(expected)
+        for e, r in zip(np.atleast_1d(expected), np.atleast_1d(result)):
+            assert np.shape(r) == np.shape(e) == ()
+            np.testing.assert_array_equal(r, e)
+
+
+def test_rotation_kernel(backend):
+    x = np.random.default_rng(0).normal(size=(100, 3))
+    for n in (1, 2, 3):
+        expected, result = _both(backend, ct.rotation, n, 0.7, x)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-15)
+
+
+def test_rectangular_to_spherical_kernel(backend):
+    x = np.random.default_rng(1).normal(size=(100, 3))
+    expected, result = _both(backend, ct.rectangular_to_spherical, x)
+    np.testing.assert_allclose(result, expected, rtol=1e-15, atol=1e-15)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_solve_kepler_kernel(backend):
+    M = np.concatenate([SPECIAL, np.linspace(-20, 20, 41)])
+    e = np.concatenate([np.full(SPECIAL.size, 0.3), np.resize([0, 0.9, 1, 2.5], 41)])
+    expected, result = _both(backend, cd.solve_kepler, M, e)
+    np.testing.assert_allclose(result, expected, rtol=1e-14, atol=1e-14)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from calculoastronomico.catalog import open_binary, write_binary, write_binary_chunks
+from calculoastronomico.pipeline import (
+    convert_catalog,
+    read_catalog,
+    write_catalog,
+)
+
+CSV = """RAh,RAm,RAs,DE-,DEd,DEm,DEs
+00,42,44.3,+,41,16,09
+12,30,49.4,+,12,23,28
+17,45,40.0,-,29,00,28
+"""
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / "cat.cat"
+    ra = np.linspace(0, 6, 10)
+    frame = np.array(["equatorial", "galactic"] * 5)
+    write_binary(path, {"ra": ra, "frame": frame, "n": np.arange(10)})
+    cat = open_binary(path)
+    assert len(cat) == 10 and cat.names == ["ra", "frame", "n"]
+    np.testing.assert_array_equal(cat["ra"], ra)
+    np.testing.assert_array_equal(cat.frame_names(), frame)
+    assert not cat["ra"].flags.writeable
+
+
+def test_binary_chunks_match_whole(tmp_path):
+    ra = np.random.default_rng(0).uniform(0, 6, 1000)
+    chunks = ({"ra": ra[i : i + 300]} for i in range(0, 1000, 300))
+    assert write_binary_chunks(chunks, tmp_path / "a.cat") == 1000
+    np.testing.assert_array_equal(open_binary(tmp_path / "a.cat")["ra"], ra)
+
+
+def test_binary_to_binary_keeps_frame_names(tmp_path):
+    src, dst = tmp_path / "src.cat", tmp_path / "dst.cat"
+    frame = np.array(["galactic", "equatorial", "galactic"])
+    write_binary(src, {"ra": np.arange(3.0), "frame": frame})
+    write_catalog(read_catalog(src, chunksize=2), dst)
+    np.testing.assert_array_equal(open_binary(dst).frame_names(), frame)
+
+
+def test_write_catalog_frames_order(tmp_path):
+    path = tmp_path / "a.cat"
+    chunk = {"frame": np.array(["galactic", "ecliptic"])}
+    write_catalog(iter([chunk]), path, frames=["ecliptic", "galactic"])
+    cat = open_binary(path)
+    assert cat.frames == ["ecliptic", "galactic"]
+    np.testing.assert_array_equal(cat["frame"], [1, 0])
+
+
+def test_convert_csv_to_binary_drops_text_columns(tmp_path):
+    src, dst = tmp_path / "cat.csv", tmp_path / "cat.cat"
+    src.write_text(CSV)
+    assert convert_catalog(src, dst) == 3
+    cat = open_binary(dst)
+    assert cat.names == ["ra", "dec", "lon", "lat"]
+    np.testing.assert_allclose(
+        np.degrees(cat["dec"]), [41 + 16 / 60 + 9 / 3600, 12.391111, -29.007778]
+    )
+
+
+def test_explicit_text_column_is_rejected(tmp_path):
+    chunks = iter([{"name": np.array(["a"])}])
+    with pytest.raises(TypeError):
+        write_binary_chunks(chunks, tmp_path / "a.cat", ["name"])
+
+
+def test_chunks_are_views_of_the_file(tmp_path):
+    path = tmp_path / "a.cat"
+    write_binary(path, {"ra": np.arange(10.0), "dec": np.zeros(10)})
+    cat = open_binary(path, mode="r+")
+    chunks = list(cat.chunks(4, ["ra"]))
+    assert [list(c) for c in chunks] == [["ra"]] * 3
+    assert all(np.shares_memory(c["ra"], cat["ra"]) for c in chunks)
+    chunks[1]["ra"][0] = -1.0
+    cat["ra"].flush()
+    assert open_binary(path)["ra"][4] == -1.0
+
+
+def test_not_a_catalog(tmp_path):
+    path = tmp_path / "a.cat"
+    path.write_bytes(b"not a catalog")
+    with pytest.raises(ValueError):
+        open_binary(path)
+
+
+def test_empty_catalog(tmp_path):
+    path = tmp_path / "a.cat"
+    write_binary(path, {"ra": np.empty(0)})
+    cat = open_binary(path)
+    assert len(cat) == 0 and cat["ra"].shape == (0,)
+
+
+def test_text_only_chunks(tmp_path):
+    path = tmp_path / "a.cat"
+    chunks = iter([{"name": np.array(["a", "b"])}, {"name": np.array(["c"])}])
+    assert write_binary_chunks(chunks, path) == 3
+    cat = open_binary(path)
+    assert len(cat) == 3 and cat.names == []
+
+
+def test_rows_counted_from_chunk(tmp_path):
+    path = tmp_path / "a.cat"
+    chunks = [{"ra": np.arange(4.0), "name": np.array(list("abcd"))}] * 2
+    assert write_binary_chunks(iter(chunks), path) == 8
+    np.testing.assert_array_equal(open_binary(path)["ra"], np.tile(np.arange(4.0), 2))
@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+import pytest
+
+import calculoastronomico.backend as cb
+import calculoastronomico.dynamics as cd
+
+
+@pytest.fixture
+def elements():
+    rng = np.random.default_rng(5)
+    n = 500
+    e = np.concatenate([rng.uniform(0, 0.99, n), rng.uniform(1.01, 5, n)])
+    M = np.concatenate([rng.uniform(-50, 50, n), rng.uniform(-20, 20, n)])
+    return M, e
+
+
+def _residual(M, e, E):
+    return np.where(
+        e < 1,
+        np.angle(np.exp(1j * (E - e * np.sin(E) - M))),
+        e * np.sinh(E) - E - M,
+    )
+
+
+def test_solve_kepler_meeus():
+    # Meeus, Astronomical Algorithms, ejemplo 30.a
+    E = cd.solve_kepler(math.radians(5), 0.1)
+    assert math.degrees(E) == pytest.approx(5.554589, abs=1e-6)
+
+
+@pytest.fixture(params=["python", "numba"])
+def backend(request):
+    """Ejecuta el test con cada backend y restaura el activo al terminar"""
+    if request.param == "numba":
+        pytest.importorskip("numba")
+    previous = cb.get_backend()
+    cb.set_backend(request.param)
+    yield request.param
+    cb.set_backend(previous)
+
+
+def test_solve_kepler_residual(elements, backend):
+    M, e = elements
+    E = cd.solve_kepler(M, e)
+    np.testing.assert_allclose(_residual(M, e, E), 0.0, atol=1e-12)
+    assert (np.abs(E[e < 1]) <= np.pi).all()
+    scalar = [cd.solve_kepler(m, x) for m, x in zip(M[::50], e[::50])]
+    np.testing.assert_allclose(E[::50], scalar, rtol=1e-13, atol=1e-13)
+
+
+def test_solve_kepler_reduction_matches_scalar(backend):
+    # Con |M| grande y en los múltiplos impares de pi, la reducción del camino
+    # escalar debe coincidir con la de los arrays
+    M = np.array([np.pi, -np.pi, 3 * np.pi, 1e6, -1e6 + 0.3, 12345.678, -7e4])
+    e = np.full(M.shape, 0.3)
+    E = cd.solve_kepler(M, e)
+    scalar = [cd.solve_kepler(float(m), 0.3) for m in M]
+    np.testing.assert_allclose(E, scalar, rtol=0, atol=1e-13)
+    assert ((E >= -np.pi) & (E < np.pi)).all()
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_solve_kepler_special_values(backend):
+    M = np.array([np.nan, np.inf, 1e300, 0.5, 0.5])
+    e = np.array([0.5, 0.5, 0.5, 1.0, np.nan])
+    E = cd.solve_kepler(M, e)
+    assert np.isnan(E[[0, 1, 3, 4]]).all()
+    assert math.isnan(cd.solve_kepler(0.5, 1.0))
+
+
+def test_propagate_invariants():
+    a = np.array([1.0, 2.77, 5.2, -1.5])
+    e = np.array([0.0167, 0.08, 0.3, 1.7])
+    i, Omega, omega = np.array([0.0, 0.185, 0.7, 2.0]), 1.3, 0.4
+    t = np.linspace(2451545.0, 2461545.0, 7)[:, None]
+    r, v = cd.propagate(a, e, i, Omega, omega, 0.3, 2451545.0, t)
+    assert r.shape == v.shape == (7, 4, 3)
+
+    rn = np.linalg.norm(r, axis=-1)
+    v2 = (v**2).sum(axis=-1)
+    # Vis-viva y conservación del momento angular
+    np.testing.assert_allclose(v2, cd.GM_SUN * (2 / rn - 1 / a), rtol=1e-10)
+    h = np.linalg.norm(np.cross(r, v), axis=-1)
+    h0 = np.sqrt(cd.GM_SUN * np.abs(a) * np.abs(1 - e**2))
+    np.testing.assert_allclose(h, np.broadcast_to(h0, h.shape), rtol=1e-12)
+
+
+def test_propagate_scalar_matches_array():
+    args = (2.77, 0.08, 0.185, 1.3, 0.4, 0.3, 2451545.0)
+    r, v = cd.propagate(*args, 2455000.0)
+    ra, va = cd.propagate(*args, np.array([2455000.0]))
+    np.testing.assert_allclose(ra[0], r, rtol=1e-14)
+    np.testing.assert_allclose(va[0], v, rtol=1e-14)
+
+
+@pytest.mark.parametrize("a, e", [(2.77, 0.08), (-1.2, 1.5)])
+def test_propagate_zero_dimensional(a, e):
+    args = (a, e, 0.185, 1.3, 0.4, 0.3, 2451545.0)
+    r, v = cd.propagate(*args, 2455000.0)
+    r0, v0 = cd.propagate(*args, np.array(2455000.0))
+    assert r0.shape == v0.shape == (3,)
+    np.testing.assert_allclose(r0, r, rtol=1e-14)
+    np.testing.assert_allclose(v0, v, rtol=1e-14)
+    r0, _ = cd.propagate(*map(np.array, args), np.array(2455000.0))
+    np.testing.assert_allclose(r0, r, rtol=1e-14)
+
+
+def test_propagate_period():
+    period = 2 * np.pi / np.sqrt(cd.GM_SUN / 2.77**3)
+    args = (2.77, 0.08, 0.185, 1.3, 0.4, 0.3, 2451545.0)
+    r0, _ = cd.propagate(*args, 2451545.0)
+    r1, _ = cd.propagate(*args, 2451545.0 + period)
+    np.testing.assert_allclose(r1, r0, atol=1e-12)
@@ -0,0 +1,156 @@
+import io
+
+import numpy as np
+import pytest
+
+import calculoastronomico.formats as cf
+
+SEXAGESIMAL = [
+    "-40",
+    "-40 15.5",
+    "12h34m56.7s",
+    "-00 30",
+    "+12:30:00",
+    "-40°15'59.9\"",
+    "40º 15′ 59.9″",
+    " 7 08 09 ",
+    ".5",
+    "40:60:00",
+    "40:15:60",
+    "",
+    "-",
+    "40 15 16 17",
+    "4a 15",
+    "40 1.2.3",
+    "40−15",
+    "40€15",
+    "12 34 56.7中",
+    "١٢ 30",
+    "1234567890123456",
+]
+
+
+def test_parse_sexagesimal_scalar_matches_array():
+    value, bad = cf.parse_sexagesimal(np.array(SEXAGESIMAL))
+    for i, text in enumerate(SEXAGESIMAL):
+        v, b = cf.parse_sexagesimal(text)
+        assert b == bad[i], text
+        np.testing.assert_equal(v, value[i], err_msg=text)
+
+
+@pytest.mark.parametrize("text", ["40−15", "40€15", "12 34 56.7中"])
+def test_parse_sexagesimal_rejects_non_ascii(text):
+    value, bad = cf.parse_sexagesimal(np.array([text]))
+    assert bad[0] and np.isnan(value[0])
+
+
+def test_parse_sexagesimal_values():
+    value, bad = cf.parse_sexagesimal(np.array(["-00 30", "12h30m", "-40:15:36"]))
+    np.testing.assert_allclose(value, [-0.5, 12.5, -40.26])
+    assert not bad.any()
+    value, bad = cf.parse_sexagesimal("12:30", hours=True, radian=True)
+    assert value == pytest.approx(np.pi * 12.5 / 12)
+
+
+def test_compact_round_trip_carries_seconds():
+    assert cf.degree_to_ddmmss_compact(40.26666666666666) == pytest.approx(40.16)
+    assert cf.ddmmss_compact_to_degree(40.16) == pytest.approx(40 + 16 / 60)
+    x = np.array([40.26666666666666, -12.513])
+    np.testing.assert_allclose(
+        cf.ddmmss_compact_to_degree(cf.degree_to_ddmmss_compact(x)), x, atol=1e-9
+    )
+
+
+def test_compact_non_finite_gives_nan():
+    x = np.array([np.nan, np.inf, -np.inf, 40.26666666666666])
+    with np.errstate(all="raise"):
+        result = cf.degree_to_ddmmss_compact(x)
+        assert np.isnan(result[:3]).all()
+        assert np.isnan(cf.ddmmss_compact_to_degree(x)[:3]).all()
+    assert result[3] == pytest.approx(40.16)
+    assert np.isnan(cf.degree_to_ddmmss_compact(float("nan")))
+    assert np.isnan(cf.ddmmss_compact_to_degree(float("inf")))
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf, 1e300])
+def test_ticks_reject_non_representable(value):
+    with pytest.raises(ValueError):
+        cf.degree_to_ticks(np.array([1.0, value]))
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_ticks_reject_non_finite_scalar(value):
+    with pytest.raises(ValueError):
+        cf.degree_to_ticks(value)
+
+
+def test_ticks_round_trip():
+    x = np.array([0.0, -0.5, 359.999999, 1e6])
+    np.testing.assert_array_equal(cf.ticks_to_degree(cf.degree_to_ticks(x)), x)
+    sig, d, m, s = cf.ticks_to_ddmmss(cf.degree_to_ticks(-12.513))
+    assert (sig, d, m) == (-1.0, 12, 30) and s == pytest.approx(46.8)
+
+
+@pytest.mark.parametrize(
+    "precision, expected",
+    [
+        (0, "+11:00:00"),
+        (1, "+11:00:00.0"),
+        (2, "+11:00:00.00"),
+        (3, "+11:00:00.000"),
+    ],
+)
+def test_format_sexagesimal_carries_seconds(precision, expected):
+    # 10°59'59.9999" redondea a 60" en todas las precisiones
+    value = 10 + 59 / 60 + 59.9999 / 3600
+    assert cf.format_sexagesimal(value, precision=precision) == expected
+    assert cf.format_sexagesimal(-value, precision=precision) == "-" + expected[1:]
+
+
+def test_format_sexagesimal_carries_degrees():
+    x = np.array([89.99999999, -0.99999999, 99.99999999, 12.5])
+    np.testing.assert_array_equal(
+        cf.format_sexagesimal(x),
+        ["+090:00:00.00", "-001:00:00.00", "+100:00:00.00", "+012:30:00.00"],
+    )
+    assert cf.format_sexagesimal(23.99999999, hours=True) == "24:00:00.00"
+
+
+def test_format_sexagesimal_zero_has_no_sign():
+    x = np.array([-1e-9, -0.0, 0.0, -0.5])
+    np.testing.assert_array_equal(
+        cf.format_sexagesimal(x),
+        ["+00:00:00.00", "+00:00:00.00", "+00:00:00.00", "-00:30:00.00"],
+    )
+    assert cf.format_sexagesimal(-0.0, hours=True) == "00:00:00.00"
+    assert cf.format_sexagesimal(-1e-9, hours=True, signed_zero=True) == (
+        "-00:00:00.00"
+    )
+    assert cf.format_sexagesimal(-0.0, signed_zero=True) == "-00:00:00.00"
+
+
+def test_format_sexagesimal_nan_rows():
+    x = np.array([np.nan, 1.5, np.inf])
+    np.testing.assert_array_equal(
+        cf.format_sexagesimal(x), ["nan         ", "+01:30:00.00", "nan         "]
+    )
+
+
+def test_format_sexagesimal_plus():
+    x = np.array([1.5, -2.0])
+    np.testing.assert_array_equal(
+        cf.format_sexagesimal(x, plus=False), [" 01:30:00.00", "-02:00:00.00"]
+    )
+    assert cf.format_sexagesimal(1.5, plus=False) == "01:30:00.00"
+    assert cf.format_sexagesimal(12.5, hours=True) == "12:30:00.00"
+    assert cf.format_sexagesimal(
+        12.5, hours=True, precision=0, sep="hms", plus=True
+    ) == "+12h30m00s"
+
+
+def test_write_sexagesimal_matches_format():
+    x = np.array([-1e-9, 10 + 59 / 60 + 59.9999 / 3600, np.nan])
+    fh = io.StringIO()
+    cf.write_sexagesimal(fh, x, precision=1)
+    assert fh.getvalue().splitlines() == list(cf.format_sexagesimal(x, precision=1))
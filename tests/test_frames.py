@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.transforms as ct
+from calculoastronomico.containers import Vector3, VectorArray
+from calculoastronomico.frames import FrameGraph, default_graph
+
+EPS = 0.40909
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(0).normal(size=(50, 3))
+
+
+@pytest.fixture
+def graph():
+    return default_graph(EPS)
+
+
+def test_multi_hop_matches_chained_wrappers(graph, batch):
+    assert graph.path("ecliptic", "galactic") == ["ecliptic", "equatorial", "galactic"]
+    expected = ct.equatorial_to_galactic(ct.ecliptic_to_equatorial(batch, EPS))
+    np.testing.assert_allclose(graph.convert(batch, "ecliptic", "galactic"), expected)
+
+    x = [0.3, -0.4, 0.5]
+    expected = ct.equatorial_to_ecliptic(ct.galactic_to_equatorial(x), EPS)
+    result = graph.convert(x, "galactic", "ecliptic")
+    assert isinstance(result, list)
+    np.testing.assert_allclose(result, expected)
+
+
+def test_round_trip(graph, batch):
+    x = graph.convert(batch, "ecliptic", "galactic")
+    np.testing.assert_allclose(
+        graph.convert(x, "galactic", "ecliptic"), batch, atol=1e-12
+    )
+
+
+def test_transform_is_cached(graph):
+    T = graph.transform("ecliptic", "galactic")
+    assert graph.transform("ecliptic", "galactic") is T
+    assert not T[0].flags.writeable and not T[1].flags.writeable
+    graph.add_translation("galactic", "shifted", [1.0, 0.0, 0.0])
+    assert graph.transform("ecliptic", "galactic") is not T
+    np.testing.assert_array_equal(graph.transform("ecliptic", "galactic")[0], T[0])
+
+
+def test_translation_edges(batch):
+    graph = FrameGraph()
+    R1, R2 = [1.0, 2.0, 3.0], [-0.5, 0.25, 4.0]
+    graph.add_translation("O", "O1", R1)
+    graph.add_translation("O1", "O2", R2)
+    expected = ct.translation(ct.translation(batch, R1), R2)
+    np.testing.assert_allclose(graph.convert(batch, "O", "O2"), expected)
+    np.testing.assert_allclose(graph.convert(expected, "O2", "O"), batch)
+    assert graph.convert([0.0, 0.0, 0.0], "O", "O2") == pytest.approx([-0.5, -2.25, -7])
+
+
+def test_affine_edge_after_rotation(graph, batch):
+    R = [0.1, -0.2, 0.3]
+    graph.add_translation("ecliptic", "heliocentric", R)
+    expected = ct.translation(ct.equatorial_to_ecliptic(batch, EPS), R)
+    np.testing.assert_allclose(
+        graph.convert(batch, "equatorial", "heliocentric"), expected
+    )
+
+
+def test_one_way_edge(batch):
+    graph = FrameGraph()
+    graph.add_translation("O", "O1", [1.0, 0.0, 0.0], inverse=False)
+    assert graph.frames == ["O", "O1"]
+    graph.convert(batch, "O", "O1")
+    with pytest.raises(ValueError):
+        graph.convert(batch, "O1", "O")
+
+
+def test_unknown_and_disconnected_frames(graph, batch):
+    with pytest.raises(KeyError):
+        graph.convert(batch, "equatorial", "horizontal")
+    with pytest.raises(KeyError):
+        graph.path("horizontal", "equatorial")
+    graph.add_translation("topocentric", "geocentric", [0.0, 0.0, 1.0])
+    with pytest.raises(ValueError):
+        graph.convert(batch, "equatorial", "geocentric")
+
+
+def test_containers_are_relabelled(graph, batch):
+    result = graph.convert(VectorArray(batch, "ecliptic", "au"), "ecliptic", "galactic")
+    assert isinstance(result, VectorArray)
+    assert (result.frame, result.unit) == ("galactic", "au")
+    expected = graph.convert(batch, "ecliptic", "galactic")
+    np.testing.assert_allclose(result.data, expected)
+
+    v = graph.convert(Vector3(0.3, -0.4, 0.5, "galactic"), "galactic", "equatorial")
+    assert isinstance(v, Vector3) and v.frame == "equatorial"
+
+    unlabelled = graph.convert(VectorArray(batch), "ecliptic", "galactic")
+    assert unlabelled.frame is None
+
+
+def test_container_frame_is_checked(graph, batch):
+    with pytest.raises(ValueError):
+        graph.convert(VectorArray(batch, "equatorial"), "ecliptic", "galactic")
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.transforms as ct
+from calculoastronomico.containers import Vector3, VectorArray
+from calculoastronomico.lazy import lazy
+
+
+@pytest.fixture
+def sph():
+    rng = np.random.default_rng(10)
+    n = 1000
+    return np.stack(
+        [np.arcsin(rng.uniform(-1, 1, n)), rng.uniform(0, 2 * np.pi, n), np.ones(n)],
+        axis=-1,
+    )
+
+
+def _eager(v):
+    v = ct.spherical_to_rectangular(v)
+    v = ct.ecliptic_to_equatorial(v)
+    v = ct.equatorial_to_galactic(v)
+    v = ct.translation(v, [0.1, 0.0, -0.2])
+    return ct.rectangular_to_spherical(v)
+
+
+def _lazy(v):
+    return (
+        lazy(v)
+        .spherical_to_rectangular()
+        .ecliptic_to_equatorial()
+        .equatorial_to_galactic()
+        .translation([0.1, 0.0, -0.2])
+        .rectangular_to_spherical()
+    )
+
+
+def test_chain_matches_eager(sph):
+    expr = _lazy(sph)
+    assert [s if isinstance(s, str) else s[0] for s in expr.plan] == [
+        "spherical_to_rectangular",
+        "affine",
+        "rectangular_to_spherical",
+    ]
+    np.testing.assert_allclose(expr.compute(blocksize=128), _eager(sph), atol=1e-14)
+
+
+def test_columns_and_single_vector(sph):
+    columns = [sph[:, 0], sph[:, 1], sph[:, 2]]
+    result = _lazy(columns).compute()
+    assert isinstance(result, list)
+    np.testing.assert_allclose(np.stack(result, axis=-1), _eager(sph), atol=1e-14)
+    single = _lazy(sph[3].tolist()).compute()
+    np.testing.assert_allclose(single, _eager(sph[3].tolist()), atol=1e-14)
+
+
+def test_inverse_steps_cancel(sph):
+    expr = (
+        lazy(sph)
+        .spherical_to_rectangular()
+        .equatorial_to_ecliptic()
+        .ecliptic_to_equatorial()
+        .rectangular_to_spherical()
+        .spherical_to_rectangular()
+    )
+    assert expr.plan == ["spherical_to_rectangular"]
+
+
+def test_frames(sph):
+    v = VectorArray(ct.spherical_to_rectangular(sph), "equatorial")
+    out = np.empty_like(sph)
+    result = lazy(v).equatorial_to_galactic().compute(out=out)
+    assert isinstance(result, VectorArray) and result.frame == "galactic"
+    assert np.shares_memory(result.data, out)
+    with pytest.raises(ValueError):
+        lazy(v).ecliptic_to_equatorial()
+    vector = lazy(Vector3(1.0, 0.0, 0.0, "equatorial")).equatorial_to_ecliptic()
+    assert vector.compute().frame == "ecliptic"
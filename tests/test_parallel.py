@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.parallel as cp
+from calculoastronomico.dynamics import solve_kepler
+from calculoastronomico.formats import format_sexagesimal, parse_sexagesimal
+from calculoastronomico.transforms import (
+    equatorial_to_galactic,
+    rectangular_to_spherical,
+    rotation,
+)
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(6).normal(size=(1001, 3))
+
+
+@pytest.mark.parametrize("executor", cp.EXECUTORS)
+def test_order_matches_serial(batch, executor):
+    result = cp.map_chunks(
+        equatorial_to_galactic, batch, chunksize=100, workers=2, executor=executor
+    )
+    np.testing.assert_array_equal(result, equatorial_to_galactic(batch))
+
+
+@pytest.mark.parametrize("executor", cp.EXECUTORS)
+def test_columns_and_scalar_arguments(batch, executor):
+    columns = [batch[:, 0], batch[:, 1], batch[:, 2]]
+    result = cp.map_chunks(
+        rotation, 3, 0.4, columns, chunksize=128, workers=2, executor=executor
+    )
+    assert isinstance(result, list) and len(result) == 3
+    for r, e in zip(result, rotation(3, 0.4, columns)):
+        np.testing.assert_array_equal(r, e)
+
+    e = np.full(len(batch), 0.3)
+    result = cp.map_chunks(
+        solve_kepler, batch[:, 0], e, chunksize=77, workers=2, executor=executor
+    )
+    np.testing.assert_array_equal(result, solve_kepler(batch[:, 0], e))
+
+
+@pytest.mark.parametrize("executor", cp.EXECUTORS)
+def test_variable_width_strings(executor):
+    # El ancho del campo de grados se decide en cada bloque: dos cifras en el
+    # primero y tres en el último
+    values = np.linspace(-20.0, 300.0, 250)
+    result = cp.map_chunks(
+        format_sexagesimal, values, chunksize=50, workers=2, executor=executor
+    )
+    assert result[0] == "-20:00:00.00" and result[-1] == "+300:00:00.00"
+    parsed, bad = parse_sexagesimal(result)
+    assert not bad.any()
+    np.testing.assert_allclose(parsed, values, atol=0.5 / 360000)
+
+
+def test_single_worker_and_tuple_output(batch):
+    result = cp.map_chunks(rectangular_to_spherical, batch, chunksize=300, workers=1)
+    np.testing.assert_array_equal(result, rectangular_to_spherical(batch))
+
+
+def test_invalid_arguments(batch):
+    with pytest.raises(ValueError):
+        cp.map_chunks(equatorial_to_galactic, batch, executor="gpu")
+    with pytest.raises(ValueError):
+        cp.map_chunks(equatorial_to_galactic, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        cp.set_workers(0)
+    previous = cp.get_workers()
+    cp.set_workers(3)
+    assert cp.get_workers() == 3
+    cp.set_workers(previous)
+
+
+@pytest.mark.parametrize("executor", cp.EXECUTORS)
+def test_empty_input(executor):
+    empty = np.empty((0, 3))
+    result = cp.map_chunks(rotation, 3, 0.1, empty, workers=2, executor=executor)
+    assert result.shape == (0, 3)
+    columns = [np.empty(0)] * 3
+    result = cp.map_chunks(rotation, 3, 0.1, columns, workers=2, executor=executor)
+    assert [r.shape for r in result] == [(0,)] * 3
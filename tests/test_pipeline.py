@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from calculoastronomico.pipeline import (
+    convert_catalog,
+    read_catalog,
+    sexagesimal_to_radians,
+    to_frame,
+    write_catalog,
+)
+from calculoastronomico.transforms import (
+    equatorial_to_galactic,
+    spherical_to_rectangular,
+)
+
+CSV = """RAh,RAm,RAs,DE-,DEd,DEm,DEs
+00,42,44.3,+,41,16,09
+12,30,,+,12,23,28
+17,4x,40.0,-,29,00,28
+18,36,56.3,-,00,30,00
+"""
+
+
+def _read(tmp_path, chunksize=2):
+    path = tmp_path / "cat.csv"
+    path.write_text(CSV)
+    return read_catalog(path, chunksize)
+
+
+def test_bad_cells_give_nan_rows(tmp_path):
+    chunks = list(sexagesimal_to_radians(_read(tmp_path)))
+    ra = np.concatenate([c["ra"] for c in chunks])
+    dec = np.concatenate([c["dec"] for c in chunks])
+    assert np.isnan(ra[[1, 2]]).all()
+    assert not np.isnan(dec[[0, 1, 2]]).any()
+    assert np.degrees(ra[0]) == pytest.approx(15 * (42 / 60 + 44.3 / 3600))
+    assert np.degrees(dec[3]) == pytest.approx(-0.5)
+
+
+def test_to_frame_matches_transforms(tmp_path):
+    chunks = to_frame(sexagesimal_to_radians(_read(tmp_path)), "galactic")
+    chunk = next(chunks)
+    v = spherical_to_rectangular([chunk["dec"], chunk["ra"], 1.0])
+    x, y, z = equatorial_to_galactic(v)
+    np.testing.assert_allclose(np.arctan2(z, np.hypot(x, y)), chunk["lat"])
+
+
+def test_csv_round_trip(tmp_path):
+    out = tmp_path / "out.csv"
+    assert write_catalog(sexagesimal_to_radians(_read(tmp_path)), out) == 4
+    back = list(read_catalog(out))
+    header = ["RAh", "RAm", "RAs", "DE-", "DEd", "DEm", "DEs", "ra", "dec"]
+    assert list(back[0]) == header
+
+
+def test_empty_csv_gives_no_chunks(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    assert list(read_catalog(path)) == []
+    out = tmp_path / "out.csv"
+    assert convert_catalog(path, out) == 0
+    assert out.read_text() == ""
+
+
+def test_header_only_csv_keeps_header(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_text(CSV.splitlines()[0] + "\n")
+    (chunk,) = read_catalog(path)
+    assert list(chunk) == ["RAh", "RAm", "RAs", "DE-", "DEd", "DEm", "DEs"]
+    assert all(len(col) == 0 for col in chunk.values())
+    out = tmp_path / "out.csv"
+    assert convert_catalog(path, out) == 0
+    header = "RAh,RAm,RAs,DE-,DEd,DEm,DEs,ra,dec,lon,lat"
+    assert out.read_text().splitlines() == [header]
+
+
+def test_write_csv_header_once_after_empty_chunk(tmp_path):
+    chunks = [{"a": np.array([])}, {"a": np.array([1.0, 2.0])}]
+    out = tmp_path / "out.csv"
+    assert write_catalog(iter(chunks), out) == 2
+    assert out.read_text().splitlines() == ["a", "1.0", "2.0"]
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.precession as cp
+from calculoastronomico.timescales import J2000
+from calculoastronomico.transforms import (
+    rectangular_to_spherical,
+    spherical_to_rectangular,
+)
+
+ARCSEC = np.radians(1 / 3600)
+
+# Meeus, Astronomical Algorithms, ejemplo 21.b: theta Persei (con el movimiento
+# propio ya aplicado) llevado de J2000.0 a 2028 nov 13.19 TD
+MEEUS_21B_JD = 2462088.69
+MEEUS_21B_J2000 = (41.054063, 49.227750)
+MEEUS_21B_DATE = (41.547214, 49.348483)
+
+# Meeus usa la precesión IAU 1976, cuya velocidad en zeta + z difiere de la de
+# IAU 2006 en unos 0.3"/siglo: en 0.29 siglos, cerca de 0.1"
+MODEL_TOLERANCE = 0.15 * ARCSEC
+
+
+@pytest.fixture
+def cache():
+    """Cachés de matrices vacías, con su tamaño por defecto al terminar"""
+    cp.set_cache_size(2)
+    yield
+    cp.set_cache_size()
+
+
+def test_mean_obliquity_j2000():
+    assert cp.mean_obliquity(J2000) / ARCSEC == pytest.approx(84381.406, abs=1e-9)
+
+
+def test_precession_angles_meeus():
+    # Ángulos de IAU 1976 (Lieske) para la fecha del ejemplo 21.b
+    T = (MEEUS_21B_JD - J2000) / 36525
+    zeta_z = 2 * 2306.2181 * T + (0.30188 + 1.09468) * T**2 + 0.036201 * T**3
+    theta = 2004.3109 * T - 0.42665 * T**2 - 0.041833 * T**3
+    zeta, z, th = cp.precession_angles(MEEUS_21B_JD)
+    assert zeta + z == pytest.approx(zeta_z * ARCSEC, abs=MODEL_TOLERANCE)
+    assert th == pytest.approx(theta * ARCSEC, abs=MODEL_TOLERANCE)
+
+
+def test_precess_meeus():
+    ra, dec = np.radians(MEEUS_21B_J2000)
+    v = spherical_to_rectangular([dec, ra, 1.0])
+    dec, ra, _ = rectangular_to_spherical(cp.precess(v, MEEUS_21B_JD))
+    ra0, dec0 = np.radians(MEEUS_21B_DATE)
+    assert ra * np.cos(dec) == pytest.approx(ra0 * np.cos(dec0), abs=MODEL_TOLERANCE)
+    assert dec == pytest.approx(dec0, abs=MODEL_TOLERANCE)
+
+
+def test_nutation_meeus():
+    # Meeus, ejemplo 22.a: 1987 abril 10, 0h TD. La serie truncada tiene un
+    # error del orden de 10 milisegundos de arco
+    dpsi, deps = cp.nutation(2446895.5)
+    assert dpsi / ARCSEC == pytest.approx(-3.788, abs=0.01)
+    assert deps / ARCSEC == pytest.approx(9.443, abs=0.01)
+    eps = cp.true_obliquity(2446895.5) - cp.mean_obliquity(2446895.5)
+    assert eps == pytest.approx(deps, abs=1e-15)
+
+
+def test_matrices_are_rotations():
+    for func in (cp.precession_matrix, cp.nutation_matrix):
+        M = func(2460000.5, 0.25)
+        np.testing.assert_allclose(M @ M.T, np.eye(3), atol=1e-15)
+        assert not M.flags.writeable
+    np.testing.assert_allclose(
+        cp.precession_nutation_matrix(2460000.5, 0.25),
+        cp.nutation_matrix(2460000.5, 0.25) @ cp.precession_matrix(2460000.5, 0.25),
+        atol=1e-16,
+    )
+
+
+@pytest.mark.parametrize("nutate", [False, True])
+def test_precess_per_vector_epochs(nutate):
+    rng = np.random.default_rng(11)
+    v = rng.normal(size=(12, 3))
+    jd1 = np.repeat([2440000.5, 2451545.0, 2470000.5], 4)
+    jd2 = np.tile([0.0, 0.5], 6)
+    result = cp.precess(v, jd1, jd2, nutate=nutate)
+    expected = [cp.precess(x, a, b, nutate=nutate) for x, a, b in zip(v, jd1, jd2)]
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-15)
+    columns = cp.precess([v[:, 0], v[:, 1], v[:, 2]], jd1, jd2, nutate=nutate)
+    np.testing.assert_allclose(np.stack(columns, axis=-1), result, atol=1e-15)
+
+
+def test_cache_counts(cache):
+    info = cp.cache_info()
+    names = {"precession_matrix", "nutation_matrix", "precession_nutation_matrix"}
+    assert set(info) == names
+    assert info["precession_matrix"][:] == (0, 0, 2, 0)
+
+    v = np.ones((6, 3))
+    cp.precess(v, np.repeat([2440000.5, 2451545.0, 2470000.5], 2))
+    assert cp.cache_info()["precession_matrix"][:] == (0, 3, 2, 2)
+    cp.precession_matrix(2470000.5)
+    assert cp.cache_info()["precession_matrix"].hits == 1
+
+    cp.set_cache_size(0)
+    M = cp.precession_matrix(2470000.5)
+    np.testing.assert_array_equal(M, cp.precession_matrix(2470000.5))
+    assert cp.cache_info()["precession_matrix"][:] == (0, 2, 0, 0)
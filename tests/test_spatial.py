@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from calculoastronomico.spatial import SkyIndex
+
+
+def _random_unit(rng, n):
+    v = rng.normal(size=(n, 3))
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.default_rng(7)
+    v = _random_unit(rng, 5000)
+    # Objetos junto a los polos y a ambos lados de ra = 0
+    extra = np.array(
+        [[0, 0, 1], [0, 0, -1], [1, 1e-4, 0], [1, -1e-4, 0], [0.01, 0, 1]], float
+    )
+    return np.concatenate([v, extra / np.linalg.norm(extra, axis=-1)[:, None]])
+
+
+def _brute_force(v, centers, radius):
+    c = centers / np.linalg.norm(centers, axis=-1, keepdims=True)
+    sep = np.arccos(np.clip(c @ v.T, -1, 1))
+    q, index = np.nonzero(sep <= radius[:, None])
+    return q, index
+
+
+def test_cone_search_matches_brute_force(catalog):
+    rng = np.random.default_rng(8)
+    centers = np.concatenate(
+        [_random_unit(rng, 200), [[0, 0, 1], [0, 0, -1], [1, 0, 0], [1, 0, 0.3]]]
+    )
+    radius = rng.uniform(0.001, 0.2, len(centers))
+    index = SkyIndex(catalog, zone_height=0.02)
+    q, i = index.cone_search(centers, radius)
+    eq, ei = _brute_force(catalog, centers, radius)
+    np.testing.assert_array_equal(q, eq)
+    np.testing.assert_array_equal(i, ei)
+
+
+def test_cone_search_single_center(catalog):
+    index = SkyIndex(catalog)
+    result = index.cone_search([1.0, 0.0, 0.0], 0.05)
+    expected = _brute_force(catalog, np.array([[1.0, 0, 0]]), np.array([0.05]))[1]
+    np.testing.assert_array_equal(result, expected)
+    assert {len(catalog) - 3, len(catalog) - 2} <= set(result)
+
+
+def test_crossmatch_nearest(catalog):
+    rng = np.random.default_rng(9)
+    other = catalog[::25] + rng.normal(scale=1e-6, size=(len(catalog[::25]), 3))
+    other = np.concatenate([other, [[0.3, -0.2, 0.9]]])
+    index, sep = SkyIndex(catalog).crossmatch(other, 1e-4)
+
+    c = other / np.linalg.norm(other, axis=-1, keepdims=True)
+    # Separación a partir de la cuerda, exacta también para ángulos pequeños
+    chord = np.linalg.norm(c[:, None, :] - catalog[None, :, :], axis=-1)
+    full = 2 * np.arcsin(chord / 2)
+    nearest = full.argmin(axis=1)
+    found = full[np.arange(len(c)), nearest] <= 1e-4
+    np.testing.assert_array_equal(index[found], nearest[found])
+    np.testing.assert_allclose(sep[found], full[found, nearest[found]], atol=1e-15)
+    assert (index[~found] == -1).all() and np.isnan(sep[~found]).all()
+    assert index[-1] == -1
+
+
+def test_save_load(catalog, tmp_path):
+    index = SkyIndex(catalog)
+    path = tmp_path / "index.npz"
+    index.save(path)
+    loaded = SkyIndex.load(path)
+    assert len(loaded) == len(index)
+    centers = catalog[:20]
+    expected = index.cone_search(centers, 0.03)
+    for a, b in zip(loaded.cone_search(centers, 0.03), expected):
+        np.testing.assert_array_equal(a, b)
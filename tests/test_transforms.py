@@ -0,0 +1,205 @@
+import numpy as np
+import pytest
+
+import calculoastronomico.constant as c
+import calculoastronomico.transforms as ct
+from calculoastronomico.containers import Vector3, VectorArray
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(0).normal(size=(50, 3))
+
+
+def test_apply_matrix_vector_array_into_ndarray(batch):
+    out = np.empty_like(batch)
+    result = ct.equatorial_to_ecliptic(VectorArray(batch, "equatorial"), out=out)
+    np.testing.assert_allclose(out, ct.equatorial_to_ecliptic(batch))
+    assert result.frame == "ecliptic"
+    assert np.shares_memory(result.data, out)
+
+
+def test_apply_matrix_vector_array_into_vector_array(batch):
+    out = VectorArray(np.empty_like(batch))
+    result = ct.equatorial_to_galactic(VectorArray(batch, "equatorial"), out=out)
+    assert result is out and out.frame == "galactic"
+    np.testing.assert_allclose(out.data, ct.equatorial_to_galactic(batch))
+
+
+def test_frame_is_checked():
+    with pytest.raises(ValueError):
+        ct.galactic_to_equatorial(Vector3(1.0, 2.0, 3.0, "ecliptic"))
+
+
+def test_translation_vector_array_into_ndarray(batch):
+    out = np.empty_like(batch)
+    ct.translation(VectorArray(batch, "equatorial"), [1.0, 2.0, 3.0], out=out)
+    np.testing.assert_allclose(out, batch - [1.0, 2.0, 3.0])
+
+
+def test_frame_wrapper_vector3_into_list():
+    out = [0.0, 0.0, 0.0]
+    result = ct.equatorial_to_ecliptic(Vector3(1.0, 2.0, 3.0, "equatorial"), out=out)
+    assert result is out
+    np.testing.assert_allclose(out, ct.equatorial_to_ecliptic([1.0, 2.0, 3.0]))
+
+
+@pytest.mark.parametrize("theta", [0.3, np.full(50, 0.3)])
+def test_rotation_columns_into_ndarray(batch, theta):
+    out = np.empty_like(batch)
+    ct.rotation(1, theta, [batch[:, 0], batch[:, 1], batch[:, 2]], out=out)
+    np.testing.assert_allclose(out, ct.rotation(1, 0.3, batch))
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda x, **kw: ct.rotation(2, 0.4, x, **kw),
+        lambda x, **kw: ct.translation(x, [1.0, 2.0, 3.0], **kw),
+        ct.equatorial_to_galactic,
+        ct.ecliptic_to_equatorial,
+    ],
+)
+def test_inplace_matches_new_array(batch, func):
+    expected = func(batch)
+    x = batch.copy()
+    assert func(x, inplace=True) is x
+    np.testing.assert_allclose(x, expected)
+    with pytest.raises(ValueError):
+        func(x, out=x, inplace=True)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda x, **kw: ct.rotation(3, 0.4, x, **kw),
+        lambda x, **kw: ct.rotation(1, np.full(50, 0.4), x, **kw),
+        lambda x, **kw: ct.translation(x, [1.0, 2.0, 3.0], **kw),
+        lambda x, **kw: ct.rotation_Euler(0.1, 0.2, 0.3, x, **kw),
+        ct.equatorial_to_galactic,
+        lambda x, **kw: ct.equatorial_to_ecliptic(x, 0.4, **kw),
+    ],
+)
+def test_inplace_columns_are_modified(batch, func):
+    expected = func(batch)
+    columns = [batch[:, 0].copy(), batch[:, 1].copy(), batch[:, 2].copy()]
+    x = list(columns)
+    assert func(x, inplace=True) is x
+    for i, col in enumerate(columns):
+        assert x[i] is col
+        np.testing.assert_allclose(col, expected[:, i])
+
+    x = Vector3(*(batch[:, i].copy() for i in range(3)))
+    columns = list(x)
+    func(x, inplace=True)
+    for i, col in enumerate(columns):
+        np.testing.assert_allclose(col, expected[:, i])
+
+
+def test_geodetic_round_trip():
+    rng = np.random.default_rng(2)
+    lon = rng.uniform(-np.pi, np.pi, 1000)
+    lat = rng.uniform(-np.pi / 2, np.pi / 2, 1000)
+    h = rng.uniform(-500.0, 1e7, 1000)
+    R = ct.terrestrial_coordinates(lon, lat, h)
+    assert R.shape == (1000, 3)
+    back = ct.geodetic_coordinates(R)
+    np.testing.assert_allclose(back[:, 0], lon, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(back[:, 1], lat, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(back[:, 2], h, rtol=0, atol=1e-5)
+
+
+def test_geodetic_scalar_matches_batch():
+    R = ct.terrestrial_coordinates(-0.0733, 0.7118, 667.0)
+    lon, lat, h = ct.geodetic_coordinates(R)
+    assert (lon, lat) == pytest.approx((-0.0733, 0.7118), abs=1e-14)
+    assert h == pytest.approx(667.0, abs=1e-8)
+    batch = ct.geodetic_coordinates(np.array([R, R]))
+    np.testing.assert_allclose(batch[0], [lon, lat, h], rtol=1e-15)
+
+
+def test_geodetic_dimensionless():
+    # h de entrada siempre en metros; la salida, en radios ecuatoriales
+    R = ct.terrestrial_coordinates(1.0, -0.5, 0.1 * c.r_e, dimensionless=True)
+    np.testing.assert_allclose(
+        ct.geodetic_coordinates(R, dimensionless=True), [1.0, -0.5, 0.1], atol=1e-13
+    )
+
+
+def test_equatorial_to_horizontal_meeus():
+    # Meeus, Astronomical Algorithms, ejemplo 13.b: Venus desde Washington
+    ra = np.radians(15 * (23 + 9 / 60 + 16.641 / 3600))
+    dec = -np.radians(6 + 43 / 60 + 11.61 / 3600)
+    lat = np.radians(38 + 55 / 60 + 17 / 3600)
+    lon = -np.radians(77 + 3 / 60 + 56 / 3600)
+    gst = np.radians(15 * (8 + 34 / 60 + 56.853 / 3600))
+    alt, az = ct.equatorial_to_horizontal(ra, dec, gst + lon, lat)
+    # Meeus cuenta el acimut desde el sur
+    assert np.degrees(alt) == pytest.approx(15.1249, abs=2e-4)
+    assert np.degrees(az) == pytest.approx(68.0337 + 180, abs=2e-4)
+
+
+def test_horizontal_round_trip_and_grid():
+    rng = np.random.default_rng(4)
+    ra = rng.uniform(0, 2 * np.pi, 30)
+    dec = np.arcsin(rng.uniform(-1, 1, 30))
+    lon, lat = rng.uniform(-3, 3, 4), rng.uniform(-1.5, 1.5, 4)
+    gst = np.linspace(0, 6, 5)
+    blocks = list(ct.horizontal_grid(ra, dec, lon, lat, gst, chunksize=50))
+    # 50 elementos por bloque con 4 x 5 por objetivo: dos objetivos por bloque
+    assert [start for start, _, _ in blocks] == list(range(0, 30, 2))
+    alt = np.concatenate([a for _, a, _ in blocks])
+    az = np.concatenate([z for _, _, z in blocks])
+    lst = lon[None, :, None] + gst[None, None, :]
+    ra2, dec2 = ct.horizontal_to_equatorial(alt, az, lst, lat[None, :, None])
+    np.testing.assert_allclose(np.cos(ra2 - ra[:, None, None]), 1.0, atol=1e-14)
+    dec = np.broadcast_to(dec[:, None, None], alt.shape)
+    np.testing.assert_allclose(dec2, dec, atol=1e-12)
+
+
+@pytest.fixture
+def trig_cache():
+    """Caché de (sin, cos) vacía, con su tamaño por defecto al terminar"""
+    ct.set_trig_cache_size(4)
+    yield
+    ct.set_trig_cache_size()
+
+
+def test_trig_cache_counts(trig_cache):
+    assert ct.trig_cache_info()[:] == (0, 0, 4, 0)
+    assert ct.sincos(0.1) == (np.sin(0.1), np.cos(0.1))
+    ct.sincos(0.1)
+    assert ct.trig_cache_info()[:] == (1, 1, 4, 1)
+    for theta in (0.2, 0.3, 0.4, 0.5):
+        ct.rotation(1, theta, [1.0, 2.0, 3.0])
+    hits, misses, maxsize, currsize = ct.trig_cache_info()
+    assert (hits, misses, currsize) == (1, 5, 4)
+    ct.rotation(3, 0.5, (1.0, 2.0, 3.0))
+    assert ct.trig_cache_info().hits == 2
+
+
+def test_trig_cache_disabled(trig_cache):
+    ct.set_trig_cache_size(0)
+    x = [0.3, -0.4, 0.5]
+    expected = ct.apply_matrix(ct.rotation_matrix(2, 0.7), np.array(x))
+    for _ in range(2):
+        np.testing.assert_allclose(ct.rotation(2, 0.7, x), expected, rtol=1e-15)
+    gal = ct.equatorial_to_galactic(x)
+    np.testing.assert_allclose(gal, ct.equatorial_to_galactic(np.array(x)), atol=1e-15)
+    assert ct.trig_cache_info().currsize == 0
+
+
+def test_plain_vectors_match_containers():
+    x = [0.3, -0.4, 0.5]
+    v = Vector3(*x, frame="equatorial")
+    for func in (ct.equatorial_to_ecliptic, ct.equatorial_to_galactic):
+        assert func(x) == list(func(v))
+    for n in (1, 2, 3):
+        assert ct.rotation(n, 0.7, x) == list(ct.rotation(n, 0.7, Vector3(*x)))
+        assert ct.rotation(n, 1, x) == ct.rotation(n, 1.0, x)
+    eq = ct.galactic_to_equatorial(ct.equatorial_to_galactic(tuple(x)))
+    np.testing.assert_allclose(eq, x, atol=1e-15)
+    eq = ct.ecliptic_to_equatorial(ct.equatorial_to_ecliptic(x))
+    np.testing.assert_allclose(eq, x, atol=1e-15)
+    with pytest.raises(ValueError):
+        ct.rotation(4, 0.7, x)